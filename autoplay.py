@@ -0,0 +1,150 @@
+"""
+autoplay.py - Fast-forward play of a strategy, watched at a throttled frame rate.
+
+An AutoPlayer plays rounds with the round engine in a background thread, as fast
+as the engine goes, and keeps running statistics. A viewer (the GUI) does not
+redraw every round: it asks for a frame at its own pace (request_frame) or has the
+player keep one every Nth round, and polls the latest one. A frame is an immutable
+snapshot of the last round's cards and the running totals, so the viewer never
+reads hands the thread is changing.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from engine import BankrollGuard
+from stats import SimulationStats
+
+Frame = namedtuple(
+    "Frame",
+    ["rounds", "player_hands", "dealer_hand", "result", "bankroll", "ev", "ev_std_error",
+     "rounds_per_minute"],
+)
+Frame.__doc__ = """
+Snapshot of an autoplay run after a round.
+
+Attributes:
+    rounds (int): Rounds played so far.
+    player_hands (tuple): Card codes (bytes) of each player hand of the last round.
+    dealer_hand (bytes): The dealer's cards in the last round.
+    result (RoundResult): The last round.
+    bankroll (float): The player's bankroll.
+    ev (float): Mean net result per unit wagered so far.
+    ev_std_error (float): Standard error of the EV.
+    rounds_per_minute (float): Playing speed since the run was last started.
+"""
+
+
+class AutoPlayer:
+    """
+    Plays an engine's rounds with a strategy in a background thread.
+
+    The engine must not be used by anything else while the player runs.
+
+    Attributes:
+        engine (RoundEngine): The engine to play (its player's bankroll is used).
+        strategy (callable): Decision function, see engine.RoundEngine.
+        bet (float): The bet placed on every round.
+        redraw_every (int): Keep a frame every this many rounds, or None to keep
+            one only when requested.
+        stats (SimulationStats): Statistics of the rounds played.
+        frame (Frame): The latest frame (None before the first).
+    """
+
+    def __init__(self, engine, strategy, bet, redraw_every=None):
+        """
+        Initialize the player.
+
+        Args:
+            engine (RoundEngine): The engine to play.
+            strategy (callable): Decision function.
+            bet (float): The bet placed on every round.
+            redraw_every (int): Keep a frame every this many rounds (default is only
+                when requested).
+        """
+        self.engine = engine
+        self.strategy = strategy
+        self.bet = bet
+        self.redraw_every = redraw_every
+        self.stats = SimulationStats()
+        self.frame = None
+        self._frame_wanted = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = 0.0
+        self._start_rounds = 0
+
+    def start(self, rounds=None):
+        """
+        Start playing in the background.
+
+        Args:
+            rounds (int): Rounds to play (default is until stopped or out of money).
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(rounds,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop playing after the current round and wait for the thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        """bool: Whether the background thread is playing."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def request_frame(self):
+        """Ask for a frame to be kept after the next round."""
+        self._frame_wanted = True
+
+    def run(self, rounds=None):
+        """
+        Play rounds in the calling thread until stopped, out of money or done.
+
+        Doubles, splits and insurance are only offered to the strategy when the
+        bankroll covers them (see engine.BankrollGuard), so it never goes negative.
+
+        Args:
+            rounds (int): Rounds to play (default is no limit).
+        """
+        engine = self.engine
+        player = engine.player
+        play_round = engine.play_round
+        add = self.stats.add
+        bet = self.bet
+        strategy = BankrollGuard(self.strategy, player, bet)
+        every = self.redraw_every
+        stop = self._stop
+        played = 0
+        self._started = time.perf_counter()
+        self._start_rounds = self.stats.rounds
+        while not stop.is_set() and (rounds is None or played < rounds) and player.bankroll >= bet:
+            strategy.staked = bet
+            result = play_round(bet, strategy)
+            add(result)
+            played += 1
+            if self._frame_wanted or (every and played % every == 0):
+                self._frame_wanted = False
+                self.frame = self._snapshot(result)
+        if played:
+            self.frame = self._snapshot(result)
+
+    def _snapshot(self, result):
+        """Build a frame of the last round."""
+        engine = self.engine
+        if result.split:
+            hands = tuple(bytes(hand.hand) for hand in engine.split_hands[:len(result.outcomes)])
+        else:
+            hands = (bytes(engine.player.hand),)
+        stats = self.stats
+        minutes = (time.perf_counter() - self._started) / 60
+        rate = (stats.rounds - self._start_rounds) / minutes if minutes > 0 else 0.0
+        return Frame(stats.rounds, hands, bytes(engine.dealer.hand), result, engine.player.bankroll,
+                     stats.ev, stats.ev_std_error, rate)
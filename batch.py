@@ -0,0 +1,259 @@
+"""
+batch.py - NumPy-vectorized batch simulator for fixed, table-driven strategies.
+
+Instead of looping over rounds in Python, batch.simulate plays a whole chunk of
+independent rounds at once: every step (dealing, hitting, the dealer's draw to 17
+and settlement) is a handful of array operations over all rounds still in play.
+
+The rules are the engine's default RuleSet: Blackjack pays 3:2, a dealer Blackjack
+ends the round, the player may double on the first two cards, surrender (half the
+bet back) at any point before standing and split a pair once into two hands that
+can only hit or stand, and the dealer stands on all 17s. Insurance is never taken.
+
+Each round is dealt without replacement from its own freshly shuffled shoe, so
+rounds are independent of each other.
+"""
+
+import numpy as np
+
+from engine import PAYOUTS, WIN, LOSE, PUSH, BLACKJACK, BUST, SURRENDERED
+from stats import SimulationStats
+
+# Action codes used in the compiled tables
+(_STAND, _HIT, _DOUBLE_OR_HIT, _DOUBLE_OR_STAND,
+ _SURRENDER_OR_HIT, _SURRENDER_OR_STAND, _SPLIT) = range(7)
+_CODES = {'S': _STAND, 'H': _HIT, 'D': _DOUBLE_OR_HIT, 'X': _DOUBLE_OR_STAND,
+          'R': _SURRENDER_OR_HIT, 'T': _SURRENDER_OR_STAND, 'P': _SPLIT}
+
+# Outcome codes of each settled hand
+_OUTCOMES = (WIN, LOSE, PUSH, BLACKJACK, BUST, SURRENDERED)
+_WIN, _LOSE, _PUSH, _BLACKJACK, _BUST, _SURRENDERED = range(len(_OUTCOMES))
+_NO_HAND = len(_OUTCOMES)
+_PAYOUTS = np.array([PAYOUTS[outcome] for outcome in _OUTCOMES] + [0.0])
+
+# Cards of one deck by value index (0 -> a 2, ..., 8 -> ten-valued, 9 -> Ace)
+_DECK_COMPOSITION = np.array([4, 4, 4, 4, 4, 4, 4, 4, 16, 4], dtype=np.int16)
+
+def compile_table(table):
+    """
+    Compile a strategy chart into NumPy lookup arrays.
+
+    Args:
+        table (strategy.StrategyTable): The chart to compile.
+
+    Returns:
+        tuple: (hard, soft, pairs) int8 arrays indexed by [total or pair value, upcard value].
+    """
+    hard = np.full((32, 12), _STAND, dtype=np.int8)
+    soft = np.full((32, 12), _STAND, dtype=np.int8)
+    pairs = np.full((12, 12), _HIT, dtype=np.int8)
+    for total in range(4, 22):
+        hard[total, 2:] = [_CODES[letter] for letter in table.hard[total]]
+    for total in range(12, 22):
+        soft[total, 2:] = [_CODES[letter] for letter in table.soft[total]]
+    if table.pairs:
+        for value in range(2, 12):
+            pairs[value, 2:] = [_CODES[letter] for letter in table.pairs[value]]
+    return hard, soft, pairs
+
+
+class _Hands:
+    """Vectorized state of one hand per round: hard total, Ace flag and card count."""
+
+    def __init__(self, n):
+        self.hard = np.zeros(n, dtype=np.int16)
+        self.ace = np.zeros(n, dtype=bool)
+        self.cards = np.zeros(n, dtype=np.int8)
+
+    def add(self, rows, values):
+        """Add one card (value 2-11) to the hands at ``rows``."""
+        self.hard[rows] += np.where(values == 11, 1, values)
+        self.ace[rows] |= values == 11
+        self.cards[rows] += 1
+
+    def totals(self, rows=slice(None)):
+        """Best totals (one Ace as 11 when it does not bust) of the hands at ``rows``."""
+        hard = self.hard[rows]
+        return np.where(self.ace[rows] & (hard <= 11), hard + 10, hard)
+
+    def soft(self, rows):
+        """Whether the hands at ``rows`` count an Ace as 11."""
+        return self.ace[rows] & (self.hard[rows] <= 11)
+
+
+class _Shoes:
+    """One shoe per round, stored as cumulative remaining card counts by value."""
+
+    def __init__(self, n, decks, rng):
+        # Laid out as (value, round) so each step works on contiguous rows of rounds
+        cumulative = np.cumsum(_DECK_COMPOSITION * decks).astype(np.int16)
+        self.cumulative = np.repeat(cumulative[:, None], n, axis=1)
+        self.values = np.arange(len(_DECK_COMPOSITION), dtype=np.int16)[:, None]
+        self.rng = rng
+
+    def draw(self, rows):
+        """
+        Draw one card, without replacement, from the shoes at ``rows``.
+
+        Returns:
+            np.ndarray: The drawn card values (2-11).
+        """
+        cumulative = self.cumulative[:, rows]
+        position = (self.rng.random(cumulative.shape[1]) * cumulative[-1]).astype(np.int16)
+        index = (cumulative <= position).sum(axis=0, dtype=np.int16)
+        cumulative -= self.values >= index
+        self.cumulative[:, rows] = cumulative
+        return index + 2
+
+
+def _lookup(tables, hands, rows, upcards):
+    """Chart action codes for the hands at ``rows``."""
+    hard, soft, _ = tables
+    totals = hands.totals(rows)
+    return np.where(hands.soft(rows), soft[totals, upcards], hard[totals, upcards])
+
+
+def _play_split_hands(tables, shoes, hands, rows, upcards):
+    """Play split hands (hit or stand only) until they stand or reach 21."""
+    active = rows
+    while len(active):
+        codes = _lookup(tables, hands, active, upcards[active])
+        hitting = (codes == _HIT) | (codes == _DOUBLE_OR_HIT) | (codes == _SURRENDER_OR_HIT)
+        active = active[hitting]
+        hands.add(active, shoes.draw(active))
+        active = active[hands.totals(active) < 21]
+
+
+def _simulate_chunk(n, tables, decks, rng):
+    """
+    Simulate ``n`` rounds at once.
+
+    Returns:
+        tuple: (net per round, wager of the first hand per unit bet, outcome code
+        of the first hand, outcome code of the second hand).
+    """
+    shoes = _Shoes(n, decks, rng)
+    player = _Hands(n)
+    dealer = _Hands(n)
+    every = slice(None)
+
+    # Initial deal: player, dealer, player, dealer
+    first = shoes.draw(every)
+    player.add(every, first)
+    upcards = shoes.draw(every)
+    dealer.add(every, upcards)
+    second = shoes.draw(every)
+    player.add(every, second)
+    dealer.add(every, shoes.draw(every))
+
+    wager = np.ones(n)
+    outcome = np.full(n, _NO_HAND, dtype=np.int8)
+    split_outcome = np.full(n, _NO_HAND, dtype=np.int8)
+
+    # Naturals end the round immediately
+    player_bj = player.totals() == 21
+    dealer_bj = dealer.totals() == 21
+    outcome[dealer_bj] = np.where(player_bj[dealer_bj], _PUSH, _LOSE)
+    outcome[~dealer_bj & player_bj] = _BLACKJACK
+    active = np.flatnonzero(~(player_bj | dealer_bj))
+
+    # Splits
+    splitting = active[(first[active] == second[active])
+                       & (tables[2][first[active], upcards[active]] == _SPLIT)]
+    active = np.setdiff1d(active, splitting, assume_unique=True)
+    second_hands = _Hands(n)
+    if len(splitting):
+        player.hard[splitting] = 0
+        player.ace[splitting] = False
+        player.cards[splitting] = 0
+        player.add(splitting, first[splitting])
+        player.add(splitting, shoes.draw(splitting))
+        second_hands.add(splitting, second[splitting])
+        second_hands.add(splitting, shoes.draw(splitting))
+        _play_split_hands(tables, shoes, player, splitting, upcards)
+        _play_split_hands(tables, shoes, second_hands, splitting, upcards)
+
+    # Main hands: the first decision may double, every decision may surrender
+    standing = []
+    first_decision = True
+    while len(active):
+        codes = _lookup(tables, player, active, upcards[active])
+        if first_decision:
+            doubling = (codes == _DOUBLE_OR_HIT) | (codes == _DOUBLE_OR_STAND)
+            rows = active[doubling]
+            wager[rows] = 2.0
+            player.add(rows, shoes.draw(rows))
+            standing.append(rows)
+            active, codes = active[~doubling], codes[~doubling]
+            first_decision = False
+
+        surrendering = (codes == _SURRENDER_OR_HIT) | (codes == _SURRENDER_OR_STAND)
+        outcome[active[surrendering]] = _SURRENDERED
+
+        stands = (codes == _STAND) | (codes == _DOUBLE_OR_STAND)
+        standing.append(active[stands])
+
+        active = active[~(surrendering | stands)]
+        player.add(active, shoes.draw(active))
+        active = active[player.totals(active) <= 21]
+    standing = np.concatenate(standing) if standing else np.zeros(0, dtype=np.intp)
+
+    # Dealer draws to 17 behind every hand still standing
+    live = np.concatenate([standing[player.totals(standing) <= 21],
+                           splitting[(player.totals(splitting) <= 21)
+                                     | (second_hands.totals(splitting) <= 21)]])
+    drawing = live[dealer.totals(live) < 17]
+    while len(drawing):
+        dealer.add(drawing, shoes.draw(drawing))
+        drawing = drawing[dealer.totals(drawing) < 17]
+
+    # Settlement
+    dealer_totals = dealer.totals()
+    for hands, results, rows in ((player, outcome, standing), (player, outcome, splitting),
+                                 (second_hands, split_outcome, splitting)):
+        totals = hands.totals(rows)
+        dealer_rows = dealer_totals[rows]
+        results[rows] = np.select(
+            [totals > 21, (dealer_rows > 21) | (totals > dealer_rows), totals < dealer_rows],
+            [_BUST, _WIN, _LOSE],
+            _PUSH,
+        )
+    outcome[outcome == _NO_HAND] = _BUST  # Main hands that busted while hitting
+
+    net = _PAYOUTS[outcome] * wager + _PAYOUTS[split_outcome]
+    return net, wager, outcome, split_outcome
+
+
+def simulate(rounds, table, decks=6, seed=None, chunk_size=100_000, stats=None):
+    """
+    Simulate independent rounds of a fixed strategy chart with NumPy.
+
+    Args:
+        rounds (int): Number of rounds to simulate.
+        table (strategy.StrategyTable): The strategy chart to play.
+        decks (int): Number of decks in each round's shoe (default is 6).
+        seed (int): Seed for the random generator (default is unseeded).
+        chunk_size (int): Rounds simulated per vectorized step (bounds memory use).
+        stats (SimulationStats): Statistics to fold the rounds into (default is a new,
+            empty SimulationStats).
+
+    Returns:
+        SimulationStats: EV, variance, outcome counts and net-result histogram, with
+        a bet of 1 per round.
+    """
+    tables = compile_table(table)
+    rng = np.random.default_rng(seed)
+    if stats is None:
+        stats = SimulationStats()
+
+    done = 0
+    while done < rounds:
+        n = min(chunk_size, rounds - done)
+        net, wager, outcome, split_outcome = _simulate_chunk(n, tables, decks, rng)
+        counts = np.bincount(outcome, minlength=_NO_HAND + 1)
+        counts += np.bincount(split_outcome, minlength=_NO_HAND + 1)
+        stats.add_batch(net, 1.0, dict(zip(_OUTCOMES, counts.tolist())),
+                        splits=np.count_nonzero(split_outcome != _NO_HAND),
+                        doubles=np.count_nonzero(wager == 2.0))
+        done += n
+    return stats
@@ -0,0 +1,352 @@
+"""
+benchmark.py - Micro- and macro-benchmarks of the game's hot paths.
+
+Every benchmark is warmed up, then timed over several repetitions; the report gives
+the best, median and mean time per operation and is written as JSON. Given a stored
+baseline report, the run fails (exit status 1) when any benchmark's median time per
+operation has regressed by more than the threshold.
+
+Usage:
+    python benchmark.py --output report.json
+    python benchmark.py --baseline baseline.json --threshold 0.10
+    python benchmark.py --baseline baseline.json --update-baseline
+
+GUI benchmarks need Tk and a display; without them they are reported as skipped.
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from functools import partial
+
+from deck import Deck, Shoe, encode_card
+from engine import RoundEngine
+from player import Player
+from sprites import SpriteCache
+from strategy import basic_strategy
+from table import MAX_SEATS, Seat, Table
+
+# Sample hands (all spades) as card codes
+_HANDS = [
+    [encode_card(rank, '♠') for rank in ranks]
+    for ranks in ((10, 7), ('A', 6), (8, 8), ('A', 'K'), (2, 3, 4, 'A', 5), (9, 'A', 'A', 7))
+]
+
+
+def _bench_deck():
+    """Deck() construction and shuffle."""
+    return Deck, 1
+
+
+def _bench_deal_card():
+    """Deal a whole 8-deck shoe card by card."""
+    shoe = Shoe(8)
+    cards = len(shoe.full_shoe)
+
+    def run():
+        shoe.cards[:] = shoe.full_shoe
+        deal = shoe.deal_card
+        for _ in range(cards):
+            deal()
+    return run, cards
+
+
+def _bench_add_card():
+    """Player.add_card over the sample hands."""
+    player = Player("Bench")
+    cards = sum(len(hand) for hand in _HANDS)
+
+    def run():
+        for hand in _HANDS:
+            player.reset_hand()
+            for card in hand:
+                player.add_card(card)
+    return run, cards
+
+
+def _bench_calculate_hand():
+    """Player.calculate_hand on a dealt hand."""
+    player = Player("Bench")
+    for card in _HANDS[4]:
+        player.add_card(card)
+
+    def run():
+        calculate = player.calculate_hand
+        for _ in range(1000):
+            calculate()
+    return run, 1000
+
+
+def _bench_calculate_hand_value():
+    """calculate_hand_value on Player objects and raw card lists."""
+    engine = RoundEngine()
+    players = []
+    for hand in _HANDS:
+        player = Player("Bench")
+        for card in hand:
+            player.add_card(card)
+        players.append(player)
+    hands = players + [list(hand) for hand in _HANDS]
+
+    def run():
+        calculate = engine.calculate_hand_value
+        for hand in hands:
+            calculate(hand)
+    return run, len(hands)
+
+
+def _bench_can_split():
+    """can_split on the sample hands."""
+    engine = RoundEngine()
+    hands = [bytearray(hand[:2]) for hand in _HANDS]
+
+    def run():
+        can_split = engine.can_split
+        for hand in hands:
+            can_split(hand)
+    return run, len(hands)
+
+
+def _bench_rounds():
+    """Full headless rounds of basic strategy on a 6-deck shoe."""
+    engine = RoundEngine(player=Player("Bench", 0.0))
+
+    def run():
+        for _ in range(1000):
+            engine.play_round(1.0, basic_strategy)
+    return run, 1000
+
+
+def _bench_batch_rounds():
+    """Headless rounds of basic strategy in batch mode (play_rounds)."""
+    engine = RoundEngine(player=Player("Bench", 0.0))
+
+    def run():
+        engine.play_rounds(1000, 1.0, basic_strategy)
+    return run, 1000
+
+
+def _bench_table_rounds():
+    """Seat-rounds of basic strategy at a full seven-seat table (compare headless_rounds)."""
+    table = Table([Seat(Player(f"Bench {i}", 0.0), basic_strategy, 1.0) for i in range(MAX_SEATS)])
+
+    def run():
+        table.play_rounds(1000)
+    return run, 1000 * MAX_SEATS
+
+
+def _bench_sprite_build():
+    """Card sprite atlas built from the source PNGs (cold cache)."""
+    directory = tempfile.TemporaryDirectory()
+    cache_dir = directory.name
+
+    def run():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        SpriteCache(cache_dir=cache_dir)
+    return run, 1, directory.cleanup
+
+
+def _bench_sprite_open():
+    """Card sprite atlas opened from the on-disk cache (warm cache)."""
+    directory = tempfile.TemporaryDirectory()
+    SpriteCache(cache_dir=directory.name)
+    return partial(SpriteCache, cache_dir=directory.name), 1, directory.cleanup
+
+
+def _gui():
+    """Build a hidden GUI, or raise RuntimeError if Tk cannot run here."""
+    try:
+        import tkinter as tk
+        from gui import BlackjackGUI
+        root = tk.Tk()
+    except Exception as error:  # ImportError, or TclError without a display
+        raise RuntimeError(f"GUI unavailable: {error}") from None
+    root.withdraw()
+    return root, BlackjackGUI(root)
+
+
+def _bench_load_card_images():
+    """GUI load_card_images (open the sprite cache) and decoding of every sprite."""
+    root, app = _gui()
+
+    def run():
+        images = app.load_card_images()
+        for name in images.names:
+            images.get(name)
+    return run, 1, root.destroy
+
+
+def _bench_display_player_cards():
+    """GUI display_player_cards redraw of an unchanged hand, including layout."""
+    root, app = _gui()
+    app.game.deal()
+
+    def run():
+        app.display_player_cards()
+        root.update_idletasks()
+    return run, 1, root.destroy
+
+
+# Name -> factory returning (run, ops) or (run, ops, cleanup); cleanup is called
+# once the benchmark has been measured, to free what the factory set up
+BENCHMARKS = {
+    "deck_construct_shuffle": _bench_deck,
+    "deal_card": _bench_deal_card,
+    "player_add_card": _bench_add_card,
+    "player_calculate_hand": _bench_calculate_hand,
+    "calculate_hand_value": _bench_calculate_hand_value,
+    "can_split": _bench_can_split,
+    "headless_rounds": _bench_rounds,
+    "headless_batch_rounds": _bench_batch_rounds,
+    "table_seat_rounds": _bench_table_rounds,
+    "sprite_atlas_build": _bench_sprite_build,
+    "sprite_atlas_open": _bench_sprite_open,
+    "gui_load_card_images": _bench_load_card_images,
+    "gui_display_player_cards": _bench_display_player_cards,
+}
+
+
+def measure(run, ops, warmup=3, repeat=10):
+    """
+    Time a benchmark body.
+
+    Args:
+        run (callable): The body to time, called without arguments.
+        ops (int): Number of operations one call of ``run`` performs.
+        warmup (int): Untimed calls before measuring (default is 3).
+        repeat (int): Timed calls (default is 10).
+
+    Returns:
+        dict: Best, median and mean seconds per operation, and operations per second.
+    """
+    for _ in range(warmup):
+        run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) / ops)
+    median = statistics.median(times)
+    return {
+        "ops": ops,
+        "best": min(times),
+        "median": median,
+        "mean": statistics.fmean(times),
+        "ops_per_sec": 1.0 / median if median else float("inf"),
+    }
+
+
+def run_benchmarks(names=None, warmup=3, repeat=10):
+    """
+    Run benchmarks and build a report.
+
+    Args:
+        names (list): Benchmarks to run (default is all of BENCHMARKS).
+        warmup (int): Untimed calls per benchmark (default is 3).
+        repeat (int): Timed calls per benchmark (default is 10).
+
+    Returns:
+        dict: The report, ready to be dumped as JSON.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        try:
+            run, ops, *cleanup = BENCHMARKS[name]()
+        except RuntimeError as error:
+            results[name] = {"skipped": str(error)}
+            continue
+        try:
+            results[name] = measure(run, ops, warmup, repeat)
+        finally:
+            for release in cleanup:
+                release()
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.10):
+    """
+    Find benchmarks that got slower than a baseline report.
+
+    Benchmarks skipped or missing in either report are not compared.
+
+    Args:
+        report (dict): The new report.
+        baseline (dict): The stored baseline report.
+        threshold (float): Allowed slowdown of the median, as a fraction (default is 10%).
+
+    Returns:
+        list: (name, baseline median, new median, ratio) for every regression.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name, {})
+        if "median" not in result or "median" not in old:
+            continue
+        ratio = result["median"] / old["median"]
+        if ratio > 1.0 + threshold:
+            regressions.append((name, old["median"], result["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    """Command-line entry point; returns the exit status."""
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark",
+                        help=f"benchmarks to run (default is all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls per benchmark")
+    parser.add_argument("--repeat", type=int, default=10, help="timed calls per benchmark")
+    parser.add_argument("--output", help="write the JSON report to this file (default is stdout)")
+    parser.add_argument("--baseline", help="baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown of the median time per operation (default 0.10)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="overwrite the baseline with this run instead of comparing")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    report = run_benchmarks(args.benchmarks, args.warmup, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            print(f"{name:<28} skipped ({result['skipped']})", file=sys.stderr)
+        else:
+            print(f"{name:<28} {result['median'] * 1e9:>12.1f} ns/op "
+                  f"{result['ops_per_sec']:>14,.0f} ops/s", file=sys.stderr)
+
+    if not args.baseline:
+        return 0
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(text + "\n")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold)
+    for name, old, new, ratio in regressions:
+        print(f"REGRESSION {name}: {old * 1e9:.1f} -> {new * 1e9:.1f} ns/op ({ratio:.2f}x)",
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
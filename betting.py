@@ -0,0 +1,317 @@
+"""
+betting.py - Bet-sizing policies, evaluated over many sessions at once.
+
+A betting policy decides each round's bet for a whole array of sessions at a
+time. Its state is one small NumPy array (e.g. the current losing streak), so
+thousands of sessions are stepped together without a Python object per session:
+
+    state = policy.start(sessions)
+    bets = policy.bets(state, bankrolls, true_counts)
+    state = policy.update(state, nets)
+
+Sessions are evaluated on a trace of real rounds: the engine plays a strategy with
+a unit bet and records, for every round, the net result and the true count before
+the deal. Each session replays the trace from its own random starting round,
+scaling the results by its bets, so count-based bets see the count exactly as it
+evolved through the shoe. Traces and sessions are both computed with the parallel
+runner.
+"""
+
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+import parallel
+from counting import HI_LO, RunningCount
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+from stats import SimulationStats
+from strategy import StrategyTable, table_strategy
+
+TRACE_DTYPE = np.dtype([("net", "<f4"), ("true_count", "<f4")])
+
+
+class BettingPolicy:
+    """
+    Base class of betting policies: a flat bet of one unit, with no state.
+
+    Attributes:
+        unit (float): The base bet.
+    """
+
+    def __init__(self, unit=10.0):
+        """
+        Initialize the policy.
+
+        Args:
+            unit (float): The base bet (default is 10).
+        """
+        self.unit = unit
+
+    def start(self, sessions):
+        """
+        Return the state of new sessions.
+
+        Args:
+            sessions (int): Number of sessions.
+
+        Returns:
+            numpy.ndarray: One state entry per session.
+        """
+        return np.zeros(sessions, dtype=np.int16)
+
+    def bets(self, state, bankroll, true_count):
+        """
+        Return each session's bet for the next round, before table limits.
+
+        Args:
+            state (numpy.ndarray): The sessions' states.
+            bankroll (numpy.ndarray): The sessions' bankrolls.
+            true_count (numpy.ndarray): The true count before the deal.
+
+        Returns:
+            numpy.ndarray: The bets.
+        """
+        return np.full(len(state), self.unit)
+
+    def update(self, state, net):
+        """
+        Return the sessions' states after a round.
+
+        Args:
+            state (numpy.ndarray): The sessions' states.
+            net (numpy.ndarray): The net result of the round.
+
+        Returns:
+            numpy.ndarray: The new states.
+        """
+        return state
+
+
+class Flat(BettingPolicy):
+    """The same bet every round."""
+
+
+class Martingale(BettingPolicy):
+    """Double the bet after every loss, back to one unit after a win."""
+
+    def bets(self, state, bankroll, true_count):
+        return self.unit * np.exp2(np.minimum(state, 30))
+
+    def update(self, state, net):
+        return np.where(net < 0, state + 1, np.where(net > 0, 0, state)).astype(state.dtype)
+
+
+class Paroli(BettingPolicy):
+    """
+    Double the bet after every win, back to one unit after a loss or a winning streak.
+
+    Attributes:
+        streak (int): Wins in a row after which the bet goes back to one unit.
+    """
+
+    def __init__(self, unit=10.0, streak=3):
+        """
+        Initialize the policy.
+
+        Args:
+            unit (float): The base bet (default is 10).
+            streak (int): Wins in a row that end a progression (default is 3).
+        """
+        super().__init__(unit)
+        self.streak = streak
+
+    def bets(self, state, bankroll, true_count):
+        return self.unit * np.exp2(state)
+
+    def update(self, state, net):
+        state = np.where(net > 0, state + 1, np.where(net < 0, 0, state)).astype(state.dtype)
+        state[state >= self.streak] = 0
+        return state
+
+
+class Kelly(BettingPolicy):
+    """
+    Bet a fraction of the Kelly bet on the edge estimated from the true count.
+
+    The edge is estimated as ``base_edge + edge_per_count * true_count``; with no
+    edge the policy bets the table minimum.
+
+    Attributes:
+        fraction (float): Fraction of the full Kelly bet.
+        base_edge (float): Player edge at a true count of 0.
+        edge_per_count (float): Edge gained per true count.
+        variance (float): Variance of a round's result per unit bet squared.
+    """
+
+    def __init__(self, fraction=0.5, base_edge=-0.005, edge_per_count=0.005, variance=1.3):
+        """
+        Initialize the policy.
+
+        Args:
+            fraction (float): Fraction of the full Kelly bet (default is half Kelly).
+            base_edge (float): Player edge at a true count of 0 (default is -0.5%).
+            edge_per_count (float): Edge gained per true count (default is 0.5%).
+            variance (float): Variance per round (default is 1.3).
+        """
+        super().__init__(0.0)
+        self.fraction = fraction
+        self.base_edge = base_edge
+        self.edge_per_count = edge_per_count
+        self.variance = variance
+
+    def bets(self, state, bankroll, true_count):
+        edge = np.maximum(self.base_edge + self.edge_per_count * true_count, 0.0)
+        return self.fraction * edge / self.variance * bankroll
+
+
+class CountRamp(BettingPolicy):
+    """
+    Bet a number of units that rises with the true count.
+
+    Attributes:
+        counts (numpy.ndarray): True counts at which each ramp step starts, ascending.
+        units (numpy.ndarray): Units bet from each step on (one unit below the first).
+    """
+
+    def __init__(self, unit=10.0, ramp=((2, 2), (3, 4), (4, 6), (5, 8))):
+        """
+        Initialize the policy.
+
+        Args:
+            unit (float): The base bet (default is 10).
+            ramp (tuple): (true count, units) steps, e.g. ((2, 2), (3, 4)) bets one
+                unit below a true count of 2, two from 2 and four from 3 on.
+        """
+        super().__init__(unit)
+        self.counts = np.array([count for count, _ in ramp], dtype=float)
+        self.units = np.array([1] + [units for _, units in ramp], dtype=float)
+
+    def bets(self, state, bankroll, true_count):
+        return self.unit * self.units[np.searchsorted(self.counts, np.floor(true_count), side="right")]
+
+
+PolicyResult = namedtuple("PolicyResult", ["stats", "risk_of_ruin"])
+PolicyResult.__doc__ = """
+Result of evaluating a betting policy.
+
+Attributes:
+    stats (SimulationStats): Statistics over sessions: ``mean`` is the mean net
+        result of a session, ``ev`` the net result per unit wagered and the
+        histogram that of session results.
+    risk_of_ruin (float): Fraction of sessions that ran out of money for the
+        table minimum.
+"""
+
+
+def _trace_block(task, strategy, rules, system):
+    """Play one block of unit-bet rounds and record their nets and true counts."""
+    rounds, seed_sequence = task
+    if isinstance(strategy, StrategyTable):
+        strategy = table_strategy(strategy)
+    engine = RoundEngine(player=Player("Player", 0.0), rules=rules,
+                         shoe=Shoe(rules.decks, rng=NumpyRNG(seed_sequence)))
+    count = RunningCount(system, engine.deck)
+    deck = engine.deck
+    trace = np.zeros(rounds, dtype=TRACE_DTYPE)
+    nets = trace["net"]
+    true_counts = trace["true_count"]
+    for i in range(rounds):
+        if deck.needs_shuffle():
+            deck.reshuffle()
+        true_counts[i] = count.true_count()
+        nets[i] = engine.play_round(1.0, strategy).net
+    return trace
+
+
+def record_trace(strategy, rounds=1_000_000, rules=None, system=HI_LO, seed=0, workers=None,
+                 block_size=100_000):
+    """
+    Record the unit-bet net result and pre-deal true count of many rounds.
+
+    Args:
+        strategy (StrategyTable or callable): The strategy chart, or a picklable
+            strategy such as strategy.basic_strategy.
+        rounds (int): Rounds to record (default is 1,000,000).
+        rules (RuleSet): The table rules (default is RuleSet()).
+        system (CountingSystem): Counting system of the true count (default is Hi-Lo).
+        seed (int): Master seed (default is 0).
+        workers (int): Number of processes (default is one per CPU core).
+        block_size (int): Rounds per block; each block plays its own shoe.
+
+    Returns:
+        numpy.ndarray: The trace, with dtype TRACE_DTYPE.
+    """
+    rules = rules if rules is not None else RuleSet()
+    run_block = partial(_trace_block, strategy=strategy, rules=rules, system=system)
+    return np.concatenate(parallel.map_blocks(run_block, rounds, seed, workers, block_size))
+
+
+def _sessions_block(task, policy, trace, rounds, bankroll, table_min, table_max, bins):
+    """Step one block of sessions together through the trace."""
+    sessions, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    positions = rng.integers(0, len(trace), sessions)
+    nets = trace["net"]
+    true_counts = trace["true_count"]
+
+    state = policy.start(sessions)
+    money = np.full(sessions, float(bankroll))
+    wagered = np.zeros(sessions)
+    playing = np.ones(sessions, dtype=bool)
+    for _ in range(rounds):
+        bets = np.clip(policy.bets(state, money, true_counts[positions]), table_min, table_max)
+        bets = np.where(playing, np.minimum(bets, money), 0.0)
+        # Doubles and splits can lose more than the bet; the trace was played with
+        # money to cover them, so a loss beyond the bankroll is cut to what is left
+        results = np.maximum(bets * nets[positions], -money)
+        money += results
+        wagered += bets
+        state = policy.update(state, results)
+        playing &= money >= table_min
+        positions += 1
+        positions[positions == len(trace)] = 0
+
+    stats = SimulationStats(*bins)
+    stats.add_batch(money - bankroll, wagered, {})
+    return stats, int(np.count_nonzero(~playing))
+
+
+def evaluate(policy, trace, sessions=100_000, rounds=1_000, bankroll=1000.0, table_min=10.0,
+             table_max=500.0, seed=0, workers=None, block_size=10_000):
+    """
+    Evaluate a betting policy over many sessions with the parallel runner.
+
+    Bets are clipped to the table limits and to the session's bankroll; a session
+    stops when its bankroll falls below the table minimum. The trace's doubles and
+    splits can lose several times the bet: such a loss is capped at the session's
+    remaining bankroll, which ruins the session, so bankrolls never go below zero.
+
+    Args:
+        policy (BettingPolicy): The policy to evaluate.
+        trace (numpy.ndarray): Rounds to replay, as recorded by record_trace.
+        sessions (int): Number of sessions (default is 100,000).
+        rounds (int): Rounds per session (default is 1,000).
+        bankroll (float): Starting bankroll of each session (default is 1000).
+        table_min (float): Table minimum bet (default is 10).
+        table_max (float): Table maximum bet (default is 500).
+        seed (int): Master seed (default is 0).
+        workers (int): Number of processes (default is one per CPU core).
+        block_size (int): Sessions stepped together per block (default is 10,000).
+
+    Returns:
+        PolicyResult: Session statistics and the risk of ruin.
+    """
+    bins = (-bankroll, 2 * bankroll, bankroll / 20)
+    run_block = partial(_sessions_block, policy=policy, trace=trace, rounds=rounds,
+                        bankroll=bankroll, table_min=table_min, table_max=table_max, bins=bins)
+    stats = SimulationStats(*bins)
+    ruined = 0
+    for block_stats, block_ruined in parallel.map_blocks(run_block, sessions, seed, workers, block_size):
+        stats.merge(block_stats)
+        ruined += block_ruined
+    return PolicyResult(stats, ruined / sessions if sessions else 0.0)
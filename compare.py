@@ -0,0 +1,235 @@
+"""
+compare.py - Paired comparison of strategies with common random numbers.
+
+Simulating two strategies on independent shuffles leaves each EV with its own
+sampling noise, and a small EV difference drowns in it. Here every strategy plays
+exactly the same deals: round ``k`` of every strategy starts from the same cards,
+so the two strategies' results are strongly correlated and the noise largely
+cancels in their per-round difference. The standard error of the paired
+difference is typically several times smaller than that of two independent runs,
+which saves the square of that factor in rounds.
+
+Each deal is the top of its own freshly shuffled shoe, shuffled once up front by
+the seedable shoe RNG (rng.NumpyRNG); rounds are therefore played as with a
+continuous shuffler, without a cut card. The deals live in one shared-memory
+array that every worker process maps instead of receiving its own pickled copy;
+each round's 64-byte row is then copied into the engine's shoe, which deals by
+popping cards off its bytearray.
+
+Example:
+    result = compare({"basic": BASIC_STRATEGY, "optimal": basic_chart()}, rounds=1_000_000)
+    print(format_comparison(result))
+"""
+
+import os
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+from stats import SimulationStats
+from strategy import StrategyTable, table_strategy
+
+# Cards kept per deal: more than any realistic round draws (a round that runs out
+# draws its last cards from the shoe's own, still common, reshuffle of the discards)
+CARDS_PER_DEAL = 64
+
+# Deals shuffled per vectorized call, which bounds memory use
+_SHUFFLE_ROWS = 4096
+
+Comparison = namedtuple("Comparison", ["baseline", "stats", "differences"])
+Comparison.__doc__ = """
+Result of a paired comparison.
+
+Attributes:
+    baseline (str): Name of the strategy the others are compared to.
+    stats (dict): Name -> SimulationStats of each strategy (bet of 1 per round).
+    differences (dict): Name -> SimulationStats of the per-round net result of
+        that strategy minus the baseline's, for every other strategy; its ``mean``
+        is the paired EV difference and ``std_error`` its standard error.
+"""
+
+
+def generate_deals(rounds, decks=6, seed=0, cards=CARDS_PER_DEAL, out=None):
+    """
+    Pre-generate the card sequence of every round.
+
+    Args:
+        rounds (int): Number of deals.
+        decks (int): Decks in the shoe each deal is shuffled from (default is 6).
+        seed (int or numpy.random.SeedSequence): Seed of the shuffles (default is 0).
+        cards (int): Cards kept per deal (default is CARDS_PER_DEAL).
+        out (numpy.ndarray): uint8 array of shape (rounds, cards) to fill (default
+            is a new array).
+
+    Returns:
+        numpy.ndarray: The deals, one row per round, dealt from the end of the row
+        like a Shoe's cards.
+    """
+    shoe = np.frombuffer(Shoe(decks, rng=NumpyRNG(0)).full_shoe, dtype=np.uint8)
+    if out is None:
+        out = np.empty((rounds, cards), dtype=np.uint8)
+    generator = NumpyRNG(seed).generator
+    for start in range(0, rounds, _SHUFFLE_ROWS):
+        stop = min(start + _SHUFFLE_ROWS, rounds)
+        shuffled = generator.permuted(np.tile(shoe, (stop - start, 1)), axis=1)
+        out[start:stop] = shuffled[:, -cards:]
+    return out
+
+
+def _play_deals(deals, strategies, rules, shoe_seed=0):
+    """Play every strategy on the same deals; return per-strategy stats and net arrays."""
+    stats = {}
+    nets = {}
+    for name, strategy in strategies.items():
+        if isinstance(strategy, StrategyTable):
+            strategy = table_strategy(strategy)
+        # No cut card: each round's cards are replaced before the deal. The shoe's
+        # own seed is the same for every strategy, so a rare mid-round refill is too.
+        engine = RoundEngine(player=Player("Player", 0.0), rules=rules,
+                             shoe=Shoe(rules.decks, penetration=1.0, rng=NumpyRNG(shoe_seed)))
+        cards = engine.deck.cards
+        play_round = engine.play_round
+        strategy_stats = SimulationStats()
+        add = strategy_stats.add
+        strategy_nets = np.empty(len(deals))
+        width = deals.shape[1]
+        flat = memoryview(deals.reshape(-1))  # Row slices without a NumPy array per round
+        for k in range(len(deals)):
+            cards[:] = flat[k * width:(k + 1) * width]
+            result = play_round(1.0, strategy)
+            add(result)
+            strategy_nets[k] = result.net
+        stats[name] = strategy_stats
+        nets[name] = strategy_nets
+    return stats, nets
+
+
+def _release_views(error):
+    """Drop the locals of an exception's traceback frames, views of shared memory included."""
+    traceback.clear_frames(error.__traceback__)
+
+
+def _compare_block(task):
+    """Compare the strategies on one block of deals in shared memory."""
+    memory_name, shape, start, stop, strategies, baseline, rules = task
+    memory = shared_memory.SharedMemory(name=memory_name)
+    deals = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)[start:stop]
+    try:
+        stats, nets = _play_deals(deals, strategies, rules, start)
+    except BaseException as error:
+        _release_views(error)
+        raise
+    finally:
+        # The segment only closes once no view of it is left
+        del deals
+        memory.close()
+
+    differences = {}
+    for name, strategy_nets in nets.items():
+        if name != baseline:
+            differences[name] = SimulationStats()
+            differences[name].add_batch(strategy_nets - nets[baseline], 1.0, {})
+    return stats, differences
+
+
+def compare(strategies, rounds=1_000_000, rules=None, seed=0, workers=None, block_size=100_000,
+            deals=None):
+    """
+    Play several strategies on the same pre-generated deals and pair their results.
+
+    Args:
+        strategies (dict): Name -> StrategyTable or picklable strategy (such as
+            strategy.basic_strategy). The first entry is the baseline.
+        rounds (int): Rounds per strategy (default is 1,000,000).
+        rules (RuleSet): The table rules (default is RuleSet()).
+        seed (int): Seed of the deals (default is 0).
+        workers (int): Number of processes (default is one per CPU core).
+        block_size (int): Deals per worker task (default is 100,000). Part of the
+            reproducibility key: block results are merged in block order, so results
+            only match between runs with the same seed and block size (the number
+            of workers does not matter).
+        deals (numpy.ndarray): Deals from generate_deals to reuse instead of
+            generating ``rounds`` new ones.
+
+    Returns:
+        Comparison: Each strategy's statistics and the paired differences.
+    """
+    if len(strategies) < 2:
+        raise ValueError("A comparison needs at least two strategies.")
+    rules = rules if rules is not None else RuleSet()
+    baseline = next(iter(strategies))
+    rounds = len(deals) if deals is not None else rounds
+    shape = (rounds, deals.shape[1] if deals is not None else CARDS_PER_DEAL)
+
+    # The deals are written once into shared memory, which workers map instead of unpickling
+    memory = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1]))
+    try:
+        shared = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+        try:
+            if deals is not None:
+                shared[:] = deals
+            else:
+                generate_deals(rounds, rules.decks, seed, shape[1], out=shared)
+        except BaseException as error:
+            _release_views(error)
+            raise
+        finally:
+            del shared
+
+        tasks = [(memory.name, shape, start, min(start + block_size, rounds), strategies, baseline,
+                  rules) for start in range(0, rounds, block_size)]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(tasks) <= 1:
+            blocks = list(map(_compare_block, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                blocks = list(executor.map(_compare_block, tasks))
+    finally:
+        memory.close()
+        memory.unlink()
+
+    stats = {name: SimulationStats() for name in strategies}
+    differences = {name: SimulationStats() for name in strategies if name != baseline}
+    for block_stats, block_differences in blocks:
+        for name, partial_stats in block_stats.items():
+            stats[name].merge(partial_stats)
+        for name, partial_stats in block_differences.items():
+            differences[name].merge(partial_stats)
+    return Comparison(baseline, stats, differences)
+
+
+def format_comparison(result):
+    """
+    Format a comparison as a text table.
+
+    For each strategy the table gives its EV, then its paired EV difference to the
+    baseline with the paired standard error, the standard error two independent
+    runs of the same length would have had, and the equivalent speed-up in rounds.
+
+    Args:
+        result (Comparison): The comparison to format.
+
+    Returns:
+        str: The table.
+    """
+    base = result.stats[result.baseline]
+    lines = [f"{'strategy':<16} {'EV':>18} {'vs ' + result.baseline:>22} {'independent SE':>15} "
+             f"{'speed-up':>9}"]
+    for name, stats in result.stats.items():
+        line = f"{name:<16} {stats.ev:>+9.4%} ± {stats.ev_std_error:<7.4%}"
+        difference = result.differences.get(name)
+        if difference is not None:
+            independent = (base.std_error ** 2 + stats.std_error ** 2) ** 0.5
+            paired = difference.std_error
+            speedup = (independent / paired) ** 2 if paired else float("inf")
+            line += f" {difference.mean:>+12.4%} ± {paired:<7.4%} {independent:>15.4%} {speedup:>8.1f}x"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,74 @@
+"""
+counting.py - Card-counting tag systems and the running counts kept by a deck.
+
+A counting system assigns a tag to each card value. Creating a RunningCount for a
+deck or shoe registers it with that deck, which then updates it in O(1) as each
+card is dealt (Deck.deal_card), so strategies and bet-sizing hooks can read the
+running and true counts at any moment without rescanning the dealt cards.
+"""
+
+from collections import namedtuple
+
+from deck import CARD_VALUES
+
+CountingSystem = namedtuple("CountingSystem", ["name", "tags"])
+CountingSystem.__doc__ = """
+A card-counting tag system.
+
+Attributes:
+    name (str): The system's name.
+    tags (tuple): Tag of each card value, in the order 2, 3, ..., 9, ten-valued, Ace.
+"""
+
+HI_LO = CountingSystem("Hi-Lo", (1, 1, 1, 1, 1, 0, 0, 0, -1, -1))
+KO = CountingSystem("KO", (1, 1, 1, 1, 1, 1, 0, 0, -1, -1))
+OMEGA_II = CountingSystem("Omega II", (1, 1, 2, 2, 2, 1, 0, -1, -2, 0))
+
+SYSTEMS = {system.name: system for system in (HI_LO, KO, OMEGA_II)}
+
+
+class RunningCount:
+    """
+    The running count of one tag system over the cards dealt from a deck.
+
+    Unbalanced systems (whose tags do not sum to zero over a deck, like KO) start
+    from the usual initial running count of -(deck tag sum) * (decks - 1).
+
+    Attributes:
+        system (CountingSystem): The tag system.
+        deck (Deck): The deck or shoe being counted.
+        weights (tuple): Tag of every card code, for O(1) updates.
+        initial (int): Running count of a freshly shuffled shoe.
+        running (int): The current running count.
+    """
+
+    def __init__(self, system, deck):
+        """
+        Initialize the count for a freshly shuffled deck and register it with the deck.
+
+        Args:
+            system (CountingSystem): The tag system.
+            deck (Deck): The deck or shoe being counted.
+        """
+        if len(system.tags) != 10:
+            raise ValueError("A counting system needs one tag per card value (2-9, ten, Ace).")
+        self.system = system
+        self.deck = deck
+        self.weights = tuple(system.tags[value - 2] for value in CARD_VALUES)
+        self.initial = -4 * sum(system.tags[:8]) - 16 * system.tags[8] - 4 * system.tags[9]
+        self.initial *= getattr(deck, "decks", 1) - 1
+        self.running = self.initial
+        deck.counts.append(self)
+
+    def reset(self):
+        """Restart the count after the cards have been shuffled back in."""
+        self.running = self.initial
+
+    def true_count(self):
+        """
+        Return the running count divided by the number of decks left to deal.
+
+        Returns:
+            float: The true count.
+        """
+        return self.running * 52 / max(len(self.deck.cards), 1)
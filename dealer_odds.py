@@ -0,0 +1,156 @@
+"""
+dealer_odds.py - Exact distribution of the dealer's final total.
+
+Instead of playing hands, the dealer's drawing rule (engine.RoundEngine.dealer_turn)
+is applied to every possible card sequence of a given shoe composition. The
+recursion is memoized on (composition, hard total, Ace flag), which collapses the
+card sequences into a small number of distinct states. The memo belongs to one
+call of dealer_distribution or dealer_table and is dropped when it returns, so
+memory does not grow with the number of shoes and rules asked about.
+
+A composition is a tuple of 10 card counts indexed by value: index 0 holds the
+2s, ..., index 8 every ten-valued card and index 9 the Aces.
+"""
+
+from deck import CARD_VALUES, ACE
+from engine import DEALER_STANDS, BLACKJACK, BUST
+from player import best_total
+
+# Final dealer results, in the order of the probability tuples
+FINAL_TOTALS = (17, 18, 19, 20, 21, BLACKJACK, BUST)
+_BUST_INDEX = FINAL_TOTALS.index(BUST)
+_BLACKJACK_INDEX = FINAL_TOTALS.index(BLACKJACK)
+
+# Card values in composition order
+VALUES = tuple(range(2, 12))
+
+
+def shoe_composition(decks=6):
+    """
+    Return the composition of a full shoe.
+
+    Args:
+        decks (int): Number of decks in the shoe.
+
+    Returns:
+        tuple: Card counts by value index.
+    """
+    return (4 * decks,) * 8 + (16 * decks, 4 * decks)
+
+
+def composition_of(cards):
+    """
+    Return the composition of a collection of card codes (e.g. a shoe's remaining cards).
+
+    Args:
+        cards (iterable): Card codes.
+
+    Returns:
+        tuple: Card counts by value index.
+    """
+    counts = [0] * len(VALUES)
+    for card in cards:
+        counts[CARD_VALUES[card] - 2] += 1
+    return tuple(counts)
+
+
+def _remove(composition, index):
+    """Return the composition with one card of value index ``index`` taken out."""
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+def _finish(memo, composition, hard_total, has_ace, hit_soft_17):
+    """Probabilities of FINAL_TOTALS (Blackjack excluded) from a dealer hand that is not a natural."""
+    key = (composition, hard_total, has_ace)
+    result = memo.get(key)
+    if result is not None:
+        return result
+
+    total = best_total(hard_total, has_ace)
+    result = [0.0] * len(FINAL_TOTALS)
+    if total > 21:
+        result[_BUST_INDEX] = 1.0
+    elif total >= DEALER_STANDS and not (hit_soft_17 and total == 17 and total != hard_total):
+        result[total - 17] = 1.0
+    else:
+        remaining = sum(composition)
+        for index, count in enumerate(composition):
+            if not count:
+                continue
+            value = VALUES[index]
+            ace = value == ACE
+            sub = _finish(memo, _remove(composition, index), hard_total + (1 if ace else value),
+                          has_ace or ace, hit_soft_17)
+            weight = count / remaining
+            for i, p in enumerate(sub):
+                result[i] += weight * p
+    result = memo[key] = tuple(result)
+    return result
+
+
+def dealer_distribution(upcard, composition, no_blackjack=False, hit_soft_17=False):
+    """
+    Compute the exact distribution of the dealer's final result for one upcard.
+
+    Args:
+        upcard (int): The upcard's value (2-11, Ace is 11).
+        composition (tuple): The shoe's remaining cards, the upcard already removed.
+        no_blackjack (bool): Condition on the dealer not having Blackjack, which is
+            what the player knows once the dealer has peeked (default is False).
+        hit_soft_17 (bool): The dealer hits soft 17 (default is False: stands on all 17s).
+
+    Returns:
+        dict: Probability of each entry of FINAL_TOTALS (17-21, Blackjack, bust).
+    """
+    return _distribution({}, upcard, composition, no_blackjack, hit_soft_17)
+
+
+def _distribution(memo, upcard, composition, no_blackjack, hit_soft_17):
+    """dealer_distribution, memoized in ``memo``."""
+    up_ace = upcard == ACE
+    up_hard = 1 if up_ace else upcard
+    result = [0.0] * len(FINAL_TOTALS)
+    remaining = sum(composition)
+
+    # The hole card decides whether the dealer has a natural
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        value = VALUES[index]
+        ace = value == ACE
+        hard_total = up_hard + (1 if ace else value)
+        weight = count / remaining
+        if best_total(hard_total, up_ace or ace) == 21:
+            result[_BLACKJACK_INDEX] += weight
+            continue
+        sub = _finish(memo, _remove(composition, index), hard_total, up_ace or ace, hit_soft_17)
+        for i, p in enumerate(sub):
+            result[i] += weight * p
+
+    if no_blackjack:
+        scale = 1.0 - result[_BLACKJACK_INDEX]
+        result = [p / scale for p in result]
+        result[_BLACKJACK_INDEX] = 0.0
+    return dict(zip(FINAL_TOTALS, result))
+
+
+def dealer_table(composition=None, no_blackjack=False, hit_soft_17=False):
+    """
+    Compute the dealer's final-result distribution for every upcard.
+
+    Args:
+        composition (tuple): The shoe before the upcard is dealt (default is a full 6-deck shoe).
+        no_blackjack (bool): Condition on the dealer not having Blackjack (default is False).
+        hit_soft_17 (bool): The dealer hits soft 17 (default is False).
+
+    Returns:
+        dict: Upcard value (2-11) -> distribution, as returned by dealer_distribution.
+    """
+    if composition is None:
+        composition = shoe_composition()
+    memo = {}  # Shared by the upcards, whose shoes lead to many of the same states
+    return {
+        VALUES[index]: _distribution(memo, VALUES[index], _remove(composition, index), no_blackjack,
+                                     hit_soft_17)
+        for index, count in enumerate(composition) if count
+    }
@@ -1,29 +1,252 @@
 import random
 
+from rng import NumpyRNG
+
+# Cards are encoded as small ints: code = suit_index * 13 + rank_index.
+# Conversion to (rank, suit) tuples only happens at the display edges.
+RANKS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A')
+SUITS = ('♠', '♥', '♦', '♣')
+
+# Blackjack value of every card code (Aces count as 11)
+CARD_VALUES = bytes([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * len(SUITS))
+ACE = 11
+
+
+def encode_card(rank, suit):
+    """
+    Encode a (rank, suit) card as its integer code.
+
+    Args:
+        rank (int or str): The card rank, e.g. 7, '7' or 'Q'.
+        suit (str): The card suit, e.g. '♠'.
+
+    Returns:
+        int: The card code.
+    """
+    if isinstance(rank, str) and rank.isdigit():
+        rank = int(rank)
+    return SUITS.index(suit) * 13 + RANKS.index(rank)
+
+
+def decode_card(card):
+    """
+    Decode an integer card code into its (rank, suit) tuple.
+
+    Args:
+        card (int): The card code.
+
+    Returns:
+        tuple: The card as (rank, suit).
+    """
+    suit, rank = divmod(card, 13)
+    return RANKS[rank], SUITS[suit]
+
+
+def card_label(card):
+    """
+    Return the printable label of a card code, e.g. 'Q♥'.
+
+    Args:
+        card (int): The card code.
+
+    Returns:
+        str: The rank followed by the suit.
+    """
+    rank, suit = decode_card(card)
+    return f"{rank}{suit}"
+
+
 class Deck:
     """
     A class to represent a deck of cards in Blackjack.
+
+    Cards are stored as integer codes in a bytearray (see encode_card).
+
+    Attributes:
+        cards (bytearray): The cards left to deal; the top of the deck is the end.
+        counts (list): The RunningCount of every tracked counting system (see counting.py).
     """
 
-    def __init__(self, predefined_cards=None):
+    def __init__(self, predefined_cards=None, rng=None):
         """
         Initialize the deck. If predefined_cards is provided, use it instead of shuffling.
         Args:
-            predefined_cards (list): A list of cards to use for testing.
+            predefined_cards (list): A list of cards (codes or (rank, suit) tuples) to use for testing.
+            rng (random.Random or rng.NumpyRNG): Random source for shuffling (default is the
+                global `random` module). Anything with a shuffle(cards) method works.
         """
+        self.rng = rng if rng is not None else random
+        self.counts = []
         if predefined_cards:
-            self.cards = predefined_cards  # Testing mode
+            # Testing mode
+            self.cards = bytearray(
+                card if isinstance(card, int) else encode_card(*card) for card in predefined_cards
+            )
         else:
-            self.cards = [
-                (rank, suit) for suit in ['♠', '♥', '♦', '♣']
-                for rank in list(range(2, 11)) + ['J', 'Q', 'K', 'A']
-            ]
+            self.cards = self.build()
             self.shuffle()
 
+    def build(self):
+        """Return the 52 card codes of a standard deck, unshuffled."""
+        return bytearray(range(len(CARD_VALUES)))
+
     def shuffle(self):
         """Shuffle the deck of cards randomly."""
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def deal_card(self):
         """Deal one card from the top of the deck."""
-        return self.cards.pop() if self.cards else None
+        if not self.cards:
+            return None
+        card = self.cards.pop()
+        for count in self.counts:
+            count.running += count.weights[card]
+        return card
+
+    def count(self, name):
+        """
+        Return the tracked running count of a counting system.
+
+        Args:
+            name (str): The system's name, e.g. 'Hi-Lo'.
+
+        Returns:
+            counting.RunningCount: The count.
+        """
+        for count in self.counts:
+            if count.system.name == name:
+                return count
+        raise KeyError(f"Counting system {name!r} is not tracked by this deck.")
+
+    def decks_remaining(self):
+        """
+        Return the number of decks left to deal.
+
+        Returns:
+            float: Cards remaining divided by 52.
+        """
+        return len(self.cards) / 52
+
+
+class Shoe(Deck):
+    """
+    A multi-deck shoe with a cut card, dealt from across many rounds.
+
+    The shoe is built and shuffled once; it is only reshuffled after the cut card
+    has come out, instead of rebuilding a deck for every hand.
+
+    Attributes:
+        decks (int): Number of 52-card decks in the shoe (1-8).
+        penetration (float): Fraction of the shoe dealt before the cut card comes out.
+        cut_card (int): Number of cards left in the shoe when the cut card is reached.
+        round_start (bytearray): The cards the shoe held when the current round started
+            (see start_round); those dealt since are in play.
+    """
+
+    def __init__(self, decks=6, penetration=0.75, predefined_cards=None, rng=None):
+        """
+        Initialize and shuffle the shoe.
+
+        Args:
+            decks (int): Number of decks in the shoe (1-8, default is 6).
+            penetration (float): Fraction of the shoe dealt before reshuffling (default is 0.75).
+            predefined_cards (list): A list of cards to use for testing.
+            rng (random.Random or rng.NumpyRNG): Random source for shuffling (default is a
+                NumpyRNG seeded from OS entropy, whose vectorized shuffle of a whole shoe
+                is about ten times faster than the `random` module's). Anything with a
+                shuffle(cards) method works.
+        """
+        if not 1 <= decks <= 8:
+            raise ValueError("A shoe holds between 1 and 8 decks.")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be in the range (0, 1].")
+        self.decks = decks
+        self.penetration = penetration
+        super().__init__(predefined_cards, rng if rng is not None else NumpyRNG())
+        self.full_shoe = bytes(self.cards)
+        self.cut_card = int(len(self.full_shoe) * (1 - penetration))
+        self.round_start = bytearray()
+
+    def build(self):
+        """Return the cards of every deck in the shoe, unshuffled."""
+        return super().build() * self.decks
+
+    def needs_shuffle(self):
+        """
+        Check whether the cut card has come out.
+
+        Returns:
+            bool: True if the shoe should be reshuffled before the next round.
+        """
+        return len(self.cards) <= self.cut_card
+
+    def reshuffle(self):
+        """Gather every card back into the shoe, shuffle it and restart the counts."""
+        self.cards[:] = self.full_shoe
+        self.shuffle()
+        for count in self.counts:
+            count.reset()
+
+    def start_round(self):
+        """Mark the start of a round: the cards dealt from now on are in play."""
+        self.round_start = self.cards[:]
+
+    def reshuffle_discards(self):
+        """
+        Shuffle every card but those in play back into the shoe, in the middle of a round.
+
+        The cards dealt since start_round stay out of the new shoe, so no card can be
+        dealt twice in a round, and the restarted counts have seen them.
+
+        Raises:
+            ValueError: If every card of the shoe is in play.
+        """
+        in_play = self.round_start[len(self.cards):]
+        cards = bytearray(self.full_shoe)
+        for card in in_play:
+            cards.remove(card)
+        if not cards:
+            raise ValueError("Every card of the shoe is in play; there is nothing to reshuffle.")
+        self.cards[:] = cards
+        self.shuffle()
+        for count in self.counts:
+            count.reset()
+            count.running += sum(map(count.weights.__getitem__, in_play))
+        # The cards in play stay dealt from the new shoe's point of view too
+        self.round_start = self.cards + in_play
+
+    def deal_card(self):
+        """
+        Deal one card from the top of the shoe.
+
+        If the shoe runs out mid-round, which can only happen with a penetration close
+        to 1, the discards are reshuffled (see reshuffle_discards).
+        """
+        if not self.cards:
+            self.reshuffle_discards()
+        card = self.cards.pop()
+        for count in self.counts:
+            count.running += count.weights[card]
+        return card
+
+    def deal_cards(self, number):
+        """
+        Deal several cards from the top of the shoe in one go.
+
+        The cards and the running counts are the same as with as many deal_card calls.
+
+        Args:
+            number (int): Number of cards to deal.
+
+        Returns:
+            bytearray: The card codes, in the order they are dealt.
+        """
+        cards = self.cards
+        if len(cards) < number:
+            return bytearray(self.deal_card() for _ in range(number))
+        dealt = cards[-number:]
+        del cards[-number:]
+        dealt.reverse()
+        for count in self.counts:
+            count.running += sum(map(count.weights.__getitem__, dealt))
+        return dealt
@@ -0,0 +1,841 @@
+"""
+engine.py - Headless Blackjack round engine.
+
+The engine plays complete rounds without any terminal or GUI I/O. Every decision
+is delegated to a strategy callable and each round is settled into a compact
+RoundResult record, so the same rules drive the terminal game, the GUI and
+batch simulations.
+"""
+
+from collections import namedtuple
+
+from deck import Shoe, CARD_VALUES, ACE
+from player import Player, best_total, hand_value
+from rules import RuleSet, DOUBLE_TOTALS, SURRENDER_NONE, SURRENDER_EARLY, SURRENDER_ANY
+
+# Player actions (the same letters the terminal game accepts)
+HIT = 'h'
+STAND = 's'
+DOUBLE = 'd'
+SPLIT = 'p'
+SURRENDER = 'r'
+
+ACTION_NAMES = {HIT: "Hit", STAND: "Stand", DOUBLE: "Double", SPLIT: "Split", SURRENDER: "Surrender"}
+
+# Answers to the insurance offer
+INSURE = 'y'
+DECLINE = 'n'
+INSURANCE_ACTIONS = INSURE + DECLINE
+
+# Hand outcomes
+WIN = "Win"
+LOSE = "Lose"
+PUSH = "Tie"
+BLACKJACK = "Blackjack"
+BUST = "Bust"
+SURRENDERED = "Surrender"
+
+# The dealer draws below this total and stands on it or above (soft 17 included
+# unless the rules say the dealer hits soft 17)
+DEALER_STANDS = 17
+
+# Net result of each outcome, as a multiple of the hand's wager (Blackjack at the
+# default 3:2; see CompiledRules.payouts for a table's own payouts)
+PAYOUTS = {
+    WIN: 1.0,
+    LOSE: -1.0,
+    PUSH: 0.0,
+    BLACKJACK: 1.5,
+    BUST: -1.0,
+    SURRENDERED: -0.5,
+}
+
+RoundResult = namedtuple(
+    "RoundResult",
+    ["bet", "net", "outcomes", "player_totals", "dealer_total", "doubled", "split", "insured"],
+)
+RoundResult.__doc__ = """
+Compact record of a settled round.
+
+Attributes:
+    bet (float): The initial bet.
+    net (float): Bankroll change over the round, insurance included.
+    outcomes (tuple): Outcome of each player hand (one entry, or two after a split).
+    player_totals (tuple): Final total of each player hand.
+    dealer_total (int): The dealer's final total.
+    doubled (bool): Whether the player doubled down.
+    split (bool): Whether the player split.
+    insured (bool): Whether the player took insurance.
+"""
+
+OpenRound = namedtuple(
+    "OpenRound", ["bet", "net", "totals", "wagers", "doubled", "split", "insured"],
+)
+OpenRound.__doc__ = """
+A seat's round that has been played out and waits for the dealer to be settled.
+
+Attributes:
+    bet (float): The initial bet.
+    net (float): Bankroll change accrued so far (insurance).
+    totals (tuple): Final total of each player hand.
+    wagers (tuple): Amount riding on each player hand.
+    doubled (bool): Whether the player doubled down.
+    split (bool): Whether the player split.
+    insured (bool): Whether the player took insurance.
+"""
+
+Decision = namedtuple("Decision", ["hand", "upcard", "actions"])
+Decision.__doc__ = """
+A decision a SteppedRound waits for.
+
+Attributes:
+    hand (Player): The hand being played (the player, or one of the split hands).
+    upcard (int): The dealer's face-up card code.
+    actions (str): The allowed action letters (INSURANCE_ACTIONS for the insurance offer).
+"""
+
+CompiledRules = namedtuple(
+    "CompiledRules",
+    ["payouts", "dealer_draws", "first_actions", "hit_actions", "split_actions",
+     "split_ace_actions", "max_split_hands", "resplit_aces", "openings", "hand_nets"],
+)
+CompiledRules.__doc__ = """
+A RuleSet compiled into the lookup tables the engine plays from.
+
+Attributes:
+    payouts (dict): Net result of each outcome, as a multiple of the hand's wager.
+    dealer_draws (tuple): dealer_draws[hard_total][has_ace] is True while the dealer draws.
+    first_actions (tuple): first_actions[total][is_pair] is the action string of
+        the first decision on the unsplit hand.
+    hit_actions (str): Actions allowed on the unsplit hand after a hit.
+    split_actions (tuple): split_actions[total][can_resplit] is the action string of
+        the first decision on a split hand (later decisions are always hit or stand).
+    split_ace_actions (tuple): The same for hands of split Aces.
+    max_split_hands (int): Most hands a player may split into.
+    resplit_aces (bool): Whether split Aces may be split again.
+    openings (tuple): openings[upcard] is the tuple of opening steps played before
+        the player's hand with that dealer upcard (insurance offer, early
+        surrender decision, dealer peek), in order; empty when the upcard leaves
+        nothing to offer or check.
+    hand_nets (tuple): hand_nets[dealer_total][player_total] is the net result per
+        unit wagered of a finished hand against a dealer without Blackjack.
+"""
+
+# Before the player's hand, the opening steps carry (insurance net, insured,
+# early decision) from one step to the next; a step that ends the round returns
+# its RoundResult instead.
+_NO_OPENING = (0.0, False, None)
+
+
+def _offer_insurance(engine, player, upcard, actions, bet, strategy, state):
+    """Opening step: offer insurance against the Ace; it pays 2:1."""
+    if strategy(player, upcard, INSURANCE_ACTIONS) != INSURE:
+        return state
+    net = bet if engine.dealer.is_blackjack() else -bet / 2
+    return (state[0] + net, True, state[2])
+
+
+def _early_decision(engine, player, upcard, actions, bet, strategy, state):
+    """Opening step: early surrender, the first decision is taken before the peek."""
+    if player.is_blackjack():
+        return state
+    return (state[0], state[1], strategy(player, upcard, actions))
+
+
+def _peek(engine, player, upcard, actions, bet, strategy, state):
+    """Opening step: the dealer checks for Blackjack, which ends the round."""
+    if state[2] == SURRENDER or not engine.dealer.is_blackjack():
+        return state
+    outcome = PUSH if player.is_blackjack() else LOSE
+    return RoundResult(bet, state[0] + engine.compiled.payouts[outcome] * bet, (outcome,),
+                       (player.calculate_hand(),), 21, False, False, state[1])
+
+
+def compile_rules(rules):
+    """
+    Compile a RuleSet into lookup tables.
+
+    Args:
+        rules (RuleSet): The table rules.
+
+    Returns:
+        CompiledRules: The tables.
+    """
+    payouts = dict(PAYOUTS)
+    payouts[BLACKJACK] = rules.blackjack_payout
+
+    dealer_draws = []
+    for hard_total in range(32):
+        soft_17 = rules.hit_soft_17 and hard_total == 7
+        dealer_draws.append((hard_total < DEALER_STANDS,
+                             best_total(hard_total, True) < DEALER_STANDS or soft_17))
+
+    surrender = SURRENDER if rules.surrender != SURRENDER_NONE else ''
+    can_split = SPLIT if rules.max_split_hands > 1 else ''
+    double_totals = DOUBLE_TOTALS[rules.double_on]
+    first_actions = []
+    split_actions = []
+    for total in range(22):
+        double = DOUBLE if total in double_totals else ''
+        first_actions.append((HIT + STAND + double + surrender,
+                              HIT + STAND + double + surrender + can_split))
+        split_double = double if rules.double_after_split else ''
+        split_actions.append((HIT + STAND + split_double, HIT + STAND + split_double + SPLIT))
+    if rules.hit_split_aces:
+        split_ace_actions = split_actions
+    else:
+        split_ace_actions = [(STAND, STAND + SPLIT)] * 22
+
+    # Only an Ace or a ten-valued upcard can hide a Blackjack, so the other upcards
+    # go straight to the player's hand
+    openings = []
+    for value in CARD_VALUES:
+        steps = []
+        if rules.insurance and value == ACE:
+            steps.append(_offer_insurance)
+        if value in (10, ACE):
+            if rules.surrender == SURRENDER_EARLY:
+                steps.append(_early_decision)
+            if rules.dealer_peek:
+                steps.append(_peek)
+        openings.append(tuple(steps))
+
+    hand_nets = tuple(
+        tuple(payouts[RoundEngine.check_winner(player_total, dealer_total)]
+              for player_total in range(32))
+        for dealer_total in range(32)
+    )
+
+    return CompiledRules(
+        payouts=payouts,
+        dealer_draws=tuple(dealer_draws),
+        first_actions=tuple(first_actions),
+        hit_actions=HIT + STAND + (surrender if rules.surrender == SURRENDER_ANY else ''),
+        split_actions=tuple(split_actions),
+        split_ace_actions=tuple(split_ace_actions),
+        max_split_hands=rules.max_split_hands,
+        resplit_aces=rules.resplit_aces,
+        openings=tuple(openings),
+        hand_nets=hand_nets,
+    )
+
+
+class RoundEngine:
+    """
+    Plays Blackjack rounds headlessly, taking decisions from a strategy callable.
+
+    A strategy is called as ``strategy(hand, upcard, actions)`` where ``hand`` is
+    the Player holding the cards being played, ``upcard`` is the dealer's face-up
+    card code and ``actions`` is a string of the allowed action letters. It must return
+    one of those letters. The insurance offer uses the same callable with
+    ``actions == INSURANCE_ACTIONS``. Strategies that count cards can hold a
+    counting.RunningCount of the engine's shoe and read it at each decision.
+
+    Attributes:
+        deck (Shoe): The shoe the cards are dealt from, kept across rounds.
+        player (Player): The player object.
+        dealer (Player): The dealer object.
+        rules (RuleSet): The table rules; change them with set_rules.
+        compiled (CompiledRules): The rules compiled into lookup tables.
+        split_hands (list): Preallocated hand pool used when the player splits.
+        split_count (int): Number of split hands in play, the first split_count of
+            split_hands (set by the last split).
+        recorder (history.HandHistoryWriter): Receives every round played by
+            play_round, or None (default) to record nothing.
+        profiler (profiling.EngineProfiler): The profiler timing this engine's
+            phases, or None (default). Set by EngineProfiler.attach.
+    """
+
+    def __init__(self, player=None, dealer=None, shoe=None, rules=None):
+        """
+        Initialize the engine with a shoe, player, dealer and table rules.
+
+        Args:
+            player (Player): The player (default is a fresh Player).
+            dealer (Player): The dealer (default is a fresh Player named "Dealer").
+            shoe (Shoe): The shoe to deal from (default is a fresh Shoe with the
+                rules' number of decks).
+            rules (RuleSet): The table rules (default is RuleSet()).
+        """
+        self.set_rules(rules if rules is not None else RuleSet())
+        self.deck = shoe if shoe is not None else Shoe(self.rules.decks)
+        self.player = player if player is not None else Player("Player")
+        self.dealer = dealer if dealer is not None else Player("Dealer")
+        self.recorder = None
+        self.profiler = None
+
+    def set_rules(self, rules):
+        """
+        Play by a new rule set from the next decision on.
+
+        The shoe is kept; build a new engine or shoe to change the number of decks.
+
+        Args:
+            rules (RuleSet): The table rules.
+        """
+        self.rules = rules
+        self.compiled = compile_rules(rules)
+        # Reusable hands for splitting, so that splits allocate nothing per round
+        self.split_hands = [Player("Split hand") for _ in range(rules.max_split_hands)]
+        self.split_count = 0
+        self._split_wagers = [0.0] * rules.max_split_hands
+
+    def deal(self):
+        """
+        Start a new round: empty hands and the initial two cards each.
+
+        The shoe is reshuffled first if the cut card came out in the previous round.
+        """
+        deck = self.deck
+        if deck.needs_shuffle():
+            deck.reshuffle()
+        deck.start_round()
+        # Player, dealer, player, dealer, taken off the shoe in one slice
+        cards = deck.deal_cards(4)
+        self.player.set_hand(cards[0::2])
+        self.dealer.set_hand(cards[1::2])
+
+    def upcard(self):
+        """
+        Return the dealer's face-up card.
+
+        Returns:
+            int: The dealer's first card code.
+        """
+        return self.dealer.hand[0]
+
+    def play_round(self, bet, strategy):
+        """
+        Play one full round and apply its result to the player's bankroll.
+
+        Args:
+            bet (float): The bet amount for this round.
+            strategy (callable): Decision function, see the class docstring.
+
+        Returns:
+            RoundResult: The settled round.
+        """
+        if self.recorder is not None:
+            return self.record_round(bet, strategy)
+        self.deal()
+        result = self.play_dealt_round(bet, strategy)
+        self.player.bankroll += result.net
+        return result
+
+    def record_round(self, bet, strategy):
+        """
+        Play one full round like play_round and pass it to the recorder.
+
+        The recorder also receives the actions taken and the running count of the
+        shoe's first tracked counting system (0 if none) before the deal.
+
+        Args:
+            bet (float): The bet amount for this round.
+            strategy (callable): Decision function, see the class docstring.
+
+        Returns:
+            RoundResult: The settled round.
+        """
+        if self.deck.needs_shuffle():
+            self.deck.reshuffle()
+        running_count = self.deck.counts[0].running if self.deck.counts else 0
+        self.deal()
+
+        actions = bytearray()
+
+        def recording(hand, upcard, allowed):
+            action = strategy(hand, upcard, allowed)
+            actions.extend(action.encode())
+            return action
+
+        result = self.play_dealt_round(bet, recording)
+        self.player.bankroll += result.net
+        self.recorder.record(self, result, actions, running_count)
+        return result
+
+    def play_dealt_round(self, bet, strategy):
+        """
+        Play out a round whose initial cards have already been dealt.
+
+        The bankroll is left untouched; the caller applies ``result.net``.
+
+        Args:
+            bet (float): The bet amount for this round.
+            strategy (callable): Decision function, see the class docstring.
+
+        Returns:
+            RoundResult: The settled round.
+        """
+        seat_round = self.play_seat(self.player, bet, strategy)
+        if type(seat_round) is RoundResult:
+            return seat_round
+        if min(seat_round.totals) <= 21:
+            dealer_total = self.dealer_turn()
+        else:
+            dealer_total = self.dealer.calculate_hand()
+        return self.settle(seat_round, dealer_total)
+
+    def play_seat(self, player, bet, strategy):
+        """
+        Play one seat's hands of a dealt round, up to the dealer's turn.
+
+        Rounds that end before the dealer plays (naturals, surrender) are settled
+        at once; the others are returned open, to be settled with settle() once the
+        dealer has played.
+
+        Args:
+            player (Player): The seat's player, holding its two initial cards.
+            bet (float): The bet amount for this round.
+            strategy (callable): Decision function, see the class docstring.
+
+        Returns:
+            RoundResult or OpenRound: The settled or open round.
+        """
+        compiled = self.compiled
+        upcard = self.dealer.hand[0]
+        hand = player.hand
+        player_total = player.total
+        actions = compiled.first_actions[player_total][CARD_VALUES[hand[0]] == CARD_VALUES[hand[1]]]
+
+        # Insurance, early surrender and the peek, as far as the rules and upcard call for them
+        state = _NO_OPENING
+        for step in compiled.openings[upcard]:
+            state = step(self, player, upcard, actions, bet, strategy, state)
+            if type(state) is RoundResult:
+                return state
+        net, insured, action = state
+
+        # A natural ends the round immediately
+        if player_total == 21:
+            outcome = PUSH if self.dealer.is_blackjack() else BLACKJACK
+            return RoundResult(bet, net + compiled.payouts[outcome] * bet, (outcome,), (player_total,),
+                               self.dealer.calculate_hand(), False, False, insured)
+
+        deal_card = self.deck.deal_card
+        wager = bet
+        doubled = False
+        if action is None:
+            action = strategy(player, upcard, actions)
+        while True:
+            if action == HIT:
+                player.add_card(deal_card())
+                if player.hard_total > 21:
+                    break
+                actions = compiled.hit_actions
+
+            elif action == STAND:
+                break
+
+            elif action == SURRENDER and SURRENDER in actions:
+                return RoundResult(bet, net + compiled.payouts[SURRENDERED] * bet, (SURRENDERED,),
+                                   (player.total,), self.dealer.calculate_hand(),
+                                   False, False, insured)
+
+            elif action == DOUBLE and DOUBLE in actions:
+                wager *= 2
+                doubled = True
+                player.add_card(deal_card())
+                break
+
+            elif action == SPLIT and SPLIT in actions:
+                return self.handle_split(bet, strategy, net, insured, player)
+
+            else:
+                raise ValueError(f"Strategy chose an unavailable action: {action!r}")
+
+            action = strategy(player, upcard, actions)
+
+        return OpenRound(bet, net, (player.total,), (wager,), doubled, False, insured)
+
+    def settle(self, seat_round, dealer_total):
+        """
+        Settle an open round against the dealer's final hand.
+
+        Args:
+            seat_round (OpenRound): The round to settle.
+            dealer_total (int): The dealer's final hand value.
+
+        Returns:
+            RoundResult: The settled round.
+        """
+        payouts = self.compiled.payouts
+        dealer_blackjack = self.dealer.is_blackjack()
+        net = seat_round.net
+        outcomes = []
+        for total, wager in zip(seat_round.totals, seat_round.wagers):
+            if dealer_blackjack and total <= 21:
+                outcome = LOSE  # Without a peek, a dealer Blackjack beats a drawn 21
+            else:
+                outcome = self.check_winner(total, dealer_total)
+            net += payouts[outcome] * wager
+            outcomes.append(outcome)
+        return RoundResult(seat_round.bet, net, tuple(outcomes), seat_round.totals, dealer_total,
+                           seat_round.doubled, seat_round.split, seat_round.insured)
+
+    def handle_split(self, bet, strategy, net=0.0, insured=False, player=None):
+        """
+        Split the player's pair and play the split hands, up to the dealer's turn.
+
+        Hands are played left to right, each receiving its second card when its
+        turn comes. Depending on the rules, a new pair may be split again (up to
+        max_split_hands hands, Aces only with resplit_aces), a split hand may double
+        on its first decision (double_after_split) and split Aces may receive a
+        single card only (hit_split_aces). The hands come from the engine's
+        preallocated split_hands pool.
+
+        Args:
+            bet (float): The bet placed on each hand.
+            strategy (callable): Decision function, see the class docstring.
+            net (float): Bankroll change already accrued this round (insurance).
+            insured (bool): Whether the player took insurance.
+            player (Player): The player holding the pair (default is the engine's player).
+
+        Returns:
+            OpenRound: The split round, waiting for the dealer.
+        """
+        if player is None:
+            player = self.player
+        compiled = self.compiled
+        hands = self.split_hands
+        wagers = self._split_wagers
+        deal_card = self.deck.deal_card
+        aces = CARD_VALUES[player.hand[0]] == ACE
+        table = compiled.split_ace_actions if aces else compiled.split_actions
+        can_resplit = compiled.resplit_aces or not aces
+        max_hands = compiled.max_split_hands
+
+        for hand, card in zip(hands, player.hand):
+            hand.reset_hand()
+            hand.add_card(card)
+        count = self.split_count = 2
+        i = 0
+        while i < count:
+            hand = hands[i]
+            hand.add_card(deal_card())
+            pair = can_resplit and count < max_hands and CARD_VALUES[hand.hand[0]] == CARD_VALUES[hand.hand[1]]
+            ending = self.play_split_hand(hand, strategy, table[hand.total][pair])
+
+            if ending == SPLIT:
+                # The second card starts a new hand, played right after this one
+                first, second = hand.hand
+                new_hand = hands.pop(count)
+                hands.insert(i + 1, new_hand)
+                hand.reset_hand()
+                hand.add_card(first)
+                new_hand.reset_hand()
+                new_hand.add_card(second)
+                count = self.split_count = count + 1
+                continue
+
+            wagers[i] = 2 * bet if ending == DOUBLE else bet
+            i += 1
+
+        totals = tuple(hands[j].total for j in range(count))
+        stakes = tuple(wagers[:count])
+        return OpenRound(bet, net, totals, stakes, max(stakes) > bet, True, insured)
+
+    def play_split_hand(self, hand, strategy, actions=None):
+        """
+        Play a single split hand until the player stands, doubles, busts or resplits.
+
+        Args:
+            hand (Player): The split hand being played.
+            strategy (callable): Decision function, see the class docstring.
+            actions (str): Actions allowed on the first decision (default is hit,
+                stand and, if the rules allow it, double).
+
+        Returns:
+            str: DOUBLE if the hand was doubled, SPLIT if the player chose to split
+            it again (the hand is left as it is), STAND otherwise.
+        """
+        if actions is None:
+            actions = self.compiled.split_actions[hand.calculate_hand()][False]
+        if actions == STAND:
+            return STAND  # Split Aces that may not draw
+        upcard = self.dealer.hand[0]
+        while hand.calculate_hand() < 21:
+            action = strategy(hand, upcard, actions)
+            if action == HIT and HIT in actions:
+                hand.add_card(self.deck.deal_card())
+                actions = HIT + STAND
+            elif action == STAND:
+                break
+            elif action == DOUBLE and DOUBLE in actions:
+                hand.add_card(self.deck.deal_card())
+                return DOUBLE
+            elif action == SPLIT and SPLIT in actions:
+                return SPLIT
+            else:
+                raise ValueError(f"Strategy chose an unavailable action: {action!r}")
+        return STAND
+
+    def dealer_turn(self):
+        """
+        Draw cards for the dealer until they reach 17 or more (hitting soft 17 if
+        the rules say so).
+
+        Returns:
+            int: The dealer's final hand value.
+        """
+        draws = self.compiled.dealer_draws
+        dealer = self.dealer
+        while draws[dealer.hard_total][dealer.has_ace]:
+            dealer.add_card(self.deck.deal_card())
+        return dealer.calculate_hand()
+
+    @staticmethod
+    def check_winner(player_total, dealer_total):
+        """
+        Compare a finished (non-natural) player hand against the dealer.
+
+        Args:
+            player_total (int): The player's hand value.
+            dealer_total (int): The dealer's hand value.
+
+        Returns:
+            str: BUST, WIN, LOSE or PUSH.
+        """
+        if player_total > 21:
+            return BUST
+        elif dealer_total > 21 or player_total > dealer_total:
+            return WIN
+        elif player_total < dealer_total:
+            return LOSE
+        else:
+            return PUSH
+
+    def can_split(self, hand=None):
+        """
+        Check if a hand can be split (a pair, or two ten-valued cards).
+
+        Args:
+            hand (bytearray): The card codes to check (default is the player's hand).
+
+        Returns:
+            bool: True if split is possible, False otherwise.
+        """
+        if hand is None:
+            hand = self.player.hand
+        return len(hand) == 2 and CARD_VALUES[hand[0]] == CARD_VALUES[hand[1]]
+
+    def calculate_hand_value(self, hand):
+        """
+        Calculate the value of a given hand.
+
+        Player hands return their incrementally tracked total; plain card lists
+        (such as the dealer's visible cards) are totalled with the same rule.
+
+        Args:
+            hand (Player or list): The hand whose value needs to be calculated.
+
+        Returns:
+            int: The total value of the hand.
+        """
+        if isinstance(hand, Player):
+            return hand.total
+        return hand_value(hand)
+
+    def play_rounds(self, rounds, bet, strategy):
+        """
+        Play many rounds back to back with no I/O (batch mode).
+
+        Basic strategy plays about 150,000 rounds per second on one CPython core
+        here (about 120,000 through play_round); faster runs need several processes
+        (parallel.py) or the vectorized batch simulator (batch.py).
+
+        Args:
+            rounds (int): Number of rounds to play.
+            bet (float or callable): The bet placed on every round, or a bet-sizing
+                hook called as ``bet(engine)`` before each round (e.g. to read the
+                shoe's true count).
+            strategy (callable): Decision function, see the class docstring.
+
+        Returns:
+            float: The total bankroll change over all rounds.
+        """
+        total = 0.0
+        if self.recorder is not None or self.profiler is not None:
+            play_round = self.play_round
+            for _ in range(rounds):
+                total += play_round(bet(self) if callable(bet) else bet, strategy).net
+            return total
+
+        # Without a recorder or profiler, open rounds are settled straight from the
+        # compiled per-dealer-total payouts, without building a RoundResult each
+        hook = bet if callable(bet) else None
+        deal = self.deal
+        play_seat = self.play_seat
+        dealer_turn = self.dealer_turn
+        hand_nets = self.compiled.hand_nets
+        player = self.player
+        dealer = self.dealer
+        for _ in range(rounds):
+            if hook is not None:
+                bet = hook(self)
+            deal()
+            seat_round = play_seat(player, bet, strategy)
+            net = seat_round.net
+            if type(seat_round) is not RoundResult:
+                dealer_total = dealer_turn() if min(seat_round.totals) <= 21 else dealer.total
+                if dealer.is_blackjack():
+                    net -= sum(seat_round.wagers)  # Without a peek, a dealer Blackjack beats every hand
+                else:
+                    nets = hand_nets[dealer_total]
+                    for hand_total, wager in zip(seat_round.totals, seat_round.wagers):
+                        net += nets[hand_total] * wager
+            player.bankroll += net
+            total += net
+        return total
+
+
+class BankrollGuard:
+    """
+    A strategy wrapper that only offers what the player's bankroll covers.
+
+    Doubling and splitting need another bet beyond what is already on the table
+    this round, and an insurance offer the player cannot cover is declined without
+    asking, so a round can never stake more than the bankroll.
+
+    Attributes:
+        strategy (callable): The wrapped decision function.
+        player (Player): The player whose bankroll is at stake.
+        bet (float): The round's bet.
+        staked (float): Money on the table this round (bets, doubles, splits and
+            insurance); set it back to the bet to reuse the guard for a new round.
+    """
+
+    __slots__ = ("strategy", "player", "bet", "staked")
+
+    def __init__(self, strategy, player, bet):
+        self.strategy = strategy
+        self.player = player
+        self.bet = bet
+        self.staked = bet
+
+    def __call__(self, hand, upcard, actions):
+        bet = self.bet
+        free = self.player.bankroll - self.staked
+        if actions == INSURANCE_ACTIONS:
+            if free < bet / 2:
+                return DECLINE
+        elif free < bet:
+            actions = actions.replace(DOUBLE, '').replace(SPLIT, '')
+        action = self.strategy(hand, upcard, actions)
+        if action == DOUBLE or action == SPLIT:
+            self.staked += bet
+        elif action == INSURE:
+            self.staked += bet / 2
+        return action
+
+
+class _Pending(Exception):
+    """Raised by a SteppedRound replay at the first decision not answered yet."""
+
+    def __init__(self, decision):
+        super().__init__(decision.actions)
+        self.decision = decision
+
+
+class SteppedRound:
+    """
+    One round played a decision at a time, for front ends that wait for input.
+
+    The engine asks its strategy for every decision synchronously, so a GUI or a
+    network table cannot wait for the player in the middle of play_dealt_round.
+    Instead the round is replayed: the strategy answers from the decisions received
+    so far and stops the round at the first unanswered one. The shoe, the running
+    counts and the player's hand are restored to the deal before each replay, so
+    the same cards come out again; a replay costs a few microseconds.
+
+    Only actions the bankroll can cover are offered (see BankrollGuard).
+
+    Attributes:
+        engine (RoundEngine): The engine the round is played on.
+        bet (float): The round's bet.
+        decisions (list): Decisions taken so far.
+        staked (float): Money on the table at the pending decision (bets, doubles,
+            splits and insurance).
+        pending (Decision): The decision waited for, or None once the round is over.
+        result (RoundResult): The settled round, or None while it is in progress.
+    """
+
+    def __init__(self, engine, bet):
+        """
+        Deal a round and play it up to its first decision.
+
+        Args:
+            engine (RoundEngine): The engine to play on.
+            bet (float): The bet amount for this round.
+        """
+        self.engine = engine
+        self.bet = bet
+        self.decisions = []
+        engine.deal()
+        deck = engine.deck
+        self._shoe = bytes(deck.cards)
+        self._round_start = deck.round_start
+        self._counts = [count.running for count in deck.counts]
+        self._hand = bytes(engine.player.hand)
+        self._advance()
+
+    def act(self, action):
+        """
+        Answer the pending decision and play on to the next one.
+
+        Args:
+            action (str): The chosen action letter.
+
+        Raises:
+            ValueError: If the round is over or the action is not allowed.
+        """
+        if self.pending is None:
+            raise ValueError("The round is over.")
+        if not isinstance(action, str) or len(action) != 1 or action not in self.pending.actions:
+            raise ValueError(f"Invalid action {action!r}; choose one of {self.pending.actions!r}.")
+        self.decisions.append(action)
+
+        # Back to the deal, to replay the round with one more decision
+        engine = self.engine
+        deck = engine.deck
+        deck.cards[:] = self._shoe
+        deck.round_start = self._round_start
+        for count, running in zip(deck.counts, self._counts):
+            count.running = running
+        engine.player.set_hand(self._hand)
+        self._advance()
+
+    def hands(self):
+        """
+        Return the player's hands as they stand: the player, or the split hands.
+
+        Returns:
+            list: The Player objects of the hands, left to right.
+        """
+        engine = self.engine
+        split = self.result.split if self.result is not None else \
+            self.pending.hand is not engine.player
+        return engine.split_hands[:engine.split_count] if split else [engine.player]
+
+    def _advance(self):
+        """Replay the round up to its next decision, or settle it."""
+        engine = self.engine
+        answers = iter(self.decisions)
+
+        def replay(hand, upcard, actions):
+            action = next(answers, None)
+            if action is None:
+                raise _Pending(Decision(hand, upcard, actions))
+            return action
+
+        guard = BankrollGuard(replay, engine.player, self.bet)
+        try:
+            result = engine.play_dealt_round(self.bet, guard)
+        except _Pending as pending:
+            self.pending = pending.decision
+            self.staked = guard.staked
+            self.result = None
+            return
+        engine.player.bankroll += result.net
+        self.pending = None
+        self.staked = 0.0
+        self.result = result
@@ -0,0 +1,288 @@
+"""
+ev_tables.py - Basic-strategy expected values by dynamic programming, cached on disk.
+
+For every player hand (hard total, soft total or pair) against every dealer upcard,
+the expected value of standing, hitting, doubling, splitting and surrendering is
+computed exactly from the dealer's final-total distribution (dealer_odds) instead
+of by simulation. The optimal basic-strategy chart follows from the EVs.
+
+Hands are total-dependent: every draw comes from the shoe composition with the
+upcard removed, and since the dealer peeks, the dealer is known not to have
+Blackjack. The tables follow a RuleSet (default RuleSet()): S17/H17, double and
+double-after-split restrictions and late or any-time surrender are modelled, while
+tables without a dealer peek or with early surrender are not supported, and a
+split is always valued as a single split (resplits are not modelled).
+
+Tables are cached in a small binary file keyed by the rules (RuleSet.key), so
+loading them at startup costs one file read.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from array import array
+from functools import lru_cache
+
+from dealer_odds import VALUES, dealer_distribution, shoe_composition
+from deck import ACE
+from engine import STAND, HIT, DOUBLE, SPLIT, SURRENDER
+from player import best_total
+from rules import RuleSet, DOUBLE_TOTALS, SURRENDER_NONE, SURRENDER_EARLY, SURRENDER_ANY
+from strategy import StrategyTable
+
+# Identifies the default rules; the cache key of their tables
+RULES_KEY = RuleSet().key()
+
+# Expected values are stored in this action order
+ACTIONS = (STAND, HIT, DOUBLE, SPLIT, SURRENDER)
+
+# Table rows: hard totals, soft totals and pairs (by card value)
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+PAIRS = VALUES
+ROWS = ([('hard', total) for total in HARD_TOTALS] + [('soft', total) for total in SOFT_TOTALS]
+        + [('pair', value) for value in PAIRS])
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "blackjack-simulator")
+_MAGIC = b"BJEV"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+
+NAN = float("nan")
+
+
+def _row_state(kind, key):
+    """Return the (hard total, Ace flag) of a table row's two-card hand."""
+    if kind == 'hard':
+        return key, False
+    if kind == 'soft':
+        return key - 10, True
+    return (2, True) if key == ACE else (2 * key, False)
+
+
+def _rules_for(decks, rules):
+    """Return the rules to compute tables for, checking that they are supported."""
+    if rules is None:
+        rules = RuleSet(decks=decks)
+    if not rules.dealer_peek or rules.surrender == SURRENDER_EARLY:
+        raise ValueError("EV tables need a dealer peek and no early surrender.")
+    return rules
+
+
+def _upcard_evs(upcard, rules):
+    """EVs of every table row against one upcard, as {row: tuple in ACTIONS order}."""
+    composition = list(shoe_composition(rules.decks))
+    composition[VALUES.index(upcard)] -= 1
+    dealer = dealer_distribution(upcard, tuple(composition), no_blackjack=True,
+                                 hit_soft_17=rules.hit_soft_17)
+    remaining = sum(composition)
+    draws = [(value, count / remaining) for value, count in zip(VALUES, composition) if count]
+
+    # EV of standing on each total; the dealer has no Blackjack at this point
+    stand = {}
+    for total in range(4, 22):
+        stand[total] = dealer['Bust'] + sum(
+            p if final < total else -p if final > total else 0.0
+            for final, p in dealer.items() if isinstance(final, int)
+        )
+
+    def after(hard_total, has_ace, value):
+        ace = value == ACE
+        return hard_total + (1 if ace else value), has_ace or ace
+
+    @lru_cache(maxsize=None)
+    def hit_or_stand(hard_total, has_ace):
+        """Best EV of a split hand, which may only hit or stand (and stops at 21)."""
+        total = best_total(hard_total, has_ace)
+        if total > 21:
+            return -1.0
+        if total == 21:
+            return stand[21]
+        hit = sum(p * hit_or_stand(*after(hard_total, has_ace, value)) for value, p in draws)
+        return max(stand[total], hit)
+
+    surrender_after_hit = -0.5 if rules.surrender == SURRENDER_ANY else -1.0
+
+    @lru_cache(maxsize=None)
+    def after_hit(hard_total, has_ace):
+        """Best EV of the main hand after a hit: hit, stand or (if allowed) surrender."""
+        total = best_total(hard_total, has_ace)
+        if total > 21:
+            return -1.0
+        return max(stand[total], hit_ev(hard_total, has_ace), surrender_after_hit)
+
+    def hit_ev(hard_total, has_ace):
+        return sum(p * after_hit(*after(hard_total, has_ace, value)) for value, p in draws)
+
+    def double_ev(hard_total, has_ace):
+        total = 0.0
+        for value, p in draws:
+            final = best_total(*after(hard_total, has_ace, value))
+            total += p * (-1.0 if final > 21 else stand[final])
+        return 2 * total
+
+    double_totals = DOUBLE_TOTALS[rules.double_on]
+
+    def split_hand(hard_total, has_ace):
+        """Best EV of a split hand's first decision, doubling included if allowed."""
+        ev = hit_or_stand(hard_total, has_ace)
+        total = best_total(hard_total, has_ace)
+        if rules.double_after_split and total < 21 and total in double_totals:
+            ev = max(ev, double_ev(hard_total, has_ace))
+        return ev
+
+    surrender = NAN if rules.surrender == SURRENDER_NONE else -0.5
+    evs = {}
+    for kind, key in ROWS:
+        hard_total, has_ace = _row_state(kind, key)
+        total = best_total(hard_total, has_ace)
+        split = NAN
+        if kind == 'pair' and rules.max_split_hands > 1:
+            one_card = (1, True) if key == ACE else (key, False)
+            if key == ACE and not rules.hit_split_aces:
+                split = 2 * sum(p * stand[best_total(*after(*one_card, value))] for value, p in draws)
+            else:
+                split = 2 * sum(p * split_hand(*after(*one_card, value)) for value, p in draws)
+        double = double_ev(hard_total, has_ace) if total in double_totals else NAN
+        evs[kind, key] = (stand[total], hit_ev(hard_total, has_ace), double, split, surrender)
+    return evs
+
+
+def compute_ev_tables(decks=6, rules=None):
+    """
+    Compute the EV of every action for every (player hand, dealer upcard) pair.
+
+    Args:
+        decks (int): Number of decks in the shoe, when no rules are given (default is 6).
+        rules (RuleSet): The table rules (default is RuleSet(decks=decks)).
+
+    Returns:
+        dict: (row kind, row key, upcard value) -> tuple of EVs in ACTIONS order
+        (NaN for actions the rules do not allow, e.g. split on non-pair rows).
+        Row kinds are 'hard', 'soft' and 'pair'.
+
+    Raises:
+        ValueError: If the rules have no dealer peek or allow early surrender.
+    """
+    rules = _rules_for(decks, rules)
+    tables = {}
+    for upcard in VALUES:
+        for (kind, key), evs in _upcard_evs(upcard, rules).items():
+            tables[kind, key, upcard] = evs
+    return tables
+
+
+def _cache_path(rules, cache_dir):
+    """Return the cache file path for a rule set."""
+    digest = hashlib.sha1(rules.key().encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"ev-{rules.decks}d-{digest}.bin")
+
+
+def _write_cache(path, rules, tables):
+    """Write EV tables as a header followed by packed doubles."""
+    key = rules.key().encode()
+    values = array('d')
+    for kind, row_key in ROWS:
+        for upcard in VALUES:
+            values.extend(tables[kind, row_key, upcard])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(key)))
+        f.write(key)
+        values.tofile(f)
+
+
+def _read_cache(path, rules):
+    """Read EV tables written by _write_cache, or return None if missing or stale."""
+    key = rules.key().encode()
+    try:
+        with open(path, "rb") as f:
+            magic, version, key_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION or f.read(key_length) != key:
+                return None
+            values = array('d')
+            values.fromfile(f, len(ROWS) * len(VALUES) * len(ACTIONS))
+    except (OSError, EOFError, struct.error):
+        return None
+
+    tables = {}
+    position = 0
+    for kind, row_key in ROWS:
+        for upcard in VALUES:
+            tables[kind, row_key, upcard] = tuple(values[position:position + len(ACTIONS)])
+            position += len(ACTIONS)
+    return tables
+
+
+def load_ev_tables(decks=6, cache_dir=CACHE_DIR, rules=None):
+    """
+    Load the EV tables from the on-disk cache, computing and caching them if needed.
+
+    Args:
+        decks (int): Number of decks in the shoe, when no rules are given (default is 6).
+        cache_dir (str): Cache directory (default is ~/.cache/blackjack-simulator).
+        rules (RuleSet): The table rules (default is RuleSet(decks=decks)).
+
+    Returns:
+        dict: The EV tables, as returned by compute_ev_tables.
+    """
+    rules = _rules_for(decks, rules)
+    path = _cache_path(rules, cache_dir)
+    tables = _read_cache(path, rules)
+    if tables is None:
+        tables = compute_ev_tables(rules=rules)
+        try:
+            _write_cache(path, rules, tables)
+        except OSError:
+            pass  # A read-only cache only costs the recomputation next time
+    return tables
+
+
+def _letter(stand, hit, double, surrender):
+    """Chart letter of the best non-split action."""
+    best = max(stand, hit, double, surrender)
+    if double == best:
+        return 'D' if hit >= stand else 'X'
+    if surrender == best:
+        return 'R' if hit >= stand else 'T'
+    return 'H' if hit > stand else 'S'
+
+
+def optimal_chart(tables):
+    """
+    Derive the optimal basic-strategy chart from EV tables.
+
+    Args:
+        tables (dict): EV tables, as returned by compute_ev_tables.
+
+    Returns:
+        StrategyTable: The chart, in the letter format of strategy.py.
+    """
+    rows = {'hard': {}, 'soft': {}, 'pair': {}}
+    for kind, key in ROWS:
+        letters = []
+        for upcard in VALUES:
+            stand, hit, double, split, surrender = (
+                -math.inf if math.isnan(ev) else ev for ev in tables[kind, key, upcard])
+            letter = _letter(stand, hit, double, surrender)
+            if kind == 'pair' and split > max(stand, hit, double, surrender):
+                letter = 'P'
+            letters.append(letter)
+        rows[kind][key] = "".join(letters)
+    return StrategyTable(hard=rows['hard'], soft=rows['soft'], pairs=rows['pair'])
+
+
+def basic_chart(decks=6, cache_dir=CACHE_DIR, rules=None):
+    """
+    Return the optimal basic-strategy chart, loading the EV tables from the cache.
+
+    Args:
+        decks (int): Number of decks in the shoe, when no rules are given (default is 6).
+        cache_dir (str): Cache directory (default is ~/.cache/blackjack-simulator).
+        rules (RuleSet): The table rules (default is RuleSet(decks=decks)).
+
+    Returns:
+        StrategyTable: The chart.
+    """
+    return optimal_chart(load_ev_tables(decks, cache_dir, rules))
@@ -1,9 +1,114 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-import os
 
+from autoplay import AutoPlayer
+from deck import CARD_VALUES, decode_card, card_label
+from engine import (SteppedRound, WIN, LOSE, PUSH, BLACKJACK, BUST, SURRENDERED, HIT, STAND, DOUBLE,
+                    SPLIT, SURRENDER, INSURE, DECLINE, INSURANCE_ACTIONS, ACTION_NAMES)
 from game import BlackjackGame
+from sprites import SpriteCache, CARD_SIZE, display_scale
+
+# Image key of every card code, e.g. '10_spade' or 'jack_heart'
+_RANK_NAMES = {'A': "1", 'J': "jack", 'Q': "queen", 'K': "king"}
+_SUIT_NAMES = {'♠': 'spade', '♥': 'heart', '♦': 'diamond', '♣': 'club'}
+CARD_IMAGE_KEYS = tuple(
+    f"{_RANK_NAMES.get(rank, rank)}_{_SUIT_NAMES[suit]}"
+    for rank, suit in map(decode_card, range(len(CARD_VALUES)))
+)
+
+# Slot content of a face-down card
+HIDDEN = -1
+
+
+class HandView:
+    """
+    One hand on the table: persistent card slots and a total, updated in place.
+
+    A card slot is created the first time the hand holds that many cards and is
+    reused from then on. show() only reconfigures the slots whose card changed and
+    hides the slots beyond the hand, so dealing a card costs one widget update
+    instead of rebuilding every label of the hand.
+
+    Attributes:
+        frame (tk.Frame): The frame the hand is drawn in.
+        card_images (SpriteCache): The card images.
+        slots (list): The card labels, in hand order.
+        total_label (tk.Label): The label showing the hand total.
+    """
+
+    def __init__(self, frame, card_images, total_font=("Arial", 12, "bold"), total_padx=10):
+        """
+        Create the hand's widgets in a frame.
+
+        Args:
+            frame (tk.Frame): The frame to draw the hand in.
+            card_images (SpriteCache): The card images.
+            total_font (tuple): Font of the total (default is Arial 12 bold).
+            total_padx (int): Space around the total (default is 10).
+        """
+        self.frame = frame
+        self.card_images = card_images
+        self.cards_frame = tk.Frame(frame)
+        self.cards_frame.pack(side=tk.LEFT)
+        self.total_label = tk.Label(frame, text="", font=total_font)
+        self.total_label.pack(side=tk.LEFT, padx=total_padx)
+        self.slots = []
+        self._shown = []  # Card code (or HIDDEN) shown by each slot
+        self._visible = 0
+        self._total_text = ""
+        self._title = None
+
+    def show(self, cards, total_text, hidden=(), title=None):
+        """
+        Show a hand, updating only what changed since the last call.
+
+        Args:
+            cards (bytearray): The card codes of the hand.
+            total_text (str): The text of the total label.
+            hidden (tuple): Positions of the cards shown face down.
+            title (str): New title of the frame, if it is a LabelFrame.
+        """
+        slots = self.slots
+        for i, card in enumerate(cards):
+            content = HIDDEN if i in hidden else card
+            if i == len(slots):
+                slot = tk.Label(self.cards_frame, font=("Arial", 14, "bold"))
+                slot.grid(row=0, column=i, padx=2)
+                slots.append(slot)
+                self._shown.append(None)
+            elif i >= self._visible:
+                slots[i].grid()
+            if self._shown[i] != content:
+                self._draw_card(slots[i], content)
+                self._shown[i] = content
+        for slot in slots[len(cards):self._visible]:
+            slot.grid_remove()
+        self._visible = len(cards)
+
+        if total_text != self._total_text:
+            self.total_label.config(text=total_text)
+            self._total_text = total_text
+        if title is not None and title != self._title:
+            self.frame.config(text=title)
+            self._title = title
+
+    def clear(self):
+        """Hide every card and the total."""
+        self.show((), "")
+
+    def _draw_card(self, slot, card):
+        """Show a card code (or HIDDEN) in a slot, as an image or a text fallback."""
+        if card == HIDDEN:
+            image = self.card_images.get("back")
+            text = "[Hidden]"
+        else:
+            image = self.card_images.get(CARD_IMAGE_KEYS[card])
+            text = card_label(card)
+        if image:
+            slot.config(image=image, text="")
+        else:
+            slot.config(image="", text=text)
+
 
 class BlackjackGUI:
     """
@@ -12,35 +117,42 @@ class BlackjackGUI:
     Attributes:
         root (tk.Tk): The root window for the GUI.
         game (BlackjackGame): An instance of the game logic.
-        split_hands (list): List to track split hands for the player.
-        current_hand_index (int): Index of the current active hand for split hands.
-        current_bet (float): The current bet placed by the player.
-        insurance_bet (float): The insurance bet amount (if applicable).
-        has_hit_or_split (bool): Flag to track if the player has hit or split.
-        did_double (bool): Flag to track if the player doubled down.
-        card_images (dict): Preloaded card images for the GUI.
+        round (SteppedRound): The round on the table, played on the game's engine one
+            button press at a time (None before the first deal).
+        card_images (SpriteCache): Card images for the GUI, decoded on first use.
+        dealer_view (HandView): The dealer's hand on the table.
+        player_views (list): HandViews of the player's hands, reused across rounds.
+        visible_player_views (int): Number of player_views on the table.
+        autoplay_fps (int): Redraws per second during autoplay.
+        autoplay_redraw_every (int): Hands between autoplay redraws (None to show the
+            latest hand at each redraw).
+        autoplayer (AutoPlayer): The autoplay run, if one was started.
+        last_frame (Frame): The autoplay frame on the table.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, autoplay_fps=20, autoplay_redraw_every=None):
         """
         Initialize the Blackjack GUI with the root window and game instance.
         Set up the GUI layout, including frames, labels, and buttons.
+
+        Args:
+            root (tk.Tk): The root window.
+            autoplay_fps (int): Redraws per second during autoplay (default is 20).
+            autoplay_redraw_every (int): If given, autoplay shows every Nth hand
+                instead of the latest hand at each redraw.
         """
         self.root = root
         self.root.title("Blackjack")
+        self.autoplay_fps = autoplay_fps
+        self.autoplay_redraw_every = autoplay_redraw_every
+        self.autoplayer = None
+        self.last_frame = None
 
         # Create an instance of the BlackjackGame logic
         self.game = BlackjackGame()
 
-        # Attributes for handling split hands and bets
-        self.split_hands = []
-        self.current_hand_index = 0
-        self.current_bet = 0.0
-        self.insurance_bet = 0.0
-
-        # Flags for player actions
-        self.has_hit_or_split = False
-        self.did_double = False
+        # The round being played (kept once settled, to show its hands)
+        self.round = None
 
         # Preload card images for display
         self.card_images = self.load_card_images()
@@ -75,6 +187,9 @@ class BlackjackGUI:
         self.deal_button = tk.Button(self.top_frame, text="Deal", command=self.on_deal)
         self.deal_button.pack(side=tk.LEFT, padx=10)
 
+        self.autoplay_button = tk.Button(self.top_frame, text="Autoplay", command=self.on_autoplay)
+        self.autoplay_button.pack(side=tk.LEFT)
+
         # Middle frame: Dealer and Player areas
         self.middle_frame = tk.Frame(self.root)
         self.middle_frame.pack(side=tk.TOP, pady=10)
@@ -85,13 +200,12 @@ class BlackjackGUI:
         self.player_area_frame = tk.Frame(self.middle_frame)
         self.player_area_frame.pack(side=tk.TOP, padx=10, pady=10)
 
-        # Dealer’s labels for cards and total
-        self.dealer_card_labels = []
-        self.dealer_total_label = None
+        # Dealer's cards and total, redrawn in place
+        self.dealer_view = HandView(self.dealer_frame, self.card_images)
 
-        # Player frames (to support split hands)
-        self.player_hand_frames = []
-        self.player_hand_card_labels = []
+        # Player hands (several after a split); views are reused from round to round
+        self.player_views = []
+        self.visible_player_views = 0
 
         # Bottom frame: Action buttons
         self.bottom_frame = tk.Frame(self.root)
@@ -100,6 +214,14 @@ class BlackjackGUI:
         self.button_frame = tk.Frame(self.bottom_frame)
         self.button_frame.pack(side=tk.TOP)
 
+        # Basic-strategy hint for the active hand
+        self.hint_label = tk.Label(self.bottom_frame, text="", font=("Arial", 11, "italic"))
+        self.hint_label.pack(side=tk.TOP, pady=5)
+
+        # Live readout of an autoplay run
+        self.autoplay_label = tk.Label(self.bottom_frame, text="", font=("Arial", 11))
+        self.autoplay_label.pack(side=tk.TOP)
+
         # Action buttons
         self.hit_button = tk.Button(self.button_frame, text="Hit", width=10, command=self.on_hit)
         self.stand_button = tk.Button(self.button_frame, text="Stand", width=10, command=self.on_stand)
@@ -113,60 +235,32 @@ class BlackjackGUI:
 
     def load_card_images(self):
         """
-        Load all .png card images from the 'cards' folder and resize them for display.
+        Open the card sprites, pre-resized for display and cached on disk (see sprites.py).
 
         Returns:
-            dict: A dictionary mapping card keys to their respective tkinter PhotoImage objects.
+            SpriteCache: Card keys mapped to tkinter PhotoImage objects, decoded on first use.
         """
-        card_images = {}
-        folder_path = os.path.join(os.path.dirname(__file__), "cards")
-
-        for file_name in os.listdir(folder_path):
-            if file_name.endswith(".png"):
-                base_name = file_name[:-4]  # Remove '.png' extension
-                full_path = os.path.join(folder_path, file_name)
-
-                # Load and resize the image
-                pil_img = Image.open(full_path).resize((80, 120), Image.LANCZOS)
-                tk_img = ImageTk.PhotoImage(pil_img)
-
-                # Add the image to the dictionary
-                card_images[base_name] = tk_img
-
-        return card_images
+        return SpriteCache(CARD_SIZE, scale=display_scale(self.root))
 
     def get_card_image_key(self, card):
         """
         Generate the key for accessing the appropriate card image.
 
         Args:
-            card (tuple): A tuple representing the card (rank, suit), e.g., ('10', '♠').
+            card (int): A card code (see deck.encode_card).
 
         Returns:
             str: The key for the card image, e.g., '10_spade' or 'jack_heart'.
         """
-        rank, suit = card
-        if rank == 'A':
-            rank_str = "1"
-        elif rank == 'J':
-            rank_str = "jack"
-        elif rank == 'Q':
-            rank_str = "queen"
-        elif rank == 'K':
-            rank_str = "king"
-        else:
-            rank_str = str(rank)
-
-        suit_map = {'♠': 'spade', '♥': 'heart', '♦': 'diamond', '♣': 'club'}
-        suit_str = suit_map.get(suit, 'spade')  # Default to 'spade' if suit is invalid
-
-        return f"{rank_str}_{suit_str}"
+        return CARD_IMAGE_KEYS[card]
 
 
     def on_quit(self):
         """
         Handles the quit button functionality. Closes the game window.
         """
+        if self.autoplayer is not None:
+            self.autoplayer.stop()
         self.root.destroy()
 
     def check_for_cash_in_after_hand(self):
@@ -185,19 +279,13 @@ class BlackjackGUI:
     def on_deal(self):
         """
         Handles the logic for starting a new round.
-        - Clears the table and resets hands and bets.
-        - Validates the player's bet and updates the bankroll.
-        - Deals initial cards to the player and dealer.
-        - Prompts for insurance if the dealer's upcard is an Ace.
-        - Checks for an immediate Blackjack and pays out if applicable.
+        - Clears the table.
+        - Validates the player's bet.
+        - Deals a round on the game's engine and plays it up to the first decision
+          (see show_round); the engine follows the table rules for insurance,
+          early surrender, the dealer's peek and naturals.
         """
-        # Clear table and reset relevant attributes
         self.clear_table()
-        self.split_hands = []
-        self.current_hand_index = 0
-        self.insurance_bet = 0.0
-        self.has_hit_or_split = False
-        self.did_double = False
 
         # Validate bet input
         try:
@@ -213,433 +301,258 @@ class BlackjackGUI:
             messagebox.showerror("Error", "Not enough bankroll for that bet.")
             return
 
-        self.current_bet = bet
-        # Deduct the bet upfront
-        self.game.player.bankroll -= bet
-        self.update_bankroll_label()
-
-        # Reinitialize the deck and reset hands
-        self.game.deck = self.game.deck.__class__()  # New deck instance
-        self.game.player.reset_hand()
-        self.game.dealer.reset_hand()
-
-        # Deal initial cards
-        self.game.player.add_card(self.game.deck.deal_card())  # Player Card 1
-        self.game.dealer.add_card(self.game.deck.deal_card())  # Dealer Card 1 (hidden)
-        self.game.player.add_card(self.game.deck.deal_card())  # Player Card 2
-        self.game.dealer.add_card(self.game.deck.deal_card())  # Dealer Card 2 (visible)
-
-        # Display initial cards
-        self.display_dealer_cards(hide_first=True)
-        self.display_player_cards()
-
-        # Offer insurance if the dealer's visible card is an Ace
-        dealer_upcard = self.game.dealer.hand[1]
-        if dealer_upcard[0] == 'A':
-            answer = messagebox.askyesno("Insurance?", "Dealer shows an Ace. Take insurance?")
-            if answer:
-                self.handle_insurance()
-
-        self.show_action_buttons()
-
-        # Check for immediate Blackjack
-        if self.game.player.calculate_hand() == 21:
-            messagebox.showinfo("Blackjack!", "You got Blackjack! 3:2 payout.")
-            self.game.player.bankroll += 2.5 * bet  # 3:2 payout
-            self.update_bankroll_label()
-            self.hide_action_buttons()
-            self.check_for_cash_in_after_hand()
-
-    def handle_insurance(self):
-        """
-        Handles the insurance logic if the dealer's visible card is an Ace.
-        Deducts the insurance bet from the player's bankroll.
-        Resolves the insurance bet based on whether the dealer has Blackjack.
-        """
-        insurance_amount = self.current_bet / 2.0
-        if self.game.player.bankroll < insurance_amount:
-            messagebox.showwarning("Warning", "Not enough bankroll for insurance.")
-            return
-
-        # Deduct insurance bet
-        self.game.player.bankroll -= insurance_amount
-        self.insurance_bet = insurance_amount
-        self.update_bankroll_label()
-
-        # Calculate dealer's hand value
-        dealer_total = self.game.dealer.calculate_hand()
-        player_total = self.game.player.calculate_hand()
-
-        if dealer_total == 21:
-            # Dealer has Blackjack
-            self.display_dealer_cards(hide_first=False)
-            if player_total == 21:
-                # Both player and dealer have Blackjack
-                messagebox.showinfo("Dealer Blackjack", "Dealer has Blackjack, but you also have 21.\n"
-                                                        "Main bet is pushed, insurance pays 2:1 => profit!")
-                self.game.player.bankroll += self.current_bet  # Refund main bet
-            else:
-                messagebox.showinfo("Dealer Blackjack",
-                    "Dealer has Blackjack. Main bet lost, but insurance pays 2:1 => net 0.")
-            self.game.player.bankroll += self.insurance_bet * 3  # Insurance pays 2:1
-            self.update_bankroll_label()
-            self.hide_action_buttons()
-            self.check_for_cash_in_after_hand()
-        else:
-            # Dealer does not have Blackjack
-            messagebox.showinfo("Insurance", "Dealer does not have Blackjack. You lose the insurance bet.\n"
-                                             "Continue playing your main bet.")
+        # The round keeps its own bet: editing the entry mid-round changes nothing
+        self.round = SteppedRound(self.game, bet)
+        self.show_round()
 
-
-    def on_hit(self):
+    def show_round(self):
         """
-        Handles the "Hit" action for the player.
-        - Adds a card to the player's current hand.
-        - Checks for bust conditions and manages split hands if in split mode.
+        Shows the round in progress at its pending decision, or its result once it is over.
+        - The insurance offer is asked in a dialog.
+        - Other decisions show the buttons of the actions the engine allows.
+        - A settled round reveals the dealer's hand and reports the result.
         """
-        self.has_hit_or_split = True
-        if self.in_split_mode():
-            current_hand = self.split_hands[self.current_hand_index]
-            current_hand.append(self.game.deck.deal_card())
+        game_round = self.round
+        while game_round.pending is not None and game_round.pending.actions == INSURANCE_ACTIONS:
+            self.display_dealer_cards(hide_first=True)
             self.display_player_cards()
-            if self.game.calculate_hand_value(current_hand) > 21:
-                messagebox.showinfo("Bust", f"Hand {self.current_hand_index + 1} busts!")
-                self.on_stand()  # Move to the next hand
-        else:
-            self.game.player.add_card(self.game.deck.deal_card())
-            self.display_player_cards()
-            if self.game.player.calculate_hand() > 21:
-                messagebox.showinfo("Bust", "You busted!")
-                self.hide_action_buttons()
-                self.check_for_cash_in_after_hand()  # End of round, check bankroll
-
-    def on_stand(self):
-        """
-        Handles the "Stand" action for the player.
-        - Ends the player's turn for the current hand.
-        - If in split mode, moves to the next hand or finishes the round.
-        - Otherwise, starts the dealer's turn.
-        """
-        self.has_hit_or_split = True
-        if self.in_split_mode():
-            if self.current_hand_index < len(self.split_hands) - 1:
-                self.current_hand_index += 1  # Move to the next split hand
-                self.display_player_cards()
-            else:
-                self.finish_split_round()  # Resolve split hands
-        else:
-            self.dealer_play()  # Dealer's turn
-
-    def on_double(self):
-        """
-        Handles the "Double Down" action for the player.
-        - Doubles the player's bet and deducts it from the bankroll.
-        - Adds one additional card to the player's hand and ends their turn.
-        """
-        if self.has_hit_or_split:
-            messagebox.showinfo("Double", "You can only double with your first two cards.")
-            return
-
-        try:
-            bet = float(self.bet_entry.get())
-        except ValueError:
-            bet = self.game.min_bet
-
-        if self.game.player.bankroll < bet:
-            messagebox.showwarning("Warning", "Not enough bankroll to double.")
-            return
+            answer = messagebox.askyesno("Insurance?", "Dealer shows an Ace. Take insurance?")
+            game_round.act(INSURE if answer else DECLINE)
 
-        # Deduct the additional bet for doubling
-        self.game.player.bankroll -= bet
+        in_progress = game_round.pending is not None
+        self.display_dealer_cards(hide_first=in_progress)
         self.update_bankroll_label()
-        self.did_double = True
-        self.has_hit_or_split = True
-
-        if self.in_split_mode():
-            current_hand = self.split_hands[self.current_hand_index]
-            current_hand.append(self.game.deck.deal_card())
-            self.display_player_cards()
-            if self.game.calculate_hand_value(current_hand) > 21:
-                messagebox.showinfo("Bust", f"Hand {self.current_hand_index + 1} busts!")
-            self.on_stand()  # Auto-stand after doubling
-        else:
-            self.game.player.add_card(self.game.deck.deal_card())
+        if in_progress:
+            self.show_action_buttons()
             self.display_player_cards()
-            if self.game.player.calculate_hand() > 21:
-                messagebox.showinfo("Bust", "You busted!")
-                self.hide_action_buttons()
-                self.check_for_cash_in_after_hand()
-            else:
-                self.dealer_play()  # Auto-stand after doubling
+            return
 
-    def on_surrender(self):
-        """
-        Handles the "Surrender" action for the player.
-        - Refunds half the player's bet.
-        - Ends the round immediately.
-        """
-        self.has_hit_or_split = True
-        refund = self.current_bet / 2.0
-        self.game.player.bankroll += refund
-        messagebox.showinfo("Surrender", f"You surrendered, got €{refund:.2f} back.")
         self.hide_action_buttons()
-        self.update_bankroll_label()
+        self.display_player_cards()
+        messagebox.showinfo("Result", self.result_message(game_round.result))
         self.check_for_cash_in_after_hand()
 
-    def on_split(self):
-        """
-        Handles the "Split" action for the player.
-        - Splits the player's hand into two separate hands.
-        - Deducts an additional bet for the second hand.
+    def play_action(self, action):
         """
-        self.has_hit_or_split = True
-        if not self.game.can_split():
-            messagebox.showwarning("Warning", "Cannot split these cards.")
-            return
-
-        try:
-            bet = float(self.bet_entry.get())
-        except ValueError:
-            bet = self.game.min_bet
+        Plays the player's decision on the round in progress and shows what follows.
 
-        if self.game.player.bankroll < bet:
-            messagebox.showwarning("Warning", "Not enough bankroll to split.")
+        Args:
+            action (str): The action letter (see engine.HIT and friends).
+        """
+        if self.round is None or self.round.pending is None or action not in self.round.pending.actions:
             return
+        self.round.act(action)
+        self.show_round()
 
-        # Deduct the bet for the split
-        self.game.player.bankroll -= bet
-        self.update_bankroll_label()
+    def on_hit(self):
+        """Handles the "Hit" button: one more card to the active hand."""
+        self.play_action(HIT)
 
-        # Split the hand into two separate hands
-        card1, card2 = self.game.player.hand[0], self.game.player.hand[1]
-        hand1 = [card1]
-        hand2 = [card2]
-        self.split_hands = [hand1, hand2]
-        self.current_hand_index = 0
+    def on_stand(self):
+        """Handles the "Stand" button: ends the active hand."""
+        self.play_action(STAND)
 
-        messagebox.showinfo("Split", "You split your hand into two!")
-        self.game.player.hand = []
-        self.display_player_cards()
+    def on_double(self):
+        """Handles the "Double" button: doubles the bet and takes exactly one more card."""
+        self.play_action(DOUBLE)
 
+    def on_surrender(self):
+        """Handles the "Surrender" button: gives up the hand for half the bet."""
+        self.play_action(SURRENDER)
 
-    def dealer_play(self):
-        """
-        Handles the dealer's turn in a single-hand scenario.
-        - Dealer draws cards until their total is at least 17.
-        - Resolves the round by checking the winner.
-        """
-        self.hide_action_buttons()
-        while self.game.dealer.calculate_hand() < 17:
-            self.game.dealer.add_card(self.game.deck.deal_card())
-        self.display_dealer_cards(hide_first=False)
-        self.check_winner(doubled=self.did_double)
+    def on_split(self):
+        """Handles the "Split" button: splits the pair into two hands at the same bet."""
+        self.play_action(SPLIT)
 
-    def finish_split_round(self):
+    def result_message(self, result):
         """
-        Handles the resolution of split hands.
-        - Dealer completes their turn.
-        - Each hand is individually resolved and winnings/losses are updated.
-        """
-        self.hide_action_buttons()
-        while self.game.dealer.calculate_hand() < 17:
-            self.game.dealer.add_card(self.game.deck.deal_card())
-        self.display_dealer_cards(hide_first=False)
-
-        dealer_total = self.game.dealer.calculate_hand()
-        for i, hand in enumerate(self.split_hands):
-            player_total = self.game.calculate_hand_value(hand)
-            if player_total > 21:
-                outcome = "Bust"
-            elif dealer_total > 21 or player_total > dealer_total:
-                outcome = "Win"
-                self.game.player.bankroll += 2 * self.current_bet
-            elif player_total < dealer_total:
-                outcome = "Lose"
-            else:
-                outcome = "Tie"
-                self.game.player.bankroll += self.current_bet
+        Describes a settled round for the result dialog.
 
-            messagebox.showinfo(f"Hand {i + 1} Result",
-                f"Hand {i + 1} -> {outcome}.\nYour total: {player_total}, Dealer: {dealer_total}")
-
-        self.update_bankroll_label()
-        self.check_for_cash_in_after_hand()
-
-    def check_winner(self, doubled=False):
-        """
-        Resolves the outcome of a single-hand round.
-        - Compares player and dealer totals to determine the winner.
-        - Updates bankroll based on results.
-        """
-        effective_bet = self.current_bet * 2 if doubled else self.current_bet
-        player_total = self.game.player.calculate_hand()
-        dealer_total = self.game.dealer.calculate_hand()
+        Args:
+            result (RoundResult): The round, as settled by the engine.
 
-        if player_total > 21:
-            messagebox.showinfo("Result", "Player busts! Dealer wins.")
-        elif dealer_total > 21 or player_total > dealer_total:
-            self.game.player.bankroll += 2 * effective_bet
-            messagebox.showinfo("Result", "You win!")
-        elif dealer_total > player_total:
-            messagebox.showinfo("Result", "Dealer wins!")
+        Returns:
+            str: The message.
+        """
+        dealer_blackjack = self.game.dealer.is_blackjack()
+        lines = []
+        if result.insured:
+            lines.append("Dealer has Blackjack. Insurance pays 2:1." if dealer_blackjack
+                         else "Dealer does not have Blackjack. You lose the insurance bet.")
+
+        if len(result.outcomes) == 1:
+            messages = {
+                BUST: "Player busts! Dealer wins.",
+                WIN: "You win!",
+                LOSE: "Dealer has Blackjack. You lose." if dealer_blackjack else "Dealer wins!",
+                PUSH: "Push (tie).",
+                BLACKJACK: f"You got Blackjack! {self.game.rules.payout_odds()} payout.",
+                SURRENDERED: "You surrendered and got half your bet back.",
+            }
+            lines.append(messages[result.outcomes[0]])
         else:
-            self.game.player.bankroll += effective_bet
-            messagebox.showinfo("Result", "Push (tie).")
-
-        self.update_bankroll_label()
-        self.check_for_cash_in_after_hand()
+            for i, (outcome, total) in enumerate(zip(result.outcomes, result.player_totals)):
+                lines.append(f"Hand {i + 1} -> {outcome}. Your total: {total}, Dealer: {result.dealer_total}")
 
+        sign = "+" if result.net >= 0 else "-"
+        lines.append(f"Net: {sign}€{abs(result.net):.2f}")
+        return "\n".join(lines)
 
     def display_dealer_cards(self, hide_first=True):
         """
-        Displays the dealer's cards on the GUI.
-        If `hide_first` is True, the first card is displayed as hidden (face down).
+        Displays the dealer's cards on the GUI, updating only the cards that changed.
+        If `hide_first` is True, the hole card is displayed as hidden (face down).
+        The hole card is the dealer's second card; the first one is the upcard.
 
         Args:
-            hide_first (bool): Whether to hide the dealer's first card.
-        """
-        # Clear previous dealer card labels
-        for lbl in self.dealer_card_labels:
-            lbl.destroy()
-        self.dealer_card_labels.clear()
-
-        # Remove the previous dealer total label if it exists
-        if self.dealer_total_label:
-            self.dealer_total_label.destroy()
-            self.dealer_total_label = None
-
-        visible_cards = []  # To calculate visible card totals
-        for i, card in enumerate(self.game.dealer.hand):
-            if i == 0 and hide_first:
-                # Display hidden card or a fallback message
-                back_img = self.card_images.get("back")
-                if back_img:
-                    lbl = tk.Label(self.dealer_frame, image=back_img)
-                    lbl.image = back_img
-                else:
-                    lbl = tk.Label(self.dealer_frame, text="[Hidden]", font=("Arial", 14, "bold"))
-            else:
-                # Display the visible card with its image or a text fallback
-                key = self.get_card_image_key(card)
-                img = self.card_images.get(key)
-                if img:
-                    lbl = tk.Label(self.dealer_frame, image=img)
-                    lbl.image = img
-                else:
-                    lbl = tk.Label(self.dealer_frame, text=f"{card[0]}{card[1]}", font=("Arial", 14, "bold"))
-                visible_cards.append(card)
-
-            lbl.pack(side=tk.LEFT, padx=2)
-            self.dealer_card_labels.append(lbl)
-
-        # Calculate and display the dealer's total
-        if hide_first:
-            if visible_cards:
-                partial_total = self.game.calculate_hand_value(visible_cards)
-                total_str = f"Total: {partial_total}"
-            else:
-                total_str = "Total: ???"
+            hide_first (bool): Whether to hide the dealer's hole card.
+        """
+        dealer = self.game.dealer
+        if not hide_first:
+            total_str = f"Total: {dealer.calculate_hand()}"
+        elif dealer.hand:
+            # Only the upcard counts while the hole card is hidden
+            total_str = f"Total: {self.game.calculate_hand_value(dealer.hand[:1])}"
         else:
-            dealer_total = self.game.dealer.calculate_hand()
-            total_str = f"Total: {dealer_total}"
-
-        self.dealer_total_label = tk.Label(self.dealer_frame, text=total_str, font=("Arial", 12, "bold"))
-        self.dealer_total_label.pack(side=tk.LEFT, padx=10)
+            total_str = "Total: ???"
+        self.dealer_view.show(dealer.hand, total_str, hidden=(1,) if hide_first else ())
 
     def display_player_cards(self):
         """
-        Displays the player's cards on the GUI, supporting single and split hands.
-        - In split mode, displays each hand separately, marking the active hand.
-        - In single-hand mode, displays the player's current hand.
+        Displays the player's hands on the GUI, supporting single and split hands.
+        Hand frames and card slots are reused; only the cards that changed are redrawn.
+        - While deciding after a split, marks the active hand.
+        - Once the round is settled, shows each hand's outcome.
 
         Supports card images or text-based fallbacks for missing card images.
         """
-        # Clear previous player hand displays
-        for frame in self.player_hand_frames:
-            frame.destroy()
-        self.player_hand_frames.clear()
-        self.player_hand_card_labels.clear()
-
-        if self.in_split_mode():
-            # Handle split hands
-            for idx, hand in enumerate(self.split_hands):
-                # Frame title indicates active hand
-                frame_text = f"Player Hand {idx + 1}"
-                if idx == self.current_hand_index:
-                    frame_text += " (Active)"
-
-                hand_frame = tk.LabelFrame(self.player_area_frame, text=frame_text, padx=10, pady=10)
-                hand_frame.pack(side=tk.LEFT, padx=10)
-
-                labels_for_this_hand = []
-                for card in hand:
-                    key = self.get_card_image_key(card)
-                    img = self.card_images.get(key)
-                    if img:
-                        lbl = tk.Label(hand_frame, image=img)
-                        lbl.image = img
-                    else:
-                        lbl = tk.Label(hand_frame, text=f"{card[0]}{card[1]}", font=("Arial", 14, "bold"))
-                    lbl.pack(side=tk.LEFT, padx=2)
-                    labels_for_this_hand.append(lbl)
-
-                # Display hand total
-                hand_total = self.game.calculate_hand_value(hand)
-                tk.Label(hand_frame, text=f"Total: {hand_total}", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
-
-                self.player_hand_frames.append(hand_frame)
-                self.player_hand_card_labels.append(labels_for_this_hand)
+        game_round = self.round
+        hands = game_round.hands() if game_round is not None else [self.game.player]
+        if game_round is not None and game_round.result is not None:
+            outcomes = game_round.result.outcomes
+            if len(hands) == 1:
+                titles = [f"Player ({outcomes[0]})"]
+            else:
+                titles = [f"Player Hand {idx + 1} ({outcome})" for idx, outcome in enumerate(outcomes)]
+        elif len(hands) == 1:
+            titles = ["Player"]
         else:
-            # Handle single hand
-            player_frame = tk.LabelFrame(self.player_area_frame, text="Player", padx=10, pady=10)
-            player_frame.pack(side=tk.LEFT, padx=10)
+            active = game_round.pending.hand
+            titles = [f"Player Hand {idx + 1}" + (" (Active)" if hand is active else "")
+                      for idx, hand in enumerate(hands)]
+
+        self.show_player_hands([(title, hand.hand, hand.total) for title, hand in zip(titles, hands)])
 
-            labels_for_this_hand = []
-            for card in self.game.player.hand:
-                key = self.get_card_image_key(card)
-                img = self.card_images.get(key)
-                if img:
-                    lbl = tk.Label(player_frame, image=img)
-                    lbl.image = img
-                else:
-                    lbl = tk.Label(player_frame, text=f"{card[0]}{card[1]}", font=("Arial", 14, "bold"))
-                lbl.pack(side=tk.LEFT, padx=2)
-                labels_for_this_hand.append(lbl)
+        self.update_hint()
 
-            # Display player total
-            player_total = self.game.player.calculate_hand()
-            tk.Label(player_frame, text=f"Total: {player_total}", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+    def show_player_hands(self, hands):
+        """
+        Shows the player's hands, reusing hand frames and redrawing only what changed.
 
-            self.player_hand_frames.append(player_frame)
-            self.player_hand_card_labels.append(labels_for_this_hand)
+        Args:
+            hands (list): (frame title, card codes, total) of each hand, left to right.
+        """
+        views = self.player_views
+        for idx, (title, cards, total) in enumerate(hands):
+            if idx == len(views):
+                hand_frame = tk.LabelFrame(self.player_area_frame, padx=10, pady=10)
+                hand_frame.grid(row=0, column=idx, padx=10)
+                views.append(HandView(hand_frame, self.card_images, ("Arial", 10, "bold"), total_padx=5))
+            elif idx >= self.visible_player_views:
+                views[idx].frame.grid()
+            views[idx].show(cards, f"Total: {total}", title=title)
+        for view in views[len(hands):self.visible_player_views]:
+            view.frame.grid_remove()
+        self.visible_player_views = len(hands)
+
+    def on_autoplay(self):
+        """
+        Starts or stops autoplay: the advisor's strategy plays hands at the entered bet
+        in a background thread, and the table, bankroll and EV are redrawn at
+        autoplay_fps (see autoplay.py).
+        """
+        if self.autoplayer is not None and self.autoplayer.running:
+            self.autoplayer.stop()
+            return
+        if self.round is not None and self.round.pending is not None:
+            messagebox.showinfo("Autoplay", "Finish the current hand first.")
+            return
 
-    def in_split_mode(self):
+        try:
+            bet = float(self.bet_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid bet. Please enter a valid number.")
+            return
+        if bet < self.game.min_bet:
+            messagebox.showerror("Error", f"Bet must be at least €{self.game.min_bet:.2f}.")
+            return
+        if bet > self.game.player.bankroll:
+            messagebox.showerror("Error", "Not enough bankroll for that bet.")
+            return
+
+        # Autoplay starts between rounds, with the whole bankroll in hand
+        self.clear_table()
+        self.hide_action_buttons()
+        self.round = None
+        self.deal_button.config(state=tk.DISABLED)
+        self.autoplay_button.config(text="Stop")
+
+        self.autoplayer = AutoPlayer(self.game, self.game.advisor, bet, self.autoplay_redraw_every)
+        self.last_frame = None
+        self.autoplayer.start()
+        self.root.after(0, self.autoplay_tick)
+
+    def autoplay_tick(self):
+        """
+        Redraws the latest autoplay frame, if it changed, and schedules the next redraw.
+        Once the run has stopped, shows its last hand and restores the controls.
+        """
+        autoplayer = self.autoplayer
+        running = autoplayer.running
+        frame = autoplayer.frame
+        if frame is not None and frame is not self.last_frame:
+            self.last_frame = frame
+            self.show_autoplay_frame(frame)
+
+        if running:
+            if self.autoplay_redraw_every is None:
+                autoplayer.request_frame()
+            self.root.after(max(1, round(1000 / self.autoplay_fps)), self.autoplay_tick)
+        else:
+            self.deal_button.config(state=tk.NORMAL)
+            self.autoplay_button.config(text="Autoplay")
+            self.check_for_cash_in_after_hand()
+
+    def show_autoplay_frame(self, frame):
         """
-        Checks whether the player is currently in split mode (has split hands).
+        Shows an autoplay frame: the hands of its round, the bankroll and the running EV.
 
-        Returns:
-            bool: True if the player has split hands, False otherwise.
+        Args:
+            frame (Frame): The frame to show.
         """
-        return len(self.split_hands) > 0
+        result = frame.result
+        self.dealer_view.show(frame.dealer_hand, f"Total: {result.dealer_total}")
+        if len(frame.player_hands) == 1:
+            titles = [f"Player ({result.outcomes[0]})"]
+        else:
+            titles = [f"Player Hand {idx + 1} ({outcome})" for idx, outcome in enumerate(result.outcomes)]
+        self.show_player_hands(list(zip(titles, frame.player_hands, result.player_totals)))
+
+        # The frame's own bankroll: the live one may already be rounds ahead
+        self.update_bankroll_label(frame.bankroll)
+        self.autoplay_label.config(
+            text=f"Hands: {frame.rounds:,}   EV: {frame.ev:+.2%} ± {frame.ev_std_error:.2%}"
+                 f"   ({frame.rounds_per_minute:,.0f} hands/min)")
 
     def clear_table(self):
         """
-        Clears the table by removing all displayed cards and totals for both the dealer and the player.
-        Resets the labels and frames for a fresh start in a new round.
+        Clears the table by hiding all displayed cards and totals for both the dealer and the player.
+        The labels and frames are kept, to be reused in the next round.
         """
-        # Clear dealer's cards and total
-        for lbl in self.dealer_card_labels:
-            lbl.destroy()
-        self.dealer_card_labels.clear()
-        if self.dealer_total_label:
-            self.dealer_total_label.destroy()
-            self.dealer_total_label = None
-
-        # Clear player's cards and hands
-        for frame in self.player_hand_frames:
-            frame.destroy()
-        self.player_hand_frames.clear()
-        self.player_hand_card_labels.clear()
+        self.dealer_view.clear()
+        for view in self.player_views[:self.visible_player_views]:
+            view.frame.grid_remove()
+        self.visible_player_views = 0
 
     def hide_action_buttons(self):
         """
@@ -651,13 +564,13 @@ class BlackjackGUI:
         self.double_button.pack_forget()
         self.surrender_button.pack_forget()
         self.split_button.pack_forget()
+        self.hint_label.config(text="")
 
     def show_action_buttons(self):
         """
-        Displays the appropriate action buttons based on the current game state.
-        - Hit and Stand are always available.
-        - Double and Split are only shown if applicable (first turn, specific conditions).
-        - Surrender is always available.
+        Displays the buttons of the actions the engine allows at the pending decision:
+        the table rules (doubles, double after split, resplits, surrender) and the
+        bankroll decide which are offered.
         """
 
         # Helper function for hover effects
@@ -694,26 +607,44 @@ class BlackjackGUI:
         add_hover_effect(self.surrender_button)
         add_hover_effect(self.split_button)
 
-        # Display buttons with proper spacing
-        self.hit_button.pack(side=tk.LEFT, padx=10)
-        self.stand_button.pack(side=tk.LEFT, padx=10)
-
-        # Show Double button if applicable
-        if (not self.in_split_mode()) and len(self.game.player.hand) == 2 and (not self.has_hit_or_split):
-            self.double_button.pack(side=tk.LEFT, padx=10)
+        # The engine decides which actions are open on the active hand
+        self.hide_action_buttons()
+        actions = self.round.pending.actions
+        for action, button in ((HIT, self.hit_button), (STAND, self.stand_button),
+                               (DOUBLE, self.double_button), (SURRENDER, self.surrender_button),
+                               (SPLIT, self.split_button)):
+            if action in actions:
+                button.pack(side=tk.LEFT, padx=10)
 
-        # Show Surrender button
-        self.surrender_button.pack(side=tk.LEFT, padx=10)
+        self.update_hint()
 
-        # Show Split button if applicable
-        if (not self.in_split_mode()) and self.game.can_split() and (not self.has_hit_or_split):
-            self.split_button.pack(side=tk.LEFT, padx=10)
+    def update_hint(self):
+        """
+        Shows the basic-strategy action for the pending decision while the player is deciding.
+        Only the actions the round offers are suggested.
+        """
+        game_round = self.round
+        if game_round is None or game_round.pending is None or \
+                game_round.pending.actions == INSURANCE_ACTIONS:
+            self.hint_label.config(text="")
+            return
+        hand, upcard, actions = game_round.pending
+        action = self.game.advisor(hand, upcard, actions)
+        self.hint_label.config(text=f"Basic strategy: {ACTION_NAMES[action]}")
 
-    def update_bankroll_label(self):
+    def update_bankroll_label(self, bankroll=None):
         """
         Updates the bankroll label in the GUI to reflect the player's current bankroll.
-        """
-        self.bankroll_label.config(text=f"Bankroll: €{self.game.player.bankroll:.2f}")
+
+        Args:
+            bankroll (float): The bankroll to show (default is the player's current one,
+                less the money on the table in the round in progress).
+        """
+        if bankroll is None:
+            bankroll = self.game.player.bankroll
+            if self.round is not None and self.round.pending is not None:
+                bankroll -= self.round.staked  # The money on the table this round
+        self.bankroll_label.config(text=f"Bankroll: €{bankroll:.2f}")
 
 
 def main():
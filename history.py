@@ -0,0 +1,143 @@
+"""
+history.py - Compact binary hand-history log with a memory-mapped reader.
+
+Every round played by a RoundEngine with a recorder attached is stored as one
+fixed-width 44-byte record (see RECORD_DTYPE). The writer packs records into a
+preallocated buffer and writes it out in bulk; the reader memory-maps the file so
+each column is a NumPy view of the file, and even very large logs are analysed
+without being loaded into RAM.
+"""
+
+import struct
+
+import numpy as np
+
+_MAGIC = b"BJHH"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHH8x")  # magic, version, record size, padding to 16 bytes
+
+# Padding byte for unused card slots (card code 0 is the 2 of spades)
+NO_CARD = 0xFF
+MAX_DEALER_CARDS = 11
+MAX_ACTIONS = 12
+
+# Flag bits
+DOUBLED = 1
+SPLIT = 2
+INSURED = 4
+
+RECORD_DTYPE = np.dtype([
+    ("bet", "<f8"),  # Money as float64, like the engine's bets and nets
+    ("net", "<f8"),
+    ("running_count", "<i2"),
+    ("flags", "u1"),
+    ("player_cards", "u1", (2,)),
+    ("dealer_cards", "u1", (MAX_DEALER_CARDS,)),
+    ("actions", f"S{MAX_ACTIONS}"),
+])
+_FIXED = struct.Struct("<ddhB")
+_PLAYER_OFFSET = RECORD_DTYPE.fields["player_cards"][1]
+_DEALER_OFFSET = RECORD_DTYPE.fields["dealer_cards"][1]
+_ACTIONS_OFFSET = RECORD_DTYPE.fields["actions"][1]
+
+
+class HandHistoryWriter:
+    """
+    Records rounds into a binary hand-history file.
+
+    Attach it to an engine with ``engine.recorder = HandHistoryWriter(path)``.
+    Actions beyond MAX_ACTIONS and dealer cards beyond MAX_DEALER_CARDS are dropped.
+
+    Attributes:
+        path (str): The file being written.
+        records (int): Number of rounds recorded so far.
+    """
+
+    def __init__(self, path, buffer_records=65536):
+        """
+        Create (or overwrite) a hand-history file.
+
+        Args:
+            path (str): The file to write.
+            buffer_records (int): Records buffered between bulk writes (default is 65536).
+        """
+        self.path = path
+        self.records = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, RECORD_DTYPE.itemsize))
+        self._buffer = bytearray(RECORD_DTYPE.itemsize * buffer_records)
+        self._empty = bytes([NO_CARD]) * MAX_DEALER_CARDS + bytes(MAX_ACTIONS)
+        self._offset = 0
+
+    def record(self, engine, result, actions, running_count):
+        """
+        Append one settled round.
+
+        Args:
+            engine (RoundEngine): The engine that played the round.
+            result (RoundResult): The settled round.
+            actions (bytearray): The action letters taken, in order.
+            running_count (int): The shoe's running count before the deal.
+        """
+        buffer = self._buffer
+        offset = self._offset
+        flags = (DOUBLED if result.doubled else 0) | (SPLIT if result.split else 0) \
+            | (INSURED if result.insured else 0)
+        _FIXED.pack_into(buffer, offset, result.bet, result.net, running_count, flags)
+        buffer[offset + _PLAYER_OFFSET:offset + _PLAYER_OFFSET + 2] = engine.player.hand[:2]
+
+        # Reset the variable-length slots, then fill them
+        start = offset + _DEALER_OFFSET
+        buffer[start:start + len(self._empty)] = self._empty
+        dealer = engine.dealer.hand[:MAX_DEALER_CARDS]
+        buffer[start:start + len(dealer)] = dealer
+        start = offset + _ACTIONS_OFFSET
+        actions = actions[:MAX_ACTIONS]
+        buffer[start:start + len(actions)] = actions
+
+        self.records += 1
+        self._offset = offset + RECORD_DTYPE.itemsize
+        if self._offset == len(buffer):
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        if self._offset:
+            self._file.write(memoryview(self._buffer)[:self._offset])
+            self._offset = 0
+        self._file.flush()
+
+    def close(self):
+        """Flush the remaining records and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_history(path):
+    """
+    Memory-map a hand-history file.
+
+    Columns of the returned array (e.g. ``history["net"]``) are views of the file,
+    so nothing is copied into memory until it is used.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        numpy.memmap: The records, with dtype RECORD_DTYPE (a plain empty array if there are none).
+    """
+    with open(path, "rb") as f:
+        magic, version, record_size = _HEADER.unpack(f.read(_HEADER.size))
+        empty = not f.read(1)
+    if magic != _MAGIC or version != _VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a version {_VERSION} hand-history file.")
+    if empty:
+        return np.zeros(0, dtype=RECORD_DTYPE)  # An empty region cannot be memory-mapped
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER.size)
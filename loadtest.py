@@ -0,0 +1,168 @@
+"""
+loadtest.py - Load-generating client for the Blackjack server.
+
+Thousands of simulated players connect to a server.py instance at once, each
+playing its rounds with a strategy (basic strategy by default). The report gives
+the rounds played per second across all players and the latency of every request
+(bets and actions), from sending it to reading the reply.
+
+Usage:
+    python loadtest.py --players 1000 --rounds 50 --port 8765
+    python loadtest.py --players 2000 --spawn   # start a server on a Unix socket
+
+Many players need as many open sockets; raise the open-file limit (``ulimit -n``)
+on both sides beyond a thousand or so.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from player import Player
+from strategy import basic_strategy
+
+
+async def _request(reader, writer, message, latencies):
+    """Send one request and return its decoded reply, recording the latency."""
+    start = time.perf_counter()
+    writer.write((json.dumps(message, separators=(",", ":")) + "\n").encode())
+    line = await reader.readline()
+    latencies.append(time.perf_counter() - start)
+    if not line:
+        raise ConnectionError("The server closed the connection.")
+    return json.loads(line)
+
+
+async def play(connect, rounds, bet, strategy, latencies):
+    """
+    Connect one simulated player and play its rounds.
+
+    Args:
+        connect (callable): Coroutine function opening a (reader, writer) connection.
+        rounds (int): Rounds to play.
+        bet (float): The bet placed on every round.
+        strategy (callable): Decision function, see engine.RoundEngine.
+        latencies (list): Request latencies in seconds are appended here.
+
+    Returns:
+        int: Rounds played (fewer than asked if the player ran out of money).
+    """
+    reader, writer = await connect()
+    hand = Player("Player")
+    played = 0
+    try:
+        await reader.readline()  # Welcome
+        for _ in range(rounds):
+            reply = await _request(reader, writer, {"op": "bet", "amount": bet}, latencies)
+            while reply["type"] == "decision":
+                hand.reset_hand()
+                for card in reply["hand"]:
+                    hand.add_card(card)
+                action = strategy(hand, reply["upcard"], reply["actions"])
+                reply = await _request(reader, writer, {"op": "action", "action": action}, latencies)
+            if reply["type"] == "error":
+                break
+            played += 1
+        writer.write(b'{"op":"quit"}\n')
+    finally:
+        writer.close()
+    return played
+
+
+async def run(connect, players, rounds, bet=10.0, strategy=basic_strategy, ramp=0.0):
+    """
+    Run simulated players concurrently and measure the server.
+
+    Args:
+        connect (callable): Coroutine function opening a (reader, writer) connection.
+        players (int): Number of concurrent players.
+        rounds (int): Rounds per player.
+        bet (float): The bet placed on every round (default is 10).
+        strategy (callable): Decision function (default is basic strategy).
+        ramp (float): Seconds over which the players' connections are spread.
+
+    Returns:
+        dict: players, rounds, requests, seconds, rounds_per_sec, requests_per_sec
+        and the p50, p99 and max request latency in milliseconds.
+    """
+    latencies = []
+
+    async def player(i):
+        if ramp:
+            await asyncio.sleep(ramp * i / players)
+        return await play(connect, rounds, bet, strategy, latencies)
+
+    start = time.perf_counter()
+    played = await asyncio.gather(*(player(i) for i in range(players)))
+    seconds = time.perf_counter() - start
+    total = sum(played)
+    p50, p99, worst = np.percentile(latencies, (50, 99, 100)) * 1e3 if latencies else (0.0, 0.0, 0.0)
+    return {
+        "players": players,
+        "rounds": total,
+        "requests": len(latencies),
+        "seconds": seconds,
+        "rounds_per_sec": total / seconds,
+        "requests_per_sec": len(latencies) / seconds,
+        "p50_ms": float(p50),
+        "p99_ms": float(p99),
+        "max_ms": float(worst),
+    }
+
+
+def _spawn_server(path, args):
+    """Start server.py on a Unix socket and wait until it accepts connections."""
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "server.py"), "--unix", path] + args)
+    for _ in range(200):
+        if os.path.exists(path):
+            return server
+        time.sleep(0.05)
+    server.terminate()
+    raise RuntimeError("The server did not start.")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the Blackjack server.")
+    parser.add_argument("--players", type=int, default=1000, help="concurrent players (default 1000)")
+    parser.add_argument("--rounds", type=int, default=50, help="rounds per player (default 50)")
+    parser.add_argument("--bet", type=float, default=10.0, help="bet per round (default 10)")
+    parser.add_argument("--ramp", type=float, default=0.0,
+                        help="seconds over which connections are spread (default 0)")
+    parser.add_argument("--host", default="127.0.0.1", help="server address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="server TCP port (default 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--spawn", action="store_true",
+                        help="start a server on a temporary Unix socket for the run")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        args.unix = os.path.join(tempfile.mkdtemp(), "blackjack.sock")
+        server = _spawn_server(args.unix, ["--bankroll", str(1e12)])
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        connect = lambda: asyncio.open_connection(args.host, args.port)
+
+    try:
+        report = asyncio.run(run(connect, args.players, args.rounds, args.bet, ramp=args.ramp))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(json.dumps(report, indent=2))
+    print(f"{report['rounds_per_sec']:,.0f} rounds/s  p50 {report['p50_ms']:.2f} ms  "
+          f"p99 {report['p99_ms']:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+parallel.py - Multi-process simulation runner with deterministic seeding.
+
+The rounds to simulate are cut into fixed-size blocks. Block ``i`` always gets
+the ``i``-th child of the master seed's SeedSequence, whichever process runs it,
+and the block results are merged in block order. The merged result for a given
+seed is therefore identical for any number of workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+import batch
+from deck import Shoe
+from engine import RoundEngine
+from rng import NumpyRNG
+from rules import RuleSet
+from stats import SimulationStats
+from strategy import StrategyTable, table_strategy
+
+
+def _batch_block(task, table, decks):
+    """Simulate one block with the vectorized batch simulator."""
+    rounds, seed_sequence = task
+    return batch.simulate(rounds, table, decks=decks, seed=seed_sequence)
+
+
+def _engine_block(task, strategy, rules):
+    """Simulate one block with the scalar round engine and its own shoe and RNG."""
+    rounds, seed_sequence = task
+    if isinstance(strategy, StrategyTable):
+        strategy = table_strategy(strategy)
+    engine = RoundEngine(shoe=Shoe(rules.decks, rng=NumpyRNG(seed_sequence)), rules=rules)
+
+    stats = SimulationStats()
+    for _ in range(rounds):
+        stats.add(engine.play_round(1.0, strategy))
+    return stats
+
+
+def simulate(rounds, strategy, decks=6, seed=0, workers=None, block_size=1_000_000,
+             vectorized=True, rules=None):
+    """
+    Simulate rounds of a fixed strategy over a pool of worker processes.
+
+    Args:
+        rounds (int): Number of rounds to simulate.
+        strategy (StrategyTable or callable): The strategy chart, or (for the scalar
+            engine only) a picklable strategy such as strategy.basic_strategy.
+        decks (int): Number of decks in the shoe (default is 6).
+        seed (int): Master seed all worker streams are derived from (default is 0).
+        workers (int): Number of processes (default is one per CPU core).
+        block_size (int): Rounds per block. Part of the reproducibility key: results
+            only match between runs with the same seed and block size.
+        vectorized (bool): Use the NumPy batch simulator (default) or the scalar
+            round engine.
+        rules (RuleSet): Table rules for the scalar engine (default is
+            RuleSet(decks=decks)). The batch simulator only plays the default rules.
+
+    Returns:
+        SimulationStats: The block statistics, merged in block order.
+    """
+    if vectorized:
+        if not isinstance(strategy, StrategyTable):
+            raise TypeError("The vectorized simulator needs a StrategyTable.")
+        if rules is not None and rules != RuleSet(decks=rules.decks):
+            raise ValueError("The vectorized simulator only plays the default rules.")
+        decks = rules.decks if rules is not None else decks
+        run_block = partial(_batch_block, table=strategy, decks=decks)
+    else:
+        rules = rules if rules is not None else RuleSet(decks=decks)
+        run_block = partial(_engine_block, strategy=strategy, rules=rules)
+
+    stats = SimulationStats()
+    for block in map_blocks(run_block, rounds, seed, workers, block_size):
+        stats.merge(block)
+    return stats
+
+
+def map_blocks(run_block, total, seed=0, workers=None, block_size=1_000_000):
+    """
+    Run a block function over fixed-size blocks of work in worker processes.
+
+    Block ``i`` is called as ``run_block((size, seed_sequence))`` with the ``i``-th
+    child of the master seed's SeedSequence, so the results do not depend on the
+    number of workers.
+
+    Args:
+        run_block (callable): Picklable function of one (size, SeedSequence) task.
+        total (int): Amount of work (rounds, sessions...) to cut into blocks.
+        seed (int): Master seed (default is 0).
+        workers (int): Number of processes (default is one per CPU core).
+        block_size (int): Work per block (default is 1,000,000).
+
+    Returns:
+        list: The block results, in block order.
+    """
+    blocks = [block_size] * (total // block_size)
+    if total % block_size:
+        blocks.append(total % block_size)
+    tasks = list(zip(blocks, np.random.SeedSequence(seed).spawn(len(blocks))))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return list(map(run_block, tasks))
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(run_block, tasks))
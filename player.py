@@ -1,11 +1,57 @@
+from deck import CARD_VALUES, ACE
+
+
+def best_total(hard_total, has_ace):
+    """
+    Return the best total of a hand from its hard total.
+
+    One Ace is counted as 11 instead of 1 if that does not bust the hand.
+
+    Args:
+        hard_total (int): The hand total with every Ace counted as 1.
+        has_ace (bool): Whether the hand holds at least one Ace.
+
+    Returns:
+        int: The value of the hand.
+    """
+    return hard_total + 10 if has_ace and hard_total <= 11 else hard_total
+
+
+def hand_value(cards):
+    """
+    Calculate the value of a list of card codes from scratch.
+
+    Args:
+        cards (iterable): The card codes to total.
+
+    Returns:
+        int: The value of the cards as a hand.
+    """
+    hard_total = 0
+    has_ace = False
+    for card in cards:
+        value = CARD_VALUES[card]
+        if value == ACE:
+            has_ace = True
+            value = 1
+        hard_total += value
+    return best_total(hard_total, has_ace)
+
+
 class Player:
     """
     A class to represent a Blackjack player or dealer.
 
+    The hand's totals are updated incrementally as cards are added, so reading
+    them never rescans the cards.
+
     Attributes:
         name (str): The name of the player or dealer.
-        hand (list): The list of cards in the player's hand.
+        hand (bytearray): The card codes in the player's hand.
         bankroll (int): The amount of money the player has (only for players).
+        hard_total (int): The hand total with every Ace counted as 1.
+        has_ace (bool): Whether the hand holds at least one Ace.
+        total (int): The best value of the hand.
     """
 
     def __init__(self, name="Player", bankroll=0):
@@ -17,53 +63,92 @@ class Player:
             bankroll (int): Initial bankroll for the player (default is 0).
         """
         self.name = name
-        self.hand = []
+        self.hand = bytearray()
         self.bankroll = bankroll
+        self.hard_total = 0
+        self.has_ace = False
+        self.total = 0
 
     def add_card(self, card):
         """
-        Add a card to the player's hand.
+        Add a card to the player's hand and update the totals in O(1).
 
         Args:
-            card (tuple): A card represented as (rank, suit).
+            card (int): A card code (see deck.encode_card).
+        """
+        self.hand.append(card)
+        value = CARD_VALUES[card]
+        if value == ACE:
+            self.has_ace = True
+            value = 1
+        hard_total = self.hard_total + value
+        self.hard_total = hard_total
+        # Same rule as best_total, inlined for the hot path
+        self.total = hard_total + 10 if self.has_ace and hard_total <= 11 else hard_total
+
+    def set_hand(self, cards):
         """
-        rank, suit = card
-        # Only convert to integer if rank is a string and represents a number
-        if isinstance(rank, str) and rank.isdigit():
-            rank = int(rank)
-        self.hand.append((rank, suit))
+        Replace the player's hand with the given cards and recompute the totals.
+
+        Args:
+            cards (iterable): The card codes of the new hand.
+        """
+        self.hand[:] = cards
+        hard_total = 0
+        has_ace = False
+        for card in self.hand:
+            value = CARD_VALUES[card]
+            if value == ACE:
+                has_ace = True
+                value = 1
+            hard_total += value
+        self.hard_total = hard_total
+        self.has_ace = has_ace
+        self.total = hard_total + 10 if has_ace and hard_total <= 11 else hard_total
 
     def calculate_hand(self):
         """
-        Calculate the total value of the player's hand.
+        Return the total value of the player's hand.
 
-        Aces are counted as 11 initially, but switch to 1 if the total exceeds 21.
+        One Ace counts as 11 while that does not exceed 21, otherwise every Ace counts as 1.
 
         Returns:
             int: The total value of the player's hand.
         """
-        total = 0
-        aces = 0
+        return self.total
 
-        for card in self.hand:
-            rank, _ = card
-            if isinstance(rank, int):  # Numeric cards (2-10)
-                total += rank
-            elif rank in ['J', 'Q', 'K']:  # Face cards
-                total += 10
-            elif rank == 'A':  # Ace handling
-                aces += 1
-                total += 11
-
-        # Adjust Aces from 11 to 1 if total exceeds 21
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
-
-        return total
+    def is_soft(self):
+        """
+        Check if the hand's total counts an Ace as 11.
+
+        Returns:
+            bool: True for a soft hand.
+        """
+        return self.total != self.hard_total
+
+    def is_bust(self):
+        """
+        Check if the hand's total exceeds 21.
+
+        Returns:
+            bool: True for a busted hand.
+        """
+        return self.hard_total > 21
+
+    def is_blackjack(self):
+        """
+        Check if the hand is a two-card 21.
+
+        Returns:
+            bool: True for a natural Blackjack.
+        """
+        return self.total == 21 and len(self.hand) == 2
 
     def reset_hand(self):
         """
         Clear the player's hand at the end of a round.
         """
-        self.hand = []
+        self.hand.clear()
+        self.hard_total = 0
+        self.has_ace = False
+        self.total = 0
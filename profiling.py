@@ -0,0 +1,314 @@
+"""
+profiling.py - Optional per-phase timing of the round engine, and whole-run profilers.
+
+An EngineProfiler attached to a RoundEngine (or the terminal BlackjackGame) times
+each phase of a round: dealing, strategy decisions, split play, the dealer's draw
+and settlement, plus every card dealt from the shoe. It works by shadowing those
+methods on the one engine instance, so an engine without a profiler runs the
+unmodified class methods at no cost at all. Detaching restores them. Attached to
+a multi-seat table.Table, it also times the table's deal and rounds.
+
+For a function-level view, run_cprofile and run_sampling profile a whole run with
+cProfile or with a lightweight signal-based sampler.
+
+Usage:
+    python profiling.py --rounds 100000 --cprofile rounds.prof
+"""
+
+import argparse
+import cProfile
+import io
+import pstats
+import signal
+import sys
+import time
+from collections import Counter, namedtuple
+
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from strategy import basic_strategy
+from table import Table
+
+# Phase name -> engine method it times. Phases nest: "play" includes the decisions,
+# splits, dealer draw and settlement of the round, and "cards" counts every card
+# dealt, one by one or in a slice. At a table, "deal" and "play" time the table's
+# own deal and rounds instead (Table.deal, and Table._play: every seat and the
+# dealer, the deal included but not the settlement).
+PHASES = {
+    "deal": "deal",
+    "play": "play_dealt_round",
+    "split": "handle_split",
+    "dealer": "dealer_turn",
+    "settle": "settle",
+}
+TABLE_PHASES = {
+    "deal": "deal",
+    "play": "_play",
+}
+DECISION = "decision"
+CARDS = "cards"
+
+PhaseTiming = namedtuple("PhaseTiming", ["calls", "seconds"])
+PhaseTiming.__doc__ = """
+Accumulated timing of one phase.
+
+Attributes:
+    calls (int): Number of times the phase ran.
+    seconds (float): Total time spent in the phase, nested phases included.
+"""
+
+
+class EngineProfiler:
+    """
+    Per-phase timings and counts for one engine.
+
+    Attributes:
+        engine (RoundEngine): The engine being timed, or None once detached.
+        table (table.Table): The table being timed, or None if only an engine is.
+    """
+
+    def __init__(self, engine=None):
+        """
+        Initialize the profiler, attaching it to an engine if one is given.
+
+        Args:
+            engine (RoundEngine or table.Table): The engine or table to time (default
+                is none yet).
+        """
+        self.engine = None
+        self.table = None
+        self._phases = {phase: [0, 0.0] for phase in (*PHASES, DECISION, CARDS)}
+        if engine is not None:
+            self.attach(engine)
+
+    def _timed(self, phase, func):
+        """Wrap a callable so that its calls and time are added to a phase."""
+        totals = self._phases[phase]
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[0] += 1
+                totals[1] += clock() - start
+        return timed
+
+    def _counted_cards(self, deck):
+        """Wrap a shoe's deal_cards so that each card it deals counts as one call of "cards"."""
+        totals = self._phases[CARDS]
+        clock = time.perf_counter
+        deal_cards = deck.deal_cards
+
+        def timed(number):
+            if len(deck.cards) < number:
+                return deal_cards(number)  # Card by card through the timed deal_card
+            start = clock()
+            try:
+                return deal_cards(number)
+            finally:
+                totals[0] += number
+                totals[1] += clock() - start
+        return timed
+
+    def attach(self, engine):
+        """
+        Start timing an engine's phases.
+
+        Args:
+            engine (RoundEngine or table.Table): The engine to time, or a table to
+                time along with its engine.
+        """
+        if self.engine is not None:
+            self.detach()
+        if isinstance(engine, Table):
+            table = engine
+            engine = table.engine
+            for phase, name in TABLE_PHASES.items():
+                setattr(table, name, self._timed(phase, getattr(table, name)))
+            self.table = table
+        for phase, name in PHASES.items():
+            if self.table is None or phase not in TABLE_PHASES:
+                setattr(engine, name, self._timed(phase, getattr(engine, name)))
+
+        # Decisions are timed by wrapping the strategy each seat is played with
+        play_seat = engine.play_seat
+        timed_decision = self._timed
+
+        def timed_play_seat(player, bet, strategy):
+            return play_seat(player, bet, timed_decision(DECISION, strategy))
+        engine.play_seat = timed_play_seat
+
+        deck = engine.deck
+        deck.deal_card = self._timed(CARDS, deck.deal_card)
+        deck.deal_cards = self._counted_cards(deck)
+        engine.profiler = self
+        self.engine = engine
+
+    def detach(self):
+        """Stop timing and restore the engine's (and table's) own methods."""
+        engine = self.engine
+        if engine is None:
+            return
+        for name in (*PHASES.values(), "play_seat"):
+            engine.__dict__.pop(name, None)
+        engine.deck.__dict__.pop("deal_card", None)
+        engine.deck.__dict__.pop("deal_cards", None)
+        if self.table is not None:
+            for name in TABLE_PHASES.values():
+                self.table.__dict__.pop(name, None)
+        engine.profiler = None
+        self.engine = None
+        self.table = None
+
+    def reset(self):
+        """Zero every phase's counters."""
+        for totals in self._phases.values():
+            totals[0] = 0
+            totals[1] = 0.0
+
+    def results(self):
+        """
+        Return the timings accumulated so far.
+
+        Returns:
+            dict: PhaseTiming of each phase, by phase name.
+        """
+        return {phase: PhaseTiming(*totals) for phase, totals in self._phases.items()}
+
+    def summary(self):
+        """
+        Format the timings as a table.
+
+        Shares are relative to the time spent dealing and playing rounds.
+
+        Returns:
+            str: The summary table.
+        """
+        results = self.results()
+        wall = results["play"].seconds
+        if self.table is None:
+            wall += results["deal"].seconds  # An engine deals outside play_dealt_round
+        lines = [f"{'phase':<10}{'calls':>12}{'total s':>12}{'mean us':>12}{'share':>9}"]
+        for phase, timing in results.items():
+            mean = timing.seconds / timing.calls * 1e6 if timing.calls else 0.0
+            share = timing.seconds / wall if wall else 0.0
+            lines.append(f"{phase:<10}{timing.calls:>12,}{timing.seconds:>12.4f}"
+                         f"{mean:>12.2f}{share:>9.1%}")
+        return "\n".join(lines)
+
+
+def run_cprofile(func, *args, path=None):
+    """
+    Run a function under cProfile.
+
+    Args:
+        func (callable): The function to run.
+        *args: Arguments for ``func``.
+        path (str): File to dump the raw profile to, for pstats or snakeviz (default
+            is not to dump it).
+
+    Returns:
+        tuple: (func's return value, pstats.Stats of the run).
+    """
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args)
+    if path is not None:
+        profile.dump_stats(path)
+    return result, pstats.Stats(profile, stream=io.StringIO())
+
+
+def run_sampling(func, *args, interval=0.001):
+    """
+    Run a function under a statistical profiler that samples the call stack.
+
+    Samples are taken on CPU-time timer signals, so this only works on platforms
+    with signal.setitimer (not Windows) and from the main thread.
+
+    Args:
+        func (callable): The function to run.
+        *args: Arguments for ``func``.
+        interval (float): Seconds of CPU time between samples (default is 1 ms).
+
+    Returns:
+        tuple: (func's return value, Counter of samples where each function was
+        running itself, Counter of samples where it was anywhere on the stack).
+    """
+    if not hasattr(signal, "setitimer"):
+        raise RuntimeError("Sampling needs signal.setitimer, which this platform lacks.")
+    own = Counter()
+    inclusive = Counter()
+
+    def sample(signum, frame):
+        own[_frame_key(frame)] += 1
+        seen = set()
+        while frame is not None:
+            seen.add(_frame_key(frame))
+            frame = frame.f_back
+        inclusive.update(seen)
+
+    previous = signal.signal(signal.SIGPROF, sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        result = func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+    return result, own, inclusive
+
+
+def _frame_key(frame):
+    """Identify a frame's function as 'file:line(name)'."""
+    code = frame.f_code
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+
+def format_samples(own, inclusive, limit=20):
+    """
+    Format sampling results as a table of the functions seen most often.
+
+    Args:
+        own (Counter): Samples where each function was running itself.
+        inclusive (Counter): Samples where each function was on the stack.
+        limit (int): Number of functions to list (default is 20).
+
+    Returns:
+        str: The table.
+    """
+    total = sum(own.values()) or 1
+    lines = [f"{'own':>7}{'total':>8}  function"]
+    for key, count in inclusive.most_common(limit):
+        lines.append(f"{own[key] / total:>7.1%}{count / total:>8.1%}  {key}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Profile headless basic-strategy rounds from the command line."""
+    parser = argparse.ArgumentParser(description="Profile headless rounds phase by phase.")
+    parser.add_argument("--rounds", type=int, default=100_000, help="rounds to play")
+    parser.add_argument("--decks", type=int, default=6, help="decks in the shoe")
+    parser.add_argument("--cprofile", metavar="PATH", help="also dump a cProfile of the run")
+    parser.add_argument("--sample", action="store_true",
+                        help="also sample the call stack and print the hottest functions")
+    args = parser.parse_args(argv)
+
+    engine = RoundEngine(player=Player("Player", 0.0), shoe=Shoe(args.decks))
+    profiler = EngineProfiler(engine)
+    run = engine.play_rounds
+    if args.cprofile:
+        _, stats = run_cprofile(run, args.rounds, 1.0, basic_strategy, path=args.cprofile)
+        stats.stream = sys.stdout
+        stats.sort_stats("cumulative").print_stats(15)
+    elif args.sample:
+        _, own, inclusive = run_sampling(run, args.rounds, 1.0, basic_strategy)
+        print(format_samples(own, inclusive))
+    else:
+        run(args.rounds, 1.0, basic_strategy)
+    print(profiler.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
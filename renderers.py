@@ -0,0 +1,121 @@
+"""
+renderers.py - Output layer of the terminal game.
+
+BlackjackGame writes every message and hand through a renderer instead of calling
+print directly, so the same game logic runs interactively, buffered or silently:
+
+- TerminalRenderer writes each message to the terminal as it comes (the default).
+- BufferedRenderer collects a round's output and writes it in one go on flush().
+- NullRenderer drops everything.
+
+Messages are passed as a format string and its arguments, like logging calls, and
+are only formatted by renderers that write them; a NullRenderer call costs no
+string formatting or I/O. Callers can also test ``renderer.enabled`` to skip work
+that only serves the output.
+"""
+
+import sys
+
+from utils import format_hand
+
+
+class NullRenderer:
+    """
+    A renderer that drops all output; also the interface every renderer implements.
+
+    Attributes:
+        enabled (bool): Whether the renderer writes anything.
+    """
+
+    enabled = False
+
+    def message(self, text, *args):
+        """
+        Render a line of text.
+
+        Args:
+            text (str): The text, or a str.format template of ``args``.
+            *args: Values for the template.
+        """
+
+    def hand(self, player, hide_first=False):
+        """
+        Render a player's or dealer's hand.
+
+        Args:
+            player (Player): The hand to render.
+            hide_first (bool): Whether to hide the dealer's hole card.
+        """
+
+    def flush(self):
+        """Write out any buffered output."""
+
+
+class TerminalRenderer(NullRenderer):
+    """
+    Writes each message to a text stream as soon as it is rendered.
+
+    Attributes:
+        stream (file): The stream written to (None for the current sys.stdout).
+    """
+
+    enabled = True
+
+    def __init__(self, stream=None):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream (file): The stream to write to (default is sys.stdout).
+        """
+        self.stream = stream
+
+    def message(self, text, *args):
+        self.write((text.format(*args) if args else text) + "\n")
+
+    def hand(self, player, hide_first=False):
+        self.write("\n".join(format_hand(player, hide_first)) + "\n")
+
+    def write(self, text):
+        """
+        Write rendered text.
+
+        Args:
+            text (str): The text, newlines included.
+        """
+        (self.stream or sys.stdout).write(text)
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+
+class BufferedRenderer(TerminalRenderer):
+    """
+    Collects rendered text and writes it to the stream in one call on flush().
+
+    The game flushes at the end of every round and before reading input.
+
+    Attributes:
+        stream (file): The stream written to (None for the current sys.stdout).
+        buffer (list): Text rendered since the last flush.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream (file): The stream to write to (default is sys.stdout).
+        """
+        super().__init__(stream)
+        self.buffer = []
+
+    def write(self, text):
+        self.buffer.append(text)
+
+    def flush(self):
+        if self.buffer:
+            stream = self.stream or sys.stdout
+            stream.write("".join(self.buffer))
+            self.buffer.clear()
+            stream.flush()
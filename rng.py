@@ -0,0 +1,67 @@
+"""
+rng.py - Seedable random sources for shuffling decks and shoes.
+
+Deck and Shoe take any object with a ``shuffle(cards)`` method as their ``rng``.
+``random.Random`` shuffles card by card in Python; NumpyRNG permutes the whole
+shoe in a single vectorized call on a NumPy ``Generator``. Either way, the same
+seed always gives bit-for-bit the same shuffles.
+"""
+
+import random
+
+import numpy as np
+
+# Bit generators NumpyRNG can be built on
+BIT_GENERATORS = {
+    "pcg64": np.random.PCG64,
+    "philox": np.random.Philox,
+}
+
+
+class NumpyRNG:
+    """
+    A shuffle source backed by a NumPy Generator.
+
+    Attributes:
+        generator (numpy.random.Generator): The underlying generator.
+    """
+
+    def __init__(self, seed=None, bit_generator="pcg64"):
+        """
+        Initialize the generator.
+
+        Args:
+            seed (int or numpy.random.SeedSequence): Seed (default is fresh OS entropy).
+            bit_generator (str): 'pcg64' (default) or 'philox'.
+        """
+        self.generator = np.random.Generator(BIT_GENERATORS[bit_generator](seed))
+
+    def shuffle(self, cards):
+        """
+        Shuffle a bytearray of card codes in place with one vectorized call.
+
+        Args:
+            cards (bytearray): The cards to shuffle.
+        """
+        self.generator.shuffle(np.frombuffer(cards, dtype=np.uint8))
+
+    def random(self):
+        """Return a random float in [0, 1)."""
+        return self.generator.random()
+
+
+def make_rng(seed=None, kind="pcg64"):
+    """
+    Build a seeded shuffle source for a Deck or Shoe.
+
+    Args:
+        seed (int): Seed (default is unseeded).
+        kind (str): 'mt' for Python's Mersenne Twister (random.Random), or
+            'pcg64' (default) / 'philox' for a NumPy Generator.
+
+    Returns:
+        random.Random or NumpyRNG: The shuffle source.
+    """
+    if kind == "mt":
+        return random.Random(seed)
+    return NumpyRNG(seed, kind)
@@ -0,0 +1,166 @@
+"""
+ruin.py - Vectorized risk-of-ruin and bankroll-trajectory Monte Carlo.
+
+A strategy's per-round results are first reduced to a distribution of the net
+result per unit bet, measured by playing rounds with the engine. Many sessions are
+then simulated at once as NumPy arrays: each step draws a block of rounds for
+every session still running, and each session stops at the first round where it
+is ruined (its bankroll can no longer cover the bet) or reaches its target.
+
+Example:
+    distribution = round_distribution(basic_strategy, rounds=200_000, seed=1)
+    result = simulate_sessions(distribution, bankroll=1000, bet=10, target=2000)
+    result.risk_of_ruin  # chance of losing the 1000 before doubling it
+"""
+
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+
+# Session states
+RUNNING = 0
+RUINED = 1
+REACHED = 2
+
+# Rounds x sessions drawn per step, which bounds memory use
+_STEP_CELLS = 1 << 21
+
+RuinResult = namedtuple(
+    "RuinResult",
+    ["sessions", "risk_of_ruin", "target_reached", "unfinished", "median_length",
+     "mean_final_bankroll", "drawdown_quantiles"],
+)
+RuinResult.__doc__ = """
+Summary of a batch of simulated sessions.
+
+Attributes:
+    sessions (int): Number of sessions simulated.
+    risk_of_ruin (float): Fraction of sessions ruined before reaching the target.
+    target_reached (float): Fraction of sessions that reached the target.
+    unfinished (float): Fraction of sessions still running after max_rounds.
+    median_length (float): Median number of rounds played per session.
+    mean_final_bankroll (float): Mean bankroll at the end of the sessions.
+    drawdown_quantiles (dict): Quantile -> largest peak-to-trough bankroll drop
+        within a session.
+"""
+
+
+def round_distribution(strategy, rounds=200_000, rules=None, seed=None):
+    """
+    Measure the distribution of a strategy's net result per round with the engine.
+
+    Args:
+        strategy (callable): Decision function, see engine.RoundEngine.
+        rounds (int): Rounds to play (default is 200,000).
+        rules (RuleSet): The table rules (default is RuleSet()).
+        seed (int): Seed for the shoe (default is unseeded).
+
+    Returns:
+        tuple: (values, probabilities) NumPy arrays; values are net results per unit bet.
+    """
+    rules = rules if rules is not None else RuleSet()
+    engine = RoundEngine(player=Player("Player", 0.0), shoe=Shoe(rules.decks, rng=NumpyRNG(seed)),
+                         rules=rules)
+    counts = Counter()
+    play_round = engine.play_round
+    for _ in range(rounds):
+        counts[round(play_round(1.0, strategy).net, 9)] += 1
+    values = np.array(sorted(counts))
+    return values, np.array([counts[value] for value in values]) / rounds
+
+
+def outcome_distribution(stats):
+    """
+    Turn the net-result histogram of a unit-bet simulation into a distribution.
+
+    This is exact when every net result lies on the histogram's bin grid (the
+    default 0.5 bins hold every result with a 3:2 payout) and all of them lie
+    within its range.
+
+    Args:
+        stats (SimulationStats): Statistics of a simulation with a bet of 1.
+
+    Returns:
+        tuple: (values, probabilities) NumPy arrays, as from round_distribution.
+    """
+    counts = np.array(stats.histogram, dtype=float)
+    values = np.array(stats.bin_edges()[:-1])
+    present = counts > 0
+    return values[present], counts[present] / counts.sum()
+
+
+def simulate_sessions(distribution, bankroll, bet, target=None, sessions=10_000,
+                      max_rounds=100_000, seed=None, quantiles=(0.5, 0.9, 0.99)):
+    """
+    Simulate many flat-betting sessions at once.
+
+    Args:
+        distribution (tuple): (values, probabilities) of the net result per unit bet.
+        bankroll (float): Starting bankroll of every session.
+        bet (float): The bet placed on every round.
+        target (float): Bankroll at which a session stops as won (default is
+            double the starting bankroll).
+        sessions (int): Number of sessions (default is 10,000).
+        max_rounds (int): Rounds after which a running session is cut off.
+        seed (int): Seed for the random generator (default is unseeded).
+        quantiles (tuple): Drawdown quantiles to report.
+
+    Returns:
+        RuinResult: Risk of ruin, session lengths and drawdowns.
+    """
+    values, probabilities = distribution
+    steps = np.asarray(values, dtype=float) * bet
+    cdf = np.cumsum(probabilities, dtype=float)
+    cdf /= cdf[-1]
+    rng = np.random.default_rng(seed)
+    if target is None:
+        target = 2 * bankroll
+
+    money = np.full(sessions, float(bankroll))
+    peak = money.copy()
+    drawdown = np.zeros(sessions)
+    length = np.zeros(sessions, dtype=np.int64)
+    status = np.full(sessions, RUNNING, dtype=np.int8)
+    active = np.arange(sessions)
+
+    played = 0
+    while len(active) and played < max_rounds:
+        block = min(max_rounds - played, max(16, _STEP_CELLS // len(active)))
+        draws = steps[np.searchsorted(cdf, rng.random((len(active), block)), side="right")]
+        path = money[active, None] + np.cumsum(draws, axis=1)
+
+        # First round at which each session is ruined or reaches its target
+        ruined = path < bet
+        stop = ruined | (path >= target)
+        stopped = stop.any(axis=1)
+        last = np.where(stopped, stop.argmax(axis=1), block - 1)
+        rows = np.arange(len(active))
+
+        # Drawdowns only count up to the stopping round
+        running_peak = np.maximum(np.maximum.accumulate(path, axis=1), peak[active, None])
+        in_session = np.arange(block) <= last[:, None]
+        drops = np.where(in_session, running_peak - path, 0.0).max(axis=1)
+        drawdown[active] = np.maximum(drawdown[active], drops)
+
+        money[active] = path[rows, last]
+        peak[active] = running_peak[rows, last]
+        length[active] += last + 1
+        status[active[stopped]] = np.where(ruined[rows[stopped], last[stopped]], RUINED, REACHED)
+        active = active[~stopped]
+        played += block
+
+    return RuinResult(
+        sessions=sessions,
+        risk_of_ruin=float(np.mean(status == RUINED)),
+        target_reached=float(np.mean(status == REACHED)),
+        unfinished=float(np.mean(status == RUNNING)),
+        median_length=float(np.median(length)),
+        mean_final_bankroll=float(money.mean()),
+        drawdown_quantiles=dict(zip(quantiles, np.quantile(drawdown, quantiles).tolist())),
+    )
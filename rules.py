@@ -0,0 +1,104 @@
+"""
+rules.py - Table rule variants.
+
+A RuleSet describes the house rules a table is played with. The round engine
+compiles it once into lookup tables (engine.compile_rules), so rule variants cost
+nothing per round; ev_tables uses RuleSet.key() to cache EVs per rule variant.
+The defaults are the rules this game has always been played with.
+"""
+
+from collections import namedtuple
+from fractions import Fraction
+
+# Surrender rules
+SURRENDER_NONE = "none"
+SURRENDER_LATE = "late"    # First two cards only, after the dealer has peeked
+SURRENDER_EARLY = "early"  # First two cards only, before the dealer checks for Blackjack
+SURRENDER_ANY = "any"      # Any time on the unsplit hand, after the dealer has peeked
+
+# Hand totals (best total of the first two cards) the player may double on
+DOUBLE_ANY = "any"
+DOUBLE_9_11 = "9-11"
+DOUBLE_10_11 = "10-11"
+DOUBLE_TOTALS = {
+    DOUBLE_ANY: frozenset(range(4, 22)),
+    DOUBLE_9_11: frozenset((9, 10, 11)),
+    DOUBLE_10_11: frozenset((10, 11)),
+}
+
+_FIELDS = ["decks", "hit_soft_17", "blackjack_payout", "double_on", "double_after_split",
+           "max_split_hands", "resplit_aces", "hit_split_aces", "surrender", "dealer_peek",
+           "insurance"]
+_DEFAULTS = (6, False, 1.5, DOUBLE_ANY, False, 2, False, True, SURRENDER_ANY, True, True)
+
+
+class RuleSet(namedtuple("RuleSet", _FIELDS, defaults=_DEFAULTS)):
+    """
+    House rules of a Blackjack table.
+
+    Attributes:
+        decks (int): Number of decks in the shoe (default is 6).
+        hit_soft_17 (bool): The dealer hits soft 17 (H17) instead of standing on
+            all 17s (S17, default).
+        blackjack_payout (float): Net payout of a natural per unit bet (default is
+            1.5 for 3:2; 1.2 for 6:5).
+        double_on (str): DOUBLE_ANY (default), DOUBLE_9_11 or DOUBLE_10_11.
+        double_after_split (bool): Split hands may double on their first two cards
+            (default is False).
+        max_split_hands (int): Most hands a player may hold by splitting and
+            resplitting (default is 2, a single split; 1 disallows splitting).
+        resplit_aces (bool): Split Aces may be split again (default is False).
+        hit_split_aces (bool): Split Aces are played like any split hand (default);
+            if False, each gets exactly one more card.
+        surrender (str): SURRENDER_ANY (default), SURRENDER_LATE, SURRENDER_EARLY
+            or SURRENDER_NONE.
+        dealer_peek (bool): The dealer checks for Blackjack before the player acts
+            (default). Without a peek, a dealer Blackjack also takes doubles and splits.
+        insurance (bool): Insurance is offered when the dealer shows an Ace (default).
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        rules = super().__new__(cls, *args, **kwargs)
+        if not 1 <= rules.decks <= 8:
+            raise ValueError("Number of decks must be between 1 and 8.")
+        if rules.blackjack_payout <= 0:
+            raise ValueError("The Blackjack payout must be positive.")
+        if rules.double_on not in DOUBLE_TOTALS:
+            raise ValueError(f"Unknown double rule: {rules.double_on!r}")
+        if rules.max_split_hands < 1:
+            raise ValueError("max_split_hands must be at least 1.")
+        if rules.surrender not in (SURRENDER_NONE, SURRENDER_LATE, SURRENDER_EARLY, SURRENDER_ANY):
+            raise ValueError(f"Unknown surrender rule: {rules.surrender!r}")
+        return rules
+
+    def payout_odds(self):
+        """
+        Return the Blackjack payout as casino odds.
+
+        Returns:
+            str: E.g. '3:2' or '6:5'.
+        """
+        odds = Fraction(self.blackjack_payout).limit_denominator(20)
+        return f"{odds.numerator}:{odds.denominator}"
+
+    def key(self):
+        """
+        Return a short text identifying the rules, e.g. for cache keys.
+
+        Returns:
+            str: The rules in casino shorthand.
+        """
+        return " ".join((
+            f"{self.decks}D",
+            "H17" if self.hit_soft_17 else "S17",
+            f"BJ{self.blackjack_payout:g}",
+            "peek" if self.dealer_peek else "nopeek",
+            f"D{self.double_on}",
+            "DAS" if self.double_after_split else "noDAS",
+            f"split{self.max_split_hands - 1}" + ("RSA" if self.resplit_aces else ""),
+            "HSA" if self.hit_split_aces else "noHSA",
+            f"surrender-{self.surrender}",
+            "insurance" if self.insurance else "noinsurance",
+        ))
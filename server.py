@@ -0,0 +1,277 @@
+"""
+server.py - Asyncio Blackjack server hosting many tables in one process.
+
+Every connection gets its own table (shoe, dealer and bankroll) and talks a small
+protocol of JSON objects, one per line. Client requests:
+
+    {"op": "bet", "amount": 10}      deal a round with this bet
+    {"op": "action", "action": "h"}  answer the pending decision
+    {"op": "quit"}                   close the table
+
+Server messages (cards are card codes, see deck.card_label):
+
+    {"type": "welcome", "table": 1, "bankroll": 1000.0, "min_bet": 10.0, "max_bet": 1000.0,
+     "rules": "6D S17 ..."}
+    {"type": "decision", "hand": [12, 8], "total": 20, "upcard": 30, "actions": "hsdr"}
+    {"type": "result", "net": 10.0, "outcomes": ["Win"], "player_totals": [20],
+     "dealer_total": 18, "dealer_hand": [30, 4, 19], "bankroll": 1010.0}
+    {"type": "error", "message": "..."}
+
+The actions are the engine's letters (engine.HIT, ...); an insurance offer is a
+decision with the actions "yn". Only actions the bankroll can cover are offered.
+
+The round engine asks its strategy for every decision synchronously, so a table
+cannot wait for the network in the middle of a round. Each round is an
+engine.SteppedRound instead, replayed from the deal with the decisions received so
+far up to the first unanswered one; no thread or blocked coroutine is held per table.
+
+Usage:
+    python server.py --port 8765
+    python server.py --unix /tmp/blackjack.sock
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+
+import numpy as np
+
+from deck import Shoe
+from engine import RoundEngine, SteppedRound
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+
+
+class ServerTable:
+    """
+    One player's table, played one decision at a time.
+
+    Attributes:
+        engine (RoundEngine): The engine holding the shoe, dealer, player and rules.
+        min_bet (float): Minimum bet.
+        max_bet (float): Maximum bet (default is no limit beyond the bankroll).
+        round (SteppedRound): The round in progress, or None between rounds.
+    """
+
+    def __init__(self, rules=None, bankroll=1000.0, min_bet=10.0, max_bet=None, seed=None):
+        """
+        Initialize the table.
+
+        Args:
+            rules (RuleSet): The table rules (default is RuleSet()).
+            bankroll (float): The player's starting bankroll (default is 1000).
+            min_bet (float): Minimum bet (default is 10).
+            max_bet (float): Maximum bet (default is no limit).
+            seed (int or numpy.random.SeedSequence): Seed of the shoe (default is unseeded).
+        """
+        rules = rules if rules is not None else RuleSet()
+        self.engine = RoundEngine(player=Player("Player", bankroll), dealer=Player("Dealer"),
+                                  shoe=Shoe(rules.decks, rng=NumpyRNG(seed)), rules=rules)
+        self.min_bet = min_bet
+        self.max_bet = max_bet
+        self.round = None
+
+    def start_round(self, bet):
+        """
+        Deal a round and play it up to the first decision.
+
+        Args:
+            bet (float): The bet amount for this round.
+
+        Returns:
+            dict: The decision or result message.
+        """
+        if self.round is not None:
+            raise ValueError("A round is already in progress.")
+        if not math.isfinite(bet):
+            raise ValueError("Bet must be a finite amount.")  # NaN passes every comparison
+        if bet < self.min_bet:
+            raise ValueError(f"Bet must be at least {self.min_bet:.2f}.")
+        if self.max_bet is not None and bet > self.max_bet:
+            raise ValueError(f"Bet must be at most {self.max_bet:.2f}.")
+        if bet > self.engine.player.bankroll:
+            raise ValueError("You don't have enough money for that bet.")
+        self.round = SteppedRound(self.engine, bet)
+        return self._message()
+
+    def act(self, action):
+        """
+        Answer the pending decision and play on to the next one.
+
+        Args:
+            action (str): The chosen action letter.
+
+        Returns:
+            dict: The decision or result message.
+        """
+        if self.round is None:
+            raise ValueError("No round in progress; place a bet first.")
+        self.round.act(action)
+        return self._message()
+
+    def _message(self):
+        """Describe the pending decision, or the result once the round is over."""
+        pending = self.round.pending
+        if pending is not None:
+            return {"type": "decision", "hand": list(pending.hand.hand), "total": pending.hand.total,
+                    "upcard": pending.upcard, "actions": pending.actions}
+        result = self.round.result
+        self.round = None
+        engine = self.engine
+        return {"type": "result", "net": result.net, "outcomes": list(result.outcomes),
+                "player_totals": list(result.player_totals), "dealer_total": result.dealer_total,
+                "dealer_hand": list(engine.dealer.hand), "bankroll": engine.player.bankroll}
+
+
+class BlackjackServer:
+    """
+    Serves one ServerTable per connection over TCP or a Unix socket.
+
+    Attributes:
+        rules (RuleSet): The rules of every table.
+        bankroll (float): Starting bankroll of every table.
+        min_bet (float): Minimum bet.
+        max_bet (float): Maximum bet (None for no limit).
+        tables (dict): Open tables by id.
+    """
+
+    def __init__(self, rules=None, bankroll=1000.0, min_bet=10.0, max_bet=None, seed=None):
+        """
+        Initialize the server.
+
+        Args:
+            rules (RuleSet): The table rules (default is RuleSet()).
+            bankroll (float): Starting bankroll of every table (default is 1000).
+            min_bet (float): Minimum bet (default is 10).
+            max_bet (float): Maximum bet (default is no limit).
+            seed (int): Master seed; table ``i`` shuffles from its ``i``-th child
+                SeedSequence (default is unseeded).
+        """
+        self.rules = rules if rules is not None else RuleSet()
+        self.bankroll = bankroll
+        self.min_bet = min_bet
+        self.max_bet = max_bet
+        self.tables = {}
+        self._ids = itertools.count(1)
+        self._seeds = np.random.SeedSequence(seed) if seed is not None else None
+
+    def open_table(self):
+        """
+        Open a new table.
+
+        Returns:
+            tuple: (table id, ServerTable).
+        """
+        seed = self._seeds.spawn(1)[0] if self._seeds is not None else None
+        table_id = next(self._ids)
+        table = ServerTable(self.rules, self.bankroll, self.min_bet, self.max_bet, seed)
+        self.tables[table_id] = table
+        return table_id, table
+
+    def handle_request(self, table, request):
+        """
+        Apply one client request to a table.
+
+        Args:
+            table (ServerTable): The client's table.
+            request (dict): The decoded request.
+
+        Returns:
+            dict: The reply message (None to close the connection).
+        """
+        op = request.get("op")
+        try:
+            if op == "bet":
+                return table.start_round(float(request["amount"]))
+            if op == "action":
+                return table.act(request.get("action"))
+            if op == "quit":
+                return None
+            raise ValueError(f"Unknown op: {op!r}")
+        except (KeyError, TypeError, ValueError) as error:
+            return {"type": "error", "message": str(error)}
+
+    async def handle(self, reader, writer):
+        """Serve one connection until the client quits or disconnects."""
+        table_id, table = self.open_table()
+        try:
+            writer.write(_encode({"type": "welcome", "table": table_id,
+                                  "bankroll": table.engine.player.bankroll,
+                                  "min_bet": self.min_bet, "max_bet": self.max_bet,
+                                  "rules": self.rules.key()}))
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"type": "error", "message": "Requests are JSON objects, one per line."}
+                else:
+                    if not isinstance(request, dict):
+                        request = {}
+                    reply = self.handle_request(table, request)
+                    if reply is None:
+                        break
+                writer.write(_encode(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.tables[table_id]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host="127.0.0.1", port=8765, path=None, backlog=4096):
+        """
+        Listen for connections until cancelled.
+
+        Args:
+            host (str): TCP address to listen on (default is localhost).
+            port (int): TCP port (default is 8765).
+            path (str): Unix socket path; if given, listen there instead of TCP.
+            backlog (int): Connections queued before accepting (default is 4096, so a
+                burst of load-test players is not refused).
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=path, backlog=backlog)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, backlog=backlog)
+        async with server:
+            await server.serve_forever()
+
+
+def _encode(message):
+    """Encode a message as one line of JSON."""
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve Blackjack tables over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--bankroll", type=float, default=1000.0, help="starting bankroll")
+    parser.add_argument("--min-bet", type=float, default=10.0, help="minimum bet")
+    parser.add_argument("--max-bet", type=float, help="maximum bet (default is no limit)")
+    parser.add_argument("--decks", type=int, default=6, help="decks per shoe")
+    parser.add_argument("--seed", type=int, help="master seed of the shoes")
+    args = parser.parse_args(argv)
+
+    server = BlackjackServer(RuleSet(decks=args.decks), args.bankroll, args.min_bet,
+                             args.max_bet, args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+sprites.py - Persistent cache of pre-resized card sprites for the GUI.
+
+Decoding and resizing every PNG in cards/ takes most of the GUI's start-up time.
+The sprite cache does it once per target size: all resized sprites are packed into
+a single atlas file of raw RGBA pixels under ~/.cache/blackjack-simulator. The
+atlas name holds a digest of the source files' names, sizes and modification
+times and of the target size, so editing, adding or removing a card image, or
+asking for another size, builds a new atlas; anything else reuses it.
+
+Sprites are turned into Tk images lazily, the first time each one is shown, so
+start-up costs one file read. High-DPI displays get sprites rendered at their
+pixel density (display_scale) rather than blown up by Tk.
+"""
+
+import hashlib
+import os
+import struct
+
+from PIL import Image, ImageTk
+
+CARDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cards")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "blackjack-simulator")
+CARD_SIZE = (80, 120)
+
+_MAGIC = b"BJSP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHHI")  # magic, version, width, height, names length
+
+
+def display_scale(root):
+    """
+    Return the sprite scale for a Tk root's display.
+
+    Tk reports 96 DPI displays at 4/3 pixels per point; denser displays get
+    proportionally larger sprites, in quarter steps and never below 1.
+
+    Args:
+        root (tk.Tk): The root window.
+
+    Returns:
+        float: The scale factor, e.g. 1.0 or 2.0.
+    """
+    points = float(root.tk.call("tk", "scaling"))
+    return max(1.0, round(points * 72 / 96 * 4) / 4)
+
+
+class SpriteCache:
+    """
+    Card sprites at one size, read from the atlas cache and decoded on first use.
+
+    The cache reads like the dict of images it replaces: ``sprites.get("10_spade")``.
+
+    Attributes:
+        folder (str): Directory of the source PNGs.
+        size (tuple): Sprite size in pixels, (width, height).
+        path (str): The atlas file.
+        names (tuple): Sprite names (source file names without '.png').
+    """
+
+    def __init__(self, size=CARD_SIZE, scale=1.0, folder=CARDS_DIR, cache_dir=CACHE_DIR):
+        """
+        Open the sprite atlas, building it first if it is missing or stale.
+
+        Args:
+            size (tuple): Sprite size in points, (width, height) (default is 80x120).
+            scale (float): Pixels per point, see display_scale (default is 1).
+            folder (str): Directory of the source PNGs (default is cards/).
+            cache_dir (str): Cache directory (default is ~/.cache/blackjack-simulator).
+        """
+        self.folder = folder
+        self.size = (round(size[0] * scale), round(size[1] * scale))
+        sources = sorted(name for name in os.listdir(folder) if name.endswith(".png"))
+        signature = hashlib.sha1(repr(self.size).encode())
+        for name in sources:
+            stat = os.stat(os.path.join(folder, name))
+            signature.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        width, height = self.size
+        self.path = os.path.join(cache_dir, f"sprites-{width}x{height}-{signature.hexdigest()[:12]}.bin")
+
+        atlas = self._read()
+        if atlas is None:
+            atlas = self._build(sources)
+        self.names, self._pixels = atlas
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._images = {}
+
+    def get(self, name, default=None):
+        """
+        Return the Tk image of a sprite, decoding it on first use.
+
+        Args:
+            name (str): The sprite name, e.g. '10_spade' or 'back'.
+            default: Returned for unknown names (default is None).
+
+        Returns:
+            ImageTk.PhotoImage: The sprite.
+        """
+        image = self._images.get(name)
+        if image is None:
+            i = self._index.get(name)
+            if i is None:
+                return default
+            width, height = self.size
+            sprite_bytes = width * height * 4
+            pixels = self._pixels[i * sprite_bytes:(i + 1) * sprite_bytes]
+            image = ImageTk.PhotoImage(Image.frombuffer("RGBA", self.size, pixels, "raw", "RGBA", 0, 1))
+            self._images[name] = image
+        return image
+
+    def __getitem__(self, name):
+        image = self.get(name)
+        if image is None:
+            raise KeyError(name)
+        return image
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self.names)
+
+    def _build(self, sources):
+        """Resize every source image, write the atlas and return (names, pixels)."""
+        pixels = bytearray()
+        for name in sources:
+            with Image.open(os.path.join(self.folder, name)) as image:
+                pixels += image.convert("RGBA").resize(self.size, Image.LANCZOS).tobytes()
+        names = tuple(name[:-4] for name in sources)
+
+        try:
+            self._write(names, pixels)
+        except OSError:
+            pass  # Without a writable cache the GUI resizes the PNGs again on its next start
+        return names, memoryview(pixels)
+
+    def _write(self, names, pixels):
+        """Write the atlas, replacing a stale or invalid file at the same path."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        packed_names = "\n".join(names).encode()
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, *self.size, len(packed_names)))
+            f.write(packed_names)
+            f.write(pixels)
+        os.replace(temporary, self.path)  # Readers never see a partial atlas
+
+    def _read(self):
+        """Read the atlas, or return None if it is missing or invalid."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, width, height, names_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or (width, height) != self.size:
+            return None
+        start = _HEADER.size + names_length
+        names = tuple(data[_HEADER.size:start].decode().split("\n")) if names_length else ()
+        if len(data) - start != len(names) * width * height * 4:
+            return None
+        return names, memoryview(data)[start:]
@@ -0,0 +1,166 @@
+"""
+stats.py - Constant-memory, mergeable statistics for simulation results.
+
+SimulationStats folds rounds in one at a time (or a NumPy chunk at a time) without
+keeping per-round payouts: the mean and variance of the net result use Welford's
+algorithm, outcomes are counted, and bankroll deltas go into a fixed-bin histogram.
+Partial results from separate workers merge into exactly the statistics of the
+combined run (Chan et al.'s parallel update for the variance).
+"""
+
+import math
+
+import numpy as np
+
+from engine import WIN, LOSE, PUSH, BLACKJACK, BUST, SURRENDERED
+
+OUTCOMES = (WIN, LOSE, PUSH, BLACKJACK, BUST, SURRENDERED)
+
+
+class SimulationStats:
+    """
+    Streaming aggregate of settled rounds.
+
+    Attributes:
+        rounds (int): Number of rounds aggregated.
+        mean (float): Mean net result per round.
+        m2 (float): Sum of squared deviations of the net result from the mean.
+        total_bet (float): Sum of the initial bets.
+        outcomes (dict): Number of hands settled with each engine outcome.
+        splits (int): Number of rounds where the player split.
+        doubles (int): Number of rounds where the player doubled down.
+        bin_min (float): Lower edge of the histogram.
+        bin_width (float): Width of each histogram bin.
+        histogram (list): Count of rounds per net-result bin; the first and last
+            bins also collect everything below and above the histogram range.
+    """
+
+    def __init__(self, bin_min=-8.0, bin_max=8.0, bin_width=0.5):
+        """
+        Initialize empty statistics.
+
+        Args:
+            bin_min (float): Lower edge of the net-result histogram (default is -8).
+            bin_max (float): Upper edge of the net-result histogram (default is 8).
+            bin_width (float): Width of each histogram bin (default is 0.5).
+        """
+        self.rounds = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total_bet = 0.0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.splits = 0
+        self.doubles = 0
+        self.bin_min = bin_min
+        self.bin_width = bin_width
+        self.histogram = [0] * max(1, int(round((bin_max - bin_min) / bin_width)))
+
+    def add(self, result):
+        """
+        Fold in one settled round.
+
+        Args:
+            result (RoundResult): The round, as returned by the round engine.
+        """
+        net = result.net
+        self.rounds += 1
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self.m2 += delta * (net - self.mean)
+        self.total_bet += result.bet
+
+        outcomes = self.outcomes
+        for outcome in result.outcomes:
+            outcomes[outcome] += 1
+        if result.split:
+            self.splits += 1
+        if result.doubled:
+            self.doubles += 1
+
+        index = int((net - self.bin_min) // self.bin_width)
+        self.histogram[min(max(index, 0), len(self.histogram) - 1)] += 1
+
+    def add_batch(self, nets, bets, outcomes, splits=0, doubles=0):
+        """
+        Fold in a chunk of rounds held in NumPy arrays.
+
+        Args:
+            nets (numpy.ndarray): Net result of each round.
+            bets (float or numpy.ndarray): Initial bet of each round (or of all of them).
+            outcomes (dict): Number of hands settled with each engine outcome.
+            splits (int): Number of rounds in the chunk where the player split.
+            doubles (int): Number of rounds in the chunk where the player doubled down.
+        """
+        n = len(nets)
+        if not n:
+            return
+        chunk = SimulationStats.__new__(SimulationStats)
+        chunk.rounds = n
+        chunk.mean = float(nets.mean())
+        chunk.m2 = float(np.square(nets - chunk.mean).sum())
+        chunk.total_bet = float(np.sum(bets)) if np.ndim(bets) else float(bets) * n
+        chunk.outcomes = outcomes
+        chunk.splits = int(splits)
+        chunk.doubles = int(doubles)
+        chunk.bin_min = self.bin_min
+        chunk.bin_width = self.bin_width
+        bins = len(self.histogram)
+        indexes = np.clip(np.floor((nets - self.bin_min) / self.bin_width), 0, bins - 1)
+        chunk.histogram = np.bincount(indexes.astype(np.intp), minlength=bins).tolist()
+        self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Fold in the statistics of another (e.g. a worker's) partial run.
+
+        Args:
+            other (SimulationStats): Statistics with the same histogram bins.
+        """
+        if (other.bin_min, other.bin_width, len(other.histogram)) != \
+                (self.bin_min, self.bin_width, len(self.histogram)):
+            raise ValueError("Cannot merge statistics with different histogram bins.")
+        rounds = self.rounds + other.rounds
+        if rounds:
+            delta = other.mean - self.mean
+            self.mean += delta * other.rounds / rounds
+            self.m2 += other.m2 + delta * delta * self.rounds * other.rounds / rounds
+        self.rounds = rounds
+        self.total_bet += other.total_bet
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+        self.splits += other.splits
+        self.doubles += other.doubles
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    @property
+    def variance(self):
+        """Sample variance of the net result per round."""
+        return self.m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    @property
+    def std_error(self):
+        """Standard error of the mean net result per round."""
+        return math.sqrt(self.variance / self.rounds) if self.rounds else 0.0
+
+    @property
+    def ev(self):
+        """Expected value per unit of initial bet (total net over total initial bets)."""
+        return self.mean * self.rounds / self.total_bet if self.total_bet else 0.0
+
+    @property
+    def ev_std_error(self):
+        """Standard error of ev, in units of the average initial bet."""
+        return self.std_error * self.rounds / self.total_bet if self.total_bet else 0.0
+
+    def bin_edges(self):
+        """
+        Return the edges of the histogram bins.
+
+        Returns:
+            list: len(histogram) + 1 edges.
+        """
+        return [self.bin_min + i * self.bin_width for i in range(len(self.histogram) + 1)]
+
+    def __repr__(self):
+        return (f"SimulationStats(rounds={self.rounds}, ev={self.ev:.6f} "
+                f"± {self.ev_std_error:.6f}, variance={self.variance:.4f})")
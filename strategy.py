@@ -0,0 +1,186 @@
+"""
+strategy.py - Ready-made decision functions for the headless round engine.
+
+A strategy is called as ``strategy(hand, upcard, actions)`` and returns one of
+the action letters in ``actions`` (see engine.RoundEngine).
+
+Table-driven strategies are written like printed strategy charts: each row maps
+a hand total (or a pair's card value) to ten letters, one per dealer upcard
+2, 3, ..., 10, A:
+
+    H  hit                          S  stand
+    D  double, otherwise hit        X  double, otherwise stand
+    R  surrender, otherwise hit     T  surrender, otherwise stand
+    P  split
+
+The strategies here are small callable classes rather than closures, so they can
+be pickled and sent to worker processes (see parallel.simulate).
+"""
+
+from collections import namedtuple
+
+from deck import CARD_VALUES
+from engine import HIT, STAND, DOUBLE, SPLIT, SURRENDER, INSURE, DECLINE, INSURANCE_ACTIONS
+
+
+StrategyTable = namedtuple("StrategyTable", ["hard", "soft", "pairs"])
+StrategyTable.__doc__ = """
+A strategy chart.
+
+Attributes:
+    hard (dict): Hard total (4-21) -> row of ten action letters.
+    soft (dict): Soft total (12-21) -> row of ten action letters.
+    pairs (dict): Pair card value (2-11) -> row of ten action letters, or None
+        to never split. Letters other than 'P' fall back to the total rows.
+"""
+
+# Multi-deck basic strategy for dealer stands on soft 17, no double after split
+BASIC_STRATEGY = StrategyTable(
+    hard={
+        4: "HHHHHHHHHH", 5: "HHHHHHHHHH", 6: "HHHHHHHHHH", 7: "HHHHHHHHHH",
+        8: "HHHHHHHHHH", 9: "HDDDDHHHHH", 10: "DDDDDDDDHH", 11: "DDDDDDDDDH",
+        12: "HHSSSHHHHH", 13: "SSSSSHHHHH", 14: "SSSSSHHHHH", 15: "SSSSSHHHRH",
+        16: "SSSSSHHRRR", 17: "SSSSSSSSSS", 18: "SSSSSSSSSS", 19: "SSSSSSSSSS",
+        20: "SSSSSSSSSS", 21: "SSSSSSSSSS",
+    },
+    soft={
+        12: "HHHHHHHHHH", 13: "HHHDDHHHHH", 14: "HHHDDHHHHH", 15: "HHDDDHHHHH",
+        16: "HHDDDHHHHH", 17: "HDDDDHHHHH", 18: "SXXXXSSHHH", 19: "SSSSSSSSSS",
+        20: "SSSSSSSSSS", 21: "SSSSSSSSSS",
+    },
+    pairs={
+        2: "HHPPPPHHHH", 3: "HHPPPPHHHH", 4: "HHHHHHHHHH", 5: "DDDDDDDDHH",
+        6: "HPPPPHHHHH", 7: "PPPPPPHHHH", 8: "PPPPPPPPPP", 9: "PPPPPSPPSS",
+        10: "SSSSSSSSSS", 11: "PPPPPPPPPP",
+    },
+)
+
+
+# Chart letter -> (preferred action, fallback action)
+_LETTERS = {
+    'H': (HIT, HIT), 'S': (STAND, STAND), 'D': (DOUBLE, HIT),
+    'X': (DOUBLE, STAND), 'R': (SURRENDER, HIT), 'T': (SURRENDER, STAND),
+    'P': (SPLIT, HIT),
+}
+
+
+class StandOn:
+    """
+    A strategy that hits below a fixed total and stands otherwise.
+
+    It never doubles, splits, surrenders or insures.
+
+    Attributes:
+        threshold (int): The lowest total the strategy stands on.
+    """
+
+    __slots__ = ("threshold",)
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def __call__(self, hand, upcard, actions):
+        if actions == INSURANCE_ACTIONS:
+            return DECLINE
+        return HIT if hand.calculate_hand() < self.threshold else STAND
+
+
+class TableStrategy:
+    """
+    A strategy that plays from a strategy chart.
+
+    Insurance is always declined. Letters whose action is not currently allowed
+    fall back as their name says (e.g. 'D' hits once doubling is no longer possible).
+
+    Attributes:
+        table (StrategyTable): The chart to play.
+    """
+
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __call__(self, hand, upcard, actions):
+        if actions == INSURANCE_ACTIONS:
+            return DECLINE
+        hard, soft, pairs = self.table
+        column = CARD_VALUES[upcard] - 2
+        if pairs and SPLIT in actions and pairs[CARD_VALUES[hand.hand[0]]][column] == 'P':
+            return SPLIT
+        row = soft[hand.total] if hand.is_soft() else hard[hand.total]
+        preferred, fallback = _LETTERS[row[column]]
+        return preferred if preferred in actions else fallback
+
+
+class CountInsurance:
+    """
+    A strategy that takes insurance whenever the true count reaches a threshold.
+
+    With Hi-Lo, insuring at a true count of +3 or more is the most valuable index play.
+
+    Attributes:
+        base (callable): The strategy used for every other decision.
+        count (counting.RunningCount): The running count of the shoe being dealt.
+        threshold (float): Lowest true count at which insurance is taken.
+    """
+
+    __slots__ = ("base", "count", "threshold")
+
+    def __init__(self, base, count, threshold=3):
+        self.base = base
+        self.count = count
+        self.threshold = threshold
+
+    def __call__(self, hand, upcard, actions):
+        if actions == INSURANCE_ACTIONS:
+            return INSURE if self.count.true_count() >= self.threshold else DECLINE
+        return self.base(hand, upcard, actions)
+
+
+def stand_on(threshold):
+    """
+    Build a strategy that hits below a fixed total and stands otherwise.
+
+    Args:
+        threshold (int): The lowest total the strategy stands on.
+
+    Returns:
+        StandOn: The strategy. It never doubles, splits, surrenders or insures.
+    """
+    return StandOn(threshold)
+
+
+def table_strategy(table):
+    """
+    Build a strategy that plays from a strategy chart.
+
+    Args:
+        table (StrategyTable): The chart to play.
+
+    Returns:
+        TableStrategy: The strategy.
+    """
+    return TableStrategy(table)
+
+
+def count_insurance(base, count, threshold=3):
+    """
+    Wrap a strategy to take insurance whenever the true count reaches a threshold.
+
+    Args:
+        base (callable): The strategy used for every other decision.
+        count (counting.RunningCount): The running count of the shoe being dealt.
+        threshold (float): Lowest true count at which insurance is taken (default is 3).
+
+    Returns:
+        CountInsurance: The strategy.
+    """
+    return CountInsurance(base, count, threshold)
+
+
+# Play like the dealer: hit to 17, no other options
+mimic_dealer = stand_on(17)
+
+# Textbook basic strategy (see BASIC_STRATEGY)
+basic_strategy = table_strategy(BASIC_STRATEGY)
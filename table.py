@@ -0,0 +1,140 @@
+"""
+table.py - Multi-seat Blackjack tables sharing one shoe and one dealer hand.
+
+A Table seats up to seven players, each with their own strategy, bankroll and bet.
+Every round deals all seats from the same shoe in casino order, lets each seat
+play its hands in turn (engine.RoundEngine.play_seat), then plays the dealer's
+hand once and settles every seat against it. The initial cards come out of the
+shoe in one slice, the reshuffle check, the dealer's draw and the settlement
+table (CompiledRules.hand_nets) are shared, and batch play settles open seats
+without building a RoundResult each, so a simulated seat costs little more than
+its own decisions.
+"""
+
+from collections import namedtuple
+
+from engine import RoundEngine, RoundResult
+from player import Player
+
+MAX_SEATS = 7
+
+Seat = namedtuple("Seat", ["player", "strategy", "bet"])
+Seat.__doc__ = """
+One seat at a table.
+
+Attributes:
+    player (Player): The seat's player, holding its cards and bankroll.
+    strategy (callable): Decision function, see engine.RoundEngine.
+    bet (float or callable): The seat's bet on every round, or a bet-sizing hook
+        called as ``bet(table)`` before each round.
+"""
+
+
+class Table:
+    """
+    A multi-seat table: one shoe, one dealer, up to MAX_SEATS seats.
+
+    Attributes:
+        seats (list): The seats, in the order they are dealt to and play.
+        engine (RoundEngine): The engine holding the shoe, dealer and rules.
+        deck (Shoe): The shared shoe (the engine's).
+        dealer (Player): The dealer (the engine's).
+    """
+
+    def __init__(self, seats, shoe=None, rules=None):
+        """
+        Initialize the table.
+
+        Args:
+            seats (list): Seat tuples, first base first.
+            shoe (Shoe): The shoe to deal from (default is a fresh Shoe with the
+                rules' number of decks).
+            rules (RuleSet): The table rules (default is RuleSet()).
+        """
+        if not 1 <= len(seats) <= MAX_SEATS:
+            raise ValueError(f"A table has between 1 and {MAX_SEATS} seats.")
+        self.seats = list(seats)
+        self.engine = RoundEngine(player=self.seats[0].player, dealer=Player("Dealer"),
+                                  shoe=shoe, rules=rules)
+        self.deck = self.engine.deck
+        self.dealer = self.engine.dealer
+
+    def deal(self):
+        """
+        Start a new round: one card to each seat then the dealer, twice.
+
+        The shoe is reshuffled first if the cut card came out in the previous round.
+        """
+        deck = self.deck
+        if deck.needs_shuffle():
+            deck.reshuffle()
+        deck.start_round()
+        seats = len(self.seats)
+        cards = deck.deal_cards(2 * seats + 2)
+        for i, seat in enumerate(self.seats):
+            seat.player.set_hand(cards[i::seats + 1])
+        self.dealer.set_hand(cards[seats::seats + 1])
+
+    def play_round(self):
+        """
+        Play one round at every seat and apply the results to their bankrolls.
+
+        Returns:
+            tuple: The RoundResult of each seat, in seat order.
+        """
+        engine = self.engine
+        rounds, dealer_total = self._play()
+        results = tuple(seat_round if type(seat_round) is RoundResult
+                        else engine.settle(seat_round, dealer_total) for seat_round in rounds)
+        for seat, result in zip(self.seats, results):
+            seat.player.bankroll += result.net
+        return results
+
+    def play_rounds(self, rounds):
+        """
+        Play many rounds back to back with no I/O (batch mode).
+
+        Open seats are settled straight from the compiled per-dealer-total payouts,
+        without building a RoundResult per seat.
+
+        Args:
+            rounds (int): Number of rounds to play.
+
+        Returns:
+            list: The total bankroll change of each seat, in seat order.
+        """
+        players = [seat.player for seat in self.seats]
+        totals = [0.0] * len(players)
+        compiled = self.engine.compiled
+        dealer = self.dealer
+        play = self._play
+        for _ in range(rounds):
+            seat_rounds, dealer_total = play()
+            # Without a peek, a dealer Blackjack beats every hand still open
+            nets = compiled.hand_nets[dealer_total] if not dealer.is_blackjack() else None
+            for i, seat_round in enumerate(seat_rounds):
+                net = seat_round.net
+                if type(seat_round) is not RoundResult:
+                    if nets is None:
+                        net -= sum(seat_round.wagers)
+                    else:
+                        for total, wager in zip(seat_round.totals, seat_round.wagers):
+                            net += nets[total] * wager
+                players[i].bankroll += net
+                totals[i] += net
+        return totals
+
+    def _play(self):
+        """Deal and play every seat, then the dealer once; return the seat rounds and dealer total."""
+        engine = self.engine
+        seats = self.seats
+        bets = [seat.bet(self) if callable(seat.bet) else seat.bet for seat in seats]
+        self.deal()
+
+        play_seat = engine.play_seat
+        rounds = [play_seat(seat.player, bet, seat.strategy) for seat, bet in zip(seats, bets)]
+        # The dealer only draws if some hand is still standing
+        for seat_round in rounds:
+            if type(seat_round) is not RoundResult and min(seat_round.totals) <= 21:
+                return rounds, engine.dealer_turn()
+        return rounds, self.dealer.calculate_hand()
@@ -0,0 +1,68 @@
+"""
+Shared fixtures of the test suite: stacked shoes and scripted strategies.
+
+The modules live at the repository root, which is put on the import path here so
+``python -m pytest`` works from any directory.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck import Shoe, encode_card  # noqa: E402
+from engine import RoundEngine, DECLINE, INSURANCE_ACTIONS  # noqa: E402
+from player import Player  # noqa: E402
+
+
+def stacked_shoe(*ranks):
+    """
+    Build a shoe that deals the given ranks in order, all spades.
+
+    The round engine deals player, dealer, player, dealer, then every draw in turn.
+
+    Args:
+        *ranks: Card ranks in dealing order, e.g. 10, 'A', 'K'.
+
+    Returns:
+        Shoe: The shoe, which never reaches its cut card.
+    """
+    return Shoe(1, penetration=1.0, predefined_cards=[encode_card(rank, '♠') for rank in reversed(ranks)])
+
+
+def stacked_engine(rules, *ranks):
+    """
+    Build a round engine dealing from a stacked shoe.
+
+    Args:
+        rules (RuleSet): The table rules.
+        *ranks: Card ranks in dealing order, see stacked_shoe.
+
+    Returns:
+        RoundEngine: The engine.
+    """
+    return RoundEngine(player=Player("Player", 0.0), rules=rules, shoe=stacked_shoe(*ranks))
+
+
+class Scripted:
+    """
+    A strategy that plays a fixed list of decisions and records what it was offered.
+
+    Insurance offers are declined unless ``insure`` is set, and are recorded too.
+
+    Attributes:
+        answers (list): Decisions still to play, in order.
+        offers (list): Action strings offered so far, in order.
+        insure (str): Answer to the insurance offer.
+    """
+
+    def __init__(self, *answers, insure=DECLINE):
+        self.answers = list(answers)
+        self.offers = []
+        self.insure = insure
+
+    def __call__(self, hand, upcard, actions):
+        self.offers.append(actions)
+        if actions == INSURANCE_ACTIONS:
+            return self.insure
+        return self.answers.pop(0)
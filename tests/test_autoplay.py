@@ -0,0 +1,67 @@
+"""Fast-forward play in the background."""
+
+from conftest import stacked_engine
+
+from autoplay import AutoPlayer
+from deck import Shoe
+from engine import RoundEngine, HIT, STAND, DOUBLE, SPLIT, INSURE, INSURANCE_ACTIONS
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+from strategy import basic_strategy
+
+
+class Reckless:
+    """Insure, double and split whenever offered, otherwise hit to 17; records the offers."""
+
+    def __init__(self):
+        self.offers = []
+
+    def __call__(self, hand, upcard, actions):
+        self.offers.append(actions)
+        if actions == INSURANCE_ACTIONS:
+            return INSURE
+        for action in (SPLIT, DOUBLE):
+            if action in actions:
+                return action
+        return HIT if hand.calculate_hand() < 17 else STAND
+
+
+def test_doubles_and_splits_are_offered_only_when_covered():
+    # 8-8 against a 6 with 15 left: a split or a double would need another 10
+    engine = stacked_engine(RuleSet(), 8, 6, 8, 10, 10, 10, 10)
+    engine.player.bankroll = 15.0
+    strategy = Reckless()
+    AutoPlayer(engine, strategy, 10.0).run(rounds=1)
+    assert strategy.offers[0] == "hsr"
+    assert engine.player.bankroll == 5.0  # Hits the 16 and busts
+
+
+def test_uncovered_insurance_is_declined_without_asking():
+    engine = stacked_engine(RuleSet(), 10, 'A', 9, 'K')
+    engine.player.bankroll = 14.0
+    strategy = Reckless()
+    AutoPlayer(engine, strategy, 10.0).run(rounds=1)
+    assert strategy.offers == []
+    assert engine.player.bankroll == 4.0
+
+
+def test_the_bankroll_never_goes_negative():
+    rules = RuleSet(max_split_hands=4, double_after_split=True)
+    for seed in range(50):
+        engine = RoundEngine(player=Player("Player", 30.0), rules=rules,
+                             shoe=Shoe(rules.decks, rng=NumpyRNG(seed)))
+        player = AutoPlayer(engine, Reckless(), 10.0)
+        player.run(rounds=500)
+        assert engine.player.bankroll >= 0.0
+        assert player.stats.rounds == 500 or engine.player.bankroll < 10.0
+
+
+def test_a_run_keeps_frames_and_statistics():
+    engine = RoundEngine(player=Player("Player", 1e6), shoe=Shoe(6, rng=NumpyRNG(4)))
+    player = AutoPlayer(engine, basic_strategy, 10.0, redraw_every=100)
+    player.run(rounds=1000)
+    frame = player.frame
+    assert frame.rounds == player.stats.rounds == 1000
+    assert frame.bankroll == engine.player.bankroll
+    assert frame.dealer_hand == bytes(engine.dealer.hand)
@@ -0,0 +1,30 @@
+"""The vectorized batch simulator against the scalar round engine."""
+
+import math
+
+import batch
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+from stats import SimulationStats
+from strategy import BASIC_STRATEGY, table_strategy
+
+
+def test_batch_ev_agrees_with_the_scalar_engine():
+    rounds = 100_000
+    vectorized = batch.simulate(rounds, BASIC_STRATEGY, seed=5)
+    engine = RoundEngine(player=Player("Player", 0.0), rules=RuleSet(),
+                         shoe=Shoe(6, rng=NumpyRNG(5)))
+    strategy = table_strategy(BASIC_STRATEGY)
+    scalar = SimulationStats()
+    for _ in range(rounds):
+        scalar.add(engine.play_round(1.0, strategy))
+
+    assert vectorized.rounds == scalar.rounds == rounds
+    # Four standard errors of the difference, about 2% of the bet
+    tolerance = 4 * math.hypot(vectorized.ev_std_error, scalar.ev_std_error)
+    assert abs(vectorized.ev - scalar.ev) < tolerance
+    assert abs(vectorized.doubles - scalar.doubles) / rounds < 0.005
+    assert abs(vectorized.splits - scalar.splits) / rounds < 0.005
@@ -0,0 +1,46 @@
+"""The benchmark runner and its regression check."""
+
+import json
+import os
+
+import benchmark
+
+
+def test_every_benchmark_runs_or_is_skipped():
+    report = benchmark.run_benchmarks(warmup=0, repeat=1)
+    assert set(report["results"]) == set(benchmark.BENCHMARKS)
+    for name, result in report["results"].items():
+        assert "skipped" in result or result["median"] > 0, name
+
+
+def test_factories_clean_up_what_they_set_up():
+    run, ops, cleanup = benchmark.BENCHMARKS["sprite_atlas_open"]()
+    directory = run.keywords["cache_dir"]
+    run()
+    assert os.path.isdir(directory)
+    cleanup()
+    assert not os.path.exists(directory)
+
+
+def test_compare_flags_only_slowdowns_past_the_threshold():
+    def report(**medians):
+        return {"results": {name: {"median": median} for name, median in medians.items()}}
+
+    baseline = report(fast=1.0, steady=1.0, slow=1.0, gone=1.0)
+    new = report(fast=0.5, steady=1.05, slow=1.2, added=1.0)
+    assert benchmark.compare(new, baseline, threshold=0.10) == [("slow", 1.0, 1.2, 1.2)]
+    new["results"]["slow"] = {"skipped": "no display"}
+    assert benchmark.compare(new, baseline) == []
+
+
+def test_main_exits_with_failure_on_a_regression(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    args = ["can_split", "--repeat", "1", "--warmup", "0", "--output", os.devnull,
+            "--baseline", baseline]
+    assert benchmark.main(args + ["--update-baseline"]) == 0
+    with open(baseline) as f:
+        report = json.load(f)
+    report["results"]["can_split"]["median"] /= 1000  # A baseline no run can match
+    with open(baseline, "w") as f:
+        json.dump(report, f)
+    assert benchmark.main(args) == 1
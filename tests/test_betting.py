@@ -0,0 +1,58 @@
+"""Betting policies replayed over recorded traces."""
+
+import numpy as np
+import pytest
+
+from betting import TRACE_DTYPE, CountRamp, Flat, Martingale, Paroli, evaluate, record_trace
+from strategy import basic_strategy
+
+
+def _trace(nets, true_counts=0.0):
+    trace = np.zeros(len(nets), dtype=TRACE_DTYPE)
+    trace["net"] = nets
+    trace["true_count"] = true_counts
+    return trace
+
+
+def test_bankroll_never_goes_below_zero():
+    # Every round is a lost double after a split: four times the bet
+    result = evaluate(Martingale(unit=10.0), _trace([-4.0] * 10), sessions=1000, rounds=50,
+                      bankroll=100.0, workers=1, block_size=250)
+    assert result.risk_of_ruin == 1.0
+    assert result.stats.mean == pytest.approx(-100.0)
+    assert result.stats.histogram[0] == 1000  # Every session ends at exactly -bankroll
+
+
+def test_flat_bets_scale_the_trace():
+    result = evaluate(Flat(unit=10.0), _trace([1.0, -1.0, 1.5, 0.0]), sessions=400, rounds=400,
+                      bankroll=1000.0, workers=1)
+    assert result.risk_of_ruin == 0.0
+    assert result.stats.mean == pytest.approx(10.0 * 100 * 1.5)  # 100 times round the trace
+    assert result.stats.ev == pytest.approx(1.5 / 4)
+
+
+def test_progressions_follow_wins_and_losses():
+    martingale, paroli = Martingale(unit=1.0), Paroli(unit=1.0, streak=2)
+    state = martingale.start(1)
+    for net in (-1.0, -1.0):
+        state = martingale.update(state, np.array([net]))
+    assert martingale.bets(state, None, None).tolist() == [4.0]
+    state = paroli.start(1)
+    bets = []
+    for net in (1.0, 1.0, 1.0):
+        bets.append(paroli.bets(state, None, None)[0])
+        state = paroli.update(state, np.array([net]))
+    assert bets == [1.0, 2.0, 1.0]
+
+
+def test_count_ramp_bets_by_true_count():
+    ramp = CountRamp(unit=10.0, ramp=((2, 2), (4, 5)))
+    bets = ramp.bets(ramp.start(5), None, np.array([-3.0, 1.9, 2.0, 3.5, 7.0]))
+    assert bets.tolist() == [10.0, 10.0, 20.0, 20.0, 50.0]
+
+
+def test_trace_is_the_same_for_any_number_of_workers():
+    one, two = (record_trace(basic_strategy, rounds=2000, workers=workers, block_size=500)
+                for workers in (1, 2))
+    assert len(one) == 2000
+    assert np.array_equal(one, two)
@@ -0,0 +1,66 @@
+"""Paired comparison of strategies on common deals."""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from compare import compare, format_comparison, generate_deals
+from deck import Shoe
+from rules import RuleSet
+from strategy import BASIC_STRATEGY, basic_strategy, mimic_dealer
+
+
+def test_deals_are_reproducible_cards_of_a_shoe():
+    deals = generate_deals(1000, decks=2, seed=4)
+    assert deals.shape == (1000, 64)
+    assert np.array_equal(deals, generate_deals(1000, decks=2, seed=4))
+    assert not np.array_equal(deals, generate_deals(1000, decks=2, seed=5))
+    shoe = Counter(Shoe(2).full_shoe)
+    for row in deals[:50]:
+        assert not Counter(row.tolist()) - shoe
+    out = np.zeros((1000, 64), dtype=np.uint8)
+    assert generate_deals(1000, decks=2, seed=4, out=out) is out
+    assert np.array_equal(out, deals)
+
+
+def test_a_strategy_against_itself_differs_by_nothing():
+    result = compare({"chart": BASIC_STRATEGY, "callable": basic_strategy}, rounds=3000, seed=1,
+                     workers=1, block_size=1000)
+    assert vars(result.stats["chart"]) == vars(result.stats["callable"])
+    difference = result.differences["callable"]
+    assert difference.rounds == 3000
+    assert difference.mean == 0.0
+    assert difference.std_error == 0.0
+
+
+def test_pairing_shrinks_the_standard_error():
+    # Basic strategy without surrender only differs on a few hands
+    no_surrender = BASIC_STRATEGY._replace(hard={**BASIC_STRATEGY.hard, 15: "SSSSSHHHHH",
+                                                 16: "SSSSSHHHHH"})
+    result = compare({"basic": BASIC_STRATEGY, "no surrender": no_surrender}, rounds=20_000,
+                     seed=2, workers=1, block_size=5000)
+    basic, variant = result.stats["basic"], result.stats["no surrender"]
+    independent = (basic.std_error ** 2 + variant.std_error ** 2) ** 0.5
+    difference = result.differences["no surrender"]
+    assert 0.0 < difference.std_error < independent / 5
+    assert difference.mean == pytest.approx(variant.mean - basic.mean)
+    assert "no surrender" in format_comparison(result)
+
+
+def test_results_depend_on_the_deals_not_on_the_workers():
+    strategies = {"basic": basic_strategy, "dealer": mimic_dealer}
+    rules = RuleSet(decks=2)
+    one, two = (compare(strategies, rounds=4000, rules=rules, seed=6, workers=workers,
+                        block_size=1000) for workers in (1, 2))
+    reused = compare(strategies, rules=rules, workers=1, block_size=1000,
+                     deals=generate_deals(4000, decks=2, seed=6))
+    for result in (two, reused):
+        for name in strategies:
+            assert vars(result.stats[name]) == vars(one.stats[name])
+        assert vars(result.differences["dealer"]) == vars(one.differences["dealer"])
+
+
+def test_a_comparison_needs_two_strategies():
+    with pytest.raises(ValueError):
+        compare({"basic": basic_strategy}, rounds=10)
@@ -0,0 +1,52 @@
+"""Running counts kept by the shoe."""
+
+import pytest
+
+from counting import HI_LO, KO, OMEGA_II, RunningCount
+from deck import CARD_VALUES, Shoe
+from engine import RoundEngine
+from player import Player
+from rng import NumpyRNG
+from strategy import basic_strategy
+
+
+def _recount(system, cards, initial=0):
+    """Count cards from scratch."""
+    return initial + sum(system.tags[CARD_VALUES[card] - 2] for card in cards)
+
+
+def test_running_count_matches_a_recount_of_the_dealt_cards():
+    shoe = Shoe(6, penetration=1.0, rng=NumpyRNG(4))
+    counts = [RunningCount(system, shoe) for system in (HI_LO, KO, OMEGA_II)]
+    dealt = []
+    for _ in range(200):
+        dealt.append(shoe.deal_card())
+    for count in counts:
+        assert count.running == _recount(count.system, dealt, count.initial)
+
+
+def test_counts_over_a_whole_shoe():
+    shoe = Shoe(6, penetration=1.0, rng=NumpyRNG(5))
+    hi_lo, ko = RunningCount(HI_LO, shoe), RunningCount(KO, shoe)
+    assert ko.initial == -20
+    shoe.deal_cards(len(shoe.cards))
+    assert hi_lo.running == 0  # Balanced
+    assert ko.running == 4  # Unbalanced: +4 per deck from -4 * (decks - 1)
+    shoe.reshuffle()
+    assert (hi_lo.running, ko.running) == (0, -20)
+
+
+def test_true_count_divides_by_the_decks_left():
+    shoe = Shoe(6, penetration=1.0, rng=NumpyRNG(6))
+    count = RunningCount(HI_LO, shoe)
+    shoe.deal_cards(4 * 52)
+    assert count.true_count() == pytest.approx(count.running / 2)
+
+
+def test_engine_rounds_keep_the_count():
+    engine = RoundEngine(player=Player("Player", 0.0), shoe=Shoe(6, rng=NumpyRNG(7)))
+    count = RunningCount(HI_LO, engine.deck)
+    for _ in range(300):
+        engine.play_round(1.0, basic_strategy)
+        # Hi-Lo is balanced: the dealt cards count the opposite of those left
+        assert count.running == -_recount(HI_LO, engine.deck.cards)
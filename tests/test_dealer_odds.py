@@ -0,0 +1,31 @@
+"""Exact dealer final-total distributions."""
+
+import pytest
+
+from dealer_odds import dealer_table, shoe_composition
+from engine import BLACKJACK, BUST
+
+
+@pytest.mark.parametrize("decks", [1, 6])
+@pytest.mark.parametrize("no_blackjack", [False, True])
+@pytest.mark.parametrize("hit_soft_17", [False, True])
+def test_distributions_sum_to_one(decks, no_blackjack, hit_soft_17):
+    table = dealer_table(shoe_composition(decks), no_blackjack, hit_soft_17)
+    assert sorted(table) == list(range(2, 12))
+    for distribution in table.values():
+        assert sum(distribution.values()) == pytest.approx(1.0, abs=1e-12)
+        assert min(distribution.values()) >= 0.0
+        if no_blackjack:
+            assert distribution[BLACKJACK] == 0.0
+
+
+def test_ten_up_blackjack_is_the_chance_of_an_ace_underneath():
+    table = dealer_table(shoe_composition(6))
+    assert table[10][BLACKJACK] == pytest.approx(24 / 311)
+    assert table[6][BLACKJACK] == 0.0
+
+
+def test_hitting_soft_17_busts_more_often_behind_a_six():
+    stand, hit = (dealer_table(shoe_composition(6), hit_soft_17=h17)[6] for h17 in (False, True))
+    assert hit[17] < stand[17]
+    assert hit[BUST] > stand[BUST]
@@ -0,0 +1,66 @@
+"""Dealing from the shoe."""
+
+from collections import Counter
+
+from counting import HI_LO, OMEGA_II, RunningCount
+from deck import Shoe
+from engine import RoundEngine, HIT
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+
+
+def test_cut_card_triggers_a_reshuffle():
+    shoe = Shoe(1, penetration=0.5, rng=NumpyRNG(0))
+    while not shoe.needs_shuffle():
+        shoe.deal_card()
+    assert len(shoe.cards) == 26
+    shoe.reshuffle()
+    assert sorted(shoe.cards) == sorted(shoe.full_shoe)
+
+
+def test_running_out_mid_round_reshuffles_only_the_discards():
+    shoe = Shoe(1, penetration=1.0, rng=NumpyRNG(3))
+    count = RunningCount(HI_LO, shoe)
+    for _ in range(42):
+        shoe.deal_card()
+    shoe.start_round()
+    in_play = bytearray(shoe.deal_card() for _ in range(16))  # 10 left, then 6 more
+    assert len(shoe.cards) == 52 - 16
+    assert Counter(shoe.cards + in_play) == Counter(shoe.full_shoe)
+    assert count.running == sum(count.weights[card] for card in in_play)
+
+
+def _hit_to_bust(hand, upcard, actions):
+    """Hit while allowed, decline insurance."""
+    return HIT if HIT in actions else actions[-1]
+
+
+def test_a_round_that_exhausts_the_shoe_never_deals_a_card_twice():
+    for seed in range(20):
+        shoe = Shoe(1, penetration=1.0, rng=NumpyRNG(seed))
+        del shoe.cards[:-4]  # Only the deal is left; the first hit runs the shoe out
+        engine = RoundEngine(player=Player("Player", 0.0), rules=RuleSet(), shoe=shoe)
+        engine.play_round(10.0, _hit_to_bust)
+        dealt = Counter(engine.player.hand) + Counter(engine.dealer.hand)
+        assert max(dealt.values()) == 1
+        assert not dealt & Counter(shoe.cards)
+
+
+def test_bulk_deal_matches_single_deals():
+    shoes = [Shoe(6, rng=NumpyRNG(1)) for _ in range(2)]
+    counts = [[RunningCount(HI_LO, shoe), RunningCount(OMEGA_II, shoe)] for shoe in shoes]
+    single, bulk = shoes
+    for number in (4, 1, 16, 2, 9):
+        assert bulk.deal_cards(number) == bytearray(single.deal_card() for _ in range(number))
+        assert [count.running for count in counts[0]] == [count.running for count in counts[1]]
+    assert single.cards == bulk.cards
+
+
+def test_bulk_deal_past_the_end_reshuffles_like_single_deals():
+    shoes = [Shoe(1, rng=NumpyRNG(2)) for _ in range(2)]
+    single, bulk = shoes
+    for shoe in shoes:
+        del shoe.cards[3:]
+    assert bulk.deal_cards(6) == bytearray(single.deal_card() for _ in range(6))
+    assert single.cards == bulk.cards
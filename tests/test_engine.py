@@ -0,0 +1,144 @@
+"""Rounds of the headless engine on stacked shoes."""
+
+import pytest
+from conftest import Scripted, stacked_engine
+
+from deck import Shoe
+from engine import (RoundEngine, SteppedRound, HIT, STAND, DOUBLE, SPLIT, SURRENDER, INSURE,
+                    INSURANCE_ACTIONS, WIN, LOSE, PUSH, BLACKJACK, BUST, SURRENDERED)
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+from strategy import BASIC_STRATEGY, table_strategy
+
+
+def test_natural_pays_three_to_two():
+    engine = stacked_engine(RuleSet(), 'A', 9, 'K', 7)
+    result = engine.play_round(10.0, Scripted())
+    assert result.outcomes == (BLACKJACK,)
+    assert result.net == 15.0
+    assert engine.player.bankroll == 15.0
+
+
+def test_natural_against_dealer_natural_pushes():
+    engine = stacked_engine(RuleSet(), 'A', 'A', 'K', 'K')
+    strategy = Scripted()
+    result = engine.play_round(10.0, strategy)
+    assert result.outcomes == (PUSH,)
+    assert result.net == 0.0
+    assert strategy.offers == [INSURANCE_ACTIONS]
+
+
+def test_insurance_pays_two_to_one_against_a_dealer_blackjack():
+    engine = stacked_engine(RuleSet(), 10, 'A', 9, 'K')
+    result = engine.play_round(10.0, Scripted(insure=INSURE))
+    assert result.insured
+    assert result.outcomes == (LOSE,)
+    assert result.net == 0.0  # +10 on the insurance, -10 on the hand
+
+
+def test_insurance_is_lost_without_a_dealer_blackjack():
+    # Dealer A-7 is a soft 18 and stands; the player's 19 wins
+    engine = stacked_engine(RuleSet(), 10, 'A', 9, 7)
+    result = engine.play_round(10.0, Scripted(STAND, insure=INSURE))
+    assert result.insured
+    assert result.outcomes == (WIN,)
+    assert result.net == 5.0
+
+
+def test_peek_ends_the_round_before_any_decision():
+    engine = stacked_engine(RuleSet(), 10, 10, 6, 'A')
+    strategy = Scripted()
+    result = engine.play_round(10.0, strategy)
+    assert result.outcomes == (LOSE,)
+    assert result.net == -10.0
+    assert result.dealer_total == 21
+    assert strategy.offers == []
+
+
+def test_surrender_returns_half_the_bet():
+    engine = stacked_engine(RuleSet(), 10, 10, 6, 7)
+    result = engine.play_round(10.0, Scripted(SURRENDER))
+    assert result.outcomes == (SURRENDERED,)
+    assert result.net == -5.0
+
+
+def test_double_takes_one_card_at_twice_the_bet():
+    engine = stacked_engine(RuleSet(), 6, 9, 5, 8, 'K')
+    result = engine.play_round(10.0, Scripted(DOUBLE))
+    assert result.doubled
+    assert result.player_totals == (21,)
+    assert result.dealer_total == 17
+    assert result.net == 20.0
+
+
+def test_bust_loses_without_the_dealer_drawing():
+    engine = stacked_engine(RuleSet(), 10, 6, 6, 10, 'K', 5)
+    result = engine.play_round(10.0, Scripted(HIT))
+    assert result.outcomes == (BUST,)
+    assert result.dealer_total == 16
+    assert len(engine.deck.cards) == 1
+
+
+def test_unavailable_action_is_rejected():
+    engine = stacked_engine(RuleSet(), 10, 6, 2, 10, 3)
+    with pytest.raises(ValueError):
+        engine.play_round(10.0, Scripted(HIT, DOUBLE))
+
+
+def test_batch_play_matches_round_by_round_play():
+    strategy = table_strategy(BASIC_STRATEGY)
+    for rules in (RuleSet(), RuleSet(dealer_peek=False, hit_soft_17=True)):
+        by_round, batch = (RoundEngine(player=Player("Player", 0.0), rules=rules,
+                                       shoe=Shoe(rules.decks, rng=NumpyRNG(7))) for _ in range(2))
+        total = sum(by_round.play_round(10.0, strategy).net for _ in range(5000))
+        assert batch.play_rounds(5000, 10.0, strategy) == total
+        assert batch.player.bankroll == by_round.player.bankroll
+        assert batch.deck.cards == by_round.deck.cards
+
+
+def test_stepped_round_waits_for_each_decision():
+    engine = stacked_engine(RuleSet(), 10, 9, 2, 8, 3, 5)
+    engine.player.bankroll = 100.0
+    game_round = SteppedRound(engine, 10.0)
+    assert game_round.pending.actions == "hsdr"
+    assert list(game_round.pending.hand.hand) == list(engine.player.hand)
+    game_round.act(HIT)
+    assert game_round.pending.hand.total == 15
+    game_round.act(HIT)
+    assert game_round.pending.hand.total == 20
+    game_round.act(STAND)
+    assert game_round.pending is None
+    assert game_round.result.outcomes == (WIN,)
+    assert engine.player.bankroll == 110.0
+
+
+def test_stepped_round_matches_the_engine():
+    strategy = table_strategy(BASIC_STRATEGY)
+    rules = RuleSet(max_split_hands=4, double_after_split=True)
+    stepped, direct = (RoundEngine(player=Player("Player", 1e9), rules=rules,
+                                   shoe=Shoe(rules.decks, rng=NumpyRNG(11))) for _ in range(2))
+    for _ in range(2000):
+        game_round = SteppedRound(stepped, 10.0)
+        while game_round.pending is not None:
+            game_round.act(strategy(*game_round.pending))
+        assert game_round.result == direct.play_round(10.0, strategy)
+    assert stepped.player.bankroll == direct.player.bankroll
+
+
+def test_stepped_round_offers_only_what_the_bankroll_covers():
+    # 8-8 against a 6: splitting needs another 10 beyond the bet
+    engine = stacked_engine(RuleSet(), 8, 6, 8, 10, 10, 10, 10)
+    engine.player.bankroll = 15.0
+    game_round = SteppedRound(engine, 10.0)
+    assert game_round.pending.actions == "hsr"
+    with pytest.raises(ValueError):
+        game_round.act(SPLIT)
+
+
+def test_stepped_round_declines_insurance_it_cannot_cover():
+    engine = stacked_engine(RuleSet(), 10, 'A', 9, 'K')
+    engine.player.bankroll = 14.0
+    game_round = SteppedRound(engine, 10.0)
+    assert game_round.pending is None
+    assert not game_round.result.insured
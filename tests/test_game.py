@@ -0,0 +1,24 @@
+"""The terminal game."""
+
+import game
+from renderers import NullRenderer
+from rules import RuleSet
+from strategy import BASIC_STRATEGY
+
+
+def test_advisor_is_loaded_on_first_use_once_per_rules(monkeypatch):
+    loads = []
+
+    def basic_chart(rules):
+        loads.append(rules)
+        return BASIC_STRATEGY
+
+    monkeypatch.setattr(game, "basic_chart", basic_chart)
+    monkeypatch.setattr(game, "_ADVISORS", {})
+    games = [game.BlackjackGame(renderer=NullRenderer()) for _ in range(3)]
+    assert loads == []
+    assert games[0].advisor is games[1].advisor is games[2].advisor
+    assert loads == [RuleSet()]
+    h17 = game.BlackjackGame(RuleSet(hit_soft_17=True), renderer=NullRenderer())
+    assert h17.advisor is not games[0].advisor
+    assert loads == [RuleSet(), RuleSet(hit_soft_17=True)]
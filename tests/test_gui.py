@@ -0,0 +1,126 @@
+"""The GUI: rounds through the engine (skipped where Tk cannot open a window) and hand views."""
+
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+from conftest import stacked_shoe
+
+tk = pytest.importorskip("tkinter")
+
+import gui  # noqa: E402
+from deck import encode_card  # noqa: E402
+from engine import DOUBLE, SPLIT, SURRENDER, BUST, WIN  # noqa: E402
+from rules import RuleSet, SURRENDER_NONE  # noqa: E402
+from sprites import SpriteCache  # noqa: E402
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk cannot open a window here")
+    root.withdraw()
+    monkeypatch.setattr(gui, "SpriteCache", partial(SpriteCache, cache_dir=str(tmp_path)))
+    monkeypatch.setattr(gui.messagebox, "showinfo", lambda *args, **kwargs: None)
+    monkeypatch.setattr(gui.messagebox, "askyesno", lambda *args, **kwargs: False)
+    app = gui.BlackjackGUI(root)
+    yield app
+    root.destroy()
+
+
+def _deal(app, rules, *ranks):
+    app.game.set_rules(rules)
+    app.game.deck = stacked_shoe(*ranks)
+    app.on_deal()
+    return app.round
+
+
+def test_resplit_and_double_after_split_follow_the_rules(app):
+    rules = RuleSet(max_split_hands=3, double_after_split=True)
+    game_round = _deal(app, rules, 8, 6, 8, 10, 8, 5, 10, 10, 10, 10)
+    app.on_split()
+    assert SPLIT in game_round.pending.actions  # The second 8 can be split again
+    app.on_split()
+    assert DOUBLE in game_round.pending.actions  # 8-5 may double after the split
+    app.bet_entry.delete(0, tk.END)
+    app.bet_entry.insert(0, "500")  # Editing the entry mid-round changes no stake
+    app.on_double()
+    app.on_stand()
+    app.on_stand()
+    result = game_round.result
+    assert result.outcomes == (BUST, WIN, WIN)
+    assert result.net == 0.0
+    assert app.game.player.bankroll == 1000.0
+
+
+def test_surrender_is_only_offered_when_the_rules_allow_it(app):
+    game_round = _deal(app, RuleSet(surrender=SURRENDER_NONE), 10, 9, 6, 7, 10)
+    assert SURRENDER not in game_round.pending.actions
+    app.on_surrender()
+    assert game_round.pending is not None
+
+
+class _Widget:
+    """A stand-in for a Tk widget that records its options and configure calls."""
+
+    def __init__(self, *args, **options):
+        self.options = options
+        self.configured = 0
+        self.gridded = False
+
+    def pack(self, **options):
+        pass
+
+    def grid(self, **options):
+        self.gridded = True
+
+    def grid_remove(self):
+        self.gridded = False
+
+    def config(self, **options):
+        self.options.update(options)
+        self.configured += 1
+
+
+@pytest.fixture
+def hand_view(monkeypatch):
+    """A HandView on stand-in widgets, drawing text cards: no display needed."""
+    monkeypatch.setattr(gui, "tk", SimpleNamespace(Frame=_Widget, Label=_Widget, LEFT=tk.LEFT))
+    return gui.HandView(_Widget(), {})
+
+
+def _cards(*ranks):
+    return bytearray(encode_card(rank, '♠') for rank in ranks)
+
+
+def test_hand_view_only_redraws_what_changed(hand_view):
+    hand_view.show(_cards(10, 6), "Total: 16")
+    assert [slot.options["text"] for slot in hand_view.slots] == ["10♠", "6♠"]
+    hand_view.show(_cards(10, 6), "Total: 16")
+    assert [slot.configured for slot in hand_view.slots] == [1, 1]
+    assert hand_view.total_label.configured == 1
+
+    hand_view.show(_cards(10, 6, 4), "Total: 20")
+    assert [slot.configured for slot in hand_view.slots] == [1, 1, 1]
+    assert hand_view.total_label.options["text"] == "Total: 20"
+
+
+def test_hand_view_reuses_its_slots(hand_view):
+    hand_view.show(_cards(2, 3, 4, 5), "")
+    slots = list(hand_view.slots)
+    hand_view.show(_cards(9, 3), "")
+    assert [slot.gridded for slot in slots] == [True, True, False, False]
+    hand_view.show(_cards(9, 3, 4), "")
+    assert hand_view.slots == slots
+    assert [slot.gridded for slot in slots] == [True, True, True, False]
+    assert slots[0].options["text"] == "9♠" and slots[2].configured == 1
+
+
+def test_hand_view_reveals_a_hidden_card_in_place(hand_view):
+    hand_view.show(_cards('A', 'K'), "", hidden=(1,))
+    assert hand_view.slots[1].options["text"] == "[Hidden]"
+    hand_view.show(_cards('A', 'K'), "Total: 21")
+    assert hand_view.slots[1].options["text"] == "K♠"
+    assert [slot.configured for slot in hand_view.slots] == [1, 2]
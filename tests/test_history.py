@@ -0,0 +1,86 @@
+"""Hand histories written by the engine and read back memory-mapped."""
+
+import numpy as np
+from conftest import Scripted, stacked_engine
+
+from counting import HI_LO, RunningCount
+from deck import Shoe
+from engine import RoundEngine
+from history import DOUBLED, SPLIT, INSURED, NO_CARD, MAX_ACTIONS, HandHistoryWriter, read_history
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet
+from strategy import BASIC_STRATEGY, count_insurance, table_strategy
+
+
+def _engine(seed=5):
+    engine = RoundEngine(player=Player("Player", 0.0), rules=RuleSet(),
+                         shoe=Shoe(6, rng=NumpyRNG(seed)))
+    return engine, RunningCount(HI_LO, engine.deck)
+
+
+def test_recorded_rounds_read_back_unchanged(tmp_path):
+    engine, count = _engine()
+    base = count_insurance(table_strategy(BASIC_STRATEGY), count, threshold=1)
+    taken = bytearray()
+
+    def strategy(hand, upcard, actions):
+        action = base(hand, upcard, actions)
+        taken.extend(action.encode())
+        return action
+
+    expected = []
+    path = tmp_path / "hands.bin"
+    with HandHistoryWriter(str(path), buffer_records=64) as writer:
+        engine.recorder = writer
+        for _ in range(1000):
+            taken.clear()
+            if engine.deck.needs_shuffle():
+                engine.deck.reshuffle()
+            running = count.running
+            result = engine.play_round(10.0, strategy)
+            expected.append((result, running, bytes(engine.player.hand[:2]),
+                             bytes(engine.dealer.hand), bytes(taken[:MAX_ACTIONS])))
+
+    history = read_history(str(path))
+    assert len(history) == writer.records == len(expected)
+    for flag in (DOUBLED, SPLIT, INSURED):
+        assert np.any(history["flags"] & flag)
+    for record, (result, running, player_cards, dealer_cards, actions) in zip(history, expected):
+        assert float(record["bet"]) == result.bet
+        assert float(record["net"]) == result.net
+        assert record["running_count"] == running
+        assert bool(record["flags"] & DOUBLED) == result.doubled
+        assert bool(record["flags"] & SPLIT) == result.split
+        assert bool(record["flags"] & INSURED) == result.insured
+        assert bytes(record["player_cards"]) == player_cards
+        assert bytes(record["dealer_cards"]).rstrip(bytes([NO_CARD])) == dealer_cards
+        assert record["actions"] == actions
+
+
+def test_money_is_stored_at_full_precision(tmp_path):
+    # A natural on a large, odd bet: a float32 field would round both values
+    engine = stacked_engine(RuleSet(), 'A', 9, 'K', 7)
+    path = str(tmp_path / "hands.bin")
+    with HandHistoryWriter(path) as writer:
+        engine.recorder = writer
+        result = engine.play_round(1234567.89, Scripted())
+    record = read_history(path)[0]
+    assert (float(record["bet"]), float(record["net"])) == (1234567.89, result.net)
+
+
+def test_recording_leaves_the_rounds_unchanged(tmp_path):
+    strategy = table_strategy(BASIC_STRATEGY)
+    plain, _ = _engine()
+    recorded, _ = _engine()
+    with HandHistoryWriter(str(tmp_path / "hands.bin")) as writer:
+        recorded.recorder = writer
+        for _ in range(2000):
+            assert recorded.play_round(10.0, strategy) == plain.play_round(10.0, strategy)
+    assert recorded.player.bankroll == plain.player.bankroll
+
+
+def test_empty_history_reads_as_an_empty_array(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    HandHistoryWriter(path).close()
+    assert len(read_history(path)) == 0
@@ -0,0 +1,37 @@
+"""Multi-process simulation with deterministic seeding."""
+
+import pickle
+
+import parallel
+from deck import encode_card
+from player import Player
+from strategy import BASIC_STRATEGY, basic_strategy, mimic_dealer
+
+
+def _hand(*ranks):
+    """A player holding the given ranks, all spades."""
+    player = Player("Player")
+    for rank in ranks:
+        player.add_card(encode_card(rank, '♠'))
+    return player
+
+
+def test_ready_made_strategies_pickle():
+    hand, upcard = _hand(10, 6), encode_card(10, '♠')
+    for strategy in (basic_strategy, mimic_dealer):
+        copy = pickle.loads(pickle.dumps(strategy))
+        assert copy(hand, upcard, "hsdr") == strategy(hand, upcard, "hsdr")
+
+
+def test_scalar_engine_runs_basic_strategy_in_worker_processes():
+    one, two = (parallel.simulate(4_000, basic_strategy, seed=3, workers=workers,
+                                  block_size=1_000, vectorized=False) for workers in (1, 2))
+    assert two.rounds == 4_000
+    assert vars(one) == vars(two)
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    results = [vars(parallel.simulate(40_000, BASIC_STRATEGY, seed=9, workers=workers,
+                                      block_size=10_000)) for workers in (1, 2, 3)]
+    assert results[0] == results[1] == results[2]
+    assert results[0]["rounds"] == 40_000
@@ -0,0 +1,53 @@
+"""Per-phase profiling of the engine and of tables."""
+
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from profiling import PHASES, EngineProfiler
+from rng import NumpyRNG
+from strategy import basic_strategy
+from table import Seat, Table
+
+
+def _engine(seed=8):
+    return RoundEngine(player=Player("Player", 0.0),
+                       shoe=Shoe(8, penetration=1.0, rng=NumpyRNG(seed)))
+
+
+def test_phases_count_every_round_and_card():
+    engine = _engine()
+    profiler = EngineProfiler(engine)
+    for _ in range(50):
+        engine.play_round(1.0, basic_strategy)
+    timings = profiler.results()
+    assert timings["deal"].calls == timings["play"].calls == 50
+    # Cards dealt in the deal's slice count one by one
+    assert timings["cards"].calls == len(engine.deck.full_shoe) - len(engine.deck.cards)
+    assert 0 < timings["settle"].calls <= 50
+    assert timings["decision"].calls >= timings["settle"].calls
+
+
+def test_detach_restores_the_engine_and_results_are_unchanged():
+    profiled, plain = _engine(), _engine()
+    profiler = EngineProfiler(profiled)
+    for _ in range(200):
+        assert profiled.play_round(1.0, basic_strategy) == plain.play_round(1.0, basic_strategy)
+    profiler.detach()
+    assert profiled.profiler is None
+    for name in (*PHASES.values(), "play_seat"):
+        assert name not in profiled.__dict__
+    assert "deal_card" not in profiled.deck.__dict__ and "deal_cards" not in profiled.deck.__dict__
+
+
+def test_table_dealing_is_timed():
+    table = Table([Seat(Player(f"Seat {i}", 0.0), basic_strategy, 1.0) for i in range(3)],
+                  shoe=Shoe(8, penetration=1.0, rng=NumpyRNG(9)))
+    profiler = EngineProfiler(table)
+    for _ in range(20):
+        table.play_round()
+    timings = profiler.results()
+    assert timings["deal"].calls == timings["play"].calls == 20
+    assert timings["cards"].calls == len(table.deck.full_shoe) - len(table.deck.cards)
+    assert timings["decision"].calls > 0
+    profiler.detach()
+    assert "deal" not in table.__dict__ and "_play" not in table.__dict__
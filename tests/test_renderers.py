@@ -0,0 +1,64 @@
+"""Output of the terminal game through its renderers."""
+
+import io
+
+from deck import Shoe
+from game import BlackjackGame
+from renderers import NullRenderer, TerminalRenderer, BufferedRenderer
+from rng import NumpyRNG
+from strategy import basic_strategy
+
+
+class CountingStream(io.StringIO):
+    """A text stream that counts its write calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def _play(renderer, rounds=200, seed=3):
+    """Play basic-strategy rounds of the terminal game; return their results."""
+    game = BlackjackGame(renderer=renderer)
+    game.deck = Shoe(game.rules.decks, rng=NumpyRNG(seed))
+    return [game.play_hand(10.0, basic_strategy) for _ in range(rounds)]
+
+
+def test_terminal_renderer_writes_each_message_at_once():
+    stream = CountingStream()
+    renderer = TerminalRenderer(stream)
+    renderer.message("Bet of €{:.2f} placed.", 10)
+    assert stream.getvalue() == "Bet of €10.00 placed.\n"
+    renderer.message("{literal} braces")
+    assert stream.getvalue().endswith("{literal} braces\n")
+    assert stream.writes == 2
+
+
+def test_buffered_renderer_writes_once_per_flush():
+    stream = CountingStream()
+    renderer = BufferedRenderer(stream)
+    renderer.message("one")
+    renderer.message("{} and {}", "two", "three")
+    assert stream.writes == 0
+    renderer.flush()
+    assert stream.getvalue() == "one\ntwo and three\n"
+    assert stream.writes == 1
+    renderer.flush()
+    assert stream.writes == 1
+    assert renderer.buffer == []
+
+
+def test_buffered_game_prints_what_the_terminal_game_prints():
+    terminal, buffered = io.StringIO(), CountingStream()
+    assert _play(TerminalRenderer(terminal)) == _play(BufferedRenderer(buffered))
+    assert buffered.getvalue() == terminal.getvalue()
+    assert buffered.writes == 200  # One write per round
+
+
+def test_null_renderer_plays_the_same_game_silently(capsys):
+    assert _play(NullRenderer()) == _play(TerminalRenderer(io.StringIO()))
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,30 @@
+"""Seedable shuffle sources."""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from deck import Shoe
+from rng import NumpyRNG, make_rng
+
+
+@pytest.mark.parametrize("kind", ["mt", "pcg64", "philox"])
+def test_same_seed_same_shuffles(kind):
+    first, second = (Shoe(6, rng=make_rng(42, kind)) for _ in range(2))
+    assert first.cards == second.cards
+    first.reshuffle()
+    second.reshuffle()
+    assert first.cards == second.cards
+    assert Counter(first.cards) == Counter(first.full_shoe)
+
+
+def test_different_seeds_differ():
+    assert Shoe(6, rng=NumpyRNG(1)).cards != Shoe(6, rng=NumpyRNG(2)).cards
+
+
+def test_seed_sequence_children_are_reproducible():
+    children = [np.random.SeedSequence(7).spawn(2) for _ in range(2)]
+    shoes = [[Shoe(6, rng=NumpyRNG(child)).cards for child in spawned] for spawned in children]
+    assert shoes[0] == shoes[1]
+    assert shoes[0][0] != shoes[0][1]
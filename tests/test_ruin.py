@@ -0,0 +1,45 @@
+"""Risk-of-ruin Monte Carlo against the gambler's-ruin formula."""
+
+import numpy as np
+import pytest
+
+from ruin import outcome_distribution, simulate_sessions
+from stats import SimulationStats
+
+
+def _gamblers_ruin(p, bankroll, target):
+    """Chance that a +1/-1 walk winning with probability p hits 0 before target."""
+    ratio = (1 - p) / p
+    return (ratio ** bankroll - ratio ** target) / (1 - ratio ** target)
+
+
+@pytest.mark.parametrize("p", [0.5, 0.47])
+def test_risk_of_ruin_matches_the_gamblers_ruin_formula(p):
+    result = simulate_sessions(([-1.0, 1.0], [1 - p, p]), bankroll=100, bet=10, target=200,
+                               sessions=20_000, seed=1)
+    expected = 0.5 if p == 0.5 else _gamblers_ruin(p, 10, 20)
+    assert result.risk_of_ruin == pytest.approx(expected, abs=0.02)
+    assert result.risk_of_ruin + result.target_reached + result.unfinished == pytest.approx(1.0)
+    assert result.unfinished == 0.0
+
+
+def test_sessions_are_cut_off_at_max_rounds():
+    result = simulate_sessions(([-1.0, 1.0], [0.5, 0.5]), bankroll=1000, bet=1, sessions=500,
+                               max_rounds=50, seed=2)
+    assert result.unfinished == 1.0
+    assert result.median_length == 50
+    assert max(result.drawdown_quantiles.values()) <= 50
+
+
+def test_same_seed_same_sessions():
+    distribution = ([-1.0, 0.0, 1.5], [0.5, 0.1, 0.4])
+    first, second = (simulate_sessions(distribution, 500, 10, sessions=1000, seed=3) for _ in range(2))
+    assert first == second
+
+
+def test_outcome_distribution_reads_the_unit_bet_histogram():
+    stats = SimulationStats()
+    stats.add_batch(np.array([-1.0, -1.0, 1.5, 0.0]), 1.0, {})
+    values, probabilities = outcome_distribution(stats)
+    assert values.tolist() == [-1.0, 0.0, 1.5]
+    assert probabilities.tolist() == [0.5, 0.25, 0.25]
@@ -0,0 +1,159 @@
+"""Table rule variants, played on stacked shoes."""
+
+import pytest
+from conftest import Scripted, stacked_engine
+
+from engine import (RoundEngine, compile_rules, HIT, STAND, DOUBLE, SPLIT, SURRENDER,
+                    INSURANCE_ACTIONS, WIN, LOSE, PUSH, BLACKJACK, SURRENDERED)
+from rules import RuleSet, SURRENDER_ANY, SURRENDER_LATE, SURRENDER_EARLY
+
+
+def test_natural_pays_the_blackjack_payout():
+    for payout in (1.5, 1.2):
+        engine = stacked_engine(RuleSet(blackjack_payout=payout), 'A', 9, 'K', 7)
+        result = engine.play_round(10.0, Scripted())
+        assert result.outcomes == (BLACKJACK,)
+        assert result.net == 10.0 * payout
+
+
+def test_no_insurance_offer_when_the_rules_disallow_it():
+    engine = stacked_engine(RuleSet(insurance=False), 10, 'A', 9, 7)
+    strategy = Scripted(STAND)
+    engine.play_round(10.0, strategy)
+    assert INSURANCE_ACTIONS not in strategy.offers
+
+
+def test_without_peek_a_dealer_blackjack_takes_the_double():
+    engine = stacked_engine(RuleSet(dealer_peek=False), 6, 10, 5, 'A', 10)
+    result = engine.play_round(10.0, Scripted(DOUBLE))
+    assert result.doubled
+    assert result.player_totals == (21,)
+    assert result.outcomes == (LOSE,)  # A dealer Blackjack beats a drawn 21
+    assert result.net == -20.0
+
+
+def test_late_surrender_comes_after_the_peek():
+    engine = stacked_engine(RuleSet(surrender=SURRENDER_LATE), 10, 'A', 6, 'K')
+    strategy = Scripted()
+    result = engine.play_round(10.0, strategy)
+    assert result.outcomes == (LOSE,)
+    assert result.net == -10.0
+    assert strategy.offers == [INSURANCE_ACTIONS]
+
+
+def test_early_surrender_comes_before_the_peek():
+    engine = stacked_engine(RuleSet(surrender=SURRENDER_EARLY), 10, 'A', 6, 'K')
+    strategy = Scripted(SURRENDER)
+    result = engine.play_round(10.0, strategy)
+    assert result.outcomes == (SURRENDERED,)
+    assert result.net == -5.0
+    assert strategy.offers[0] == INSURANCE_ACTIONS
+    assert SURRENDER in strategy.offers[1]
+
+
+def test_surrender_after_a_hit_follows_the_rules():
+    for surrender, offered in ((SURRENDER_ANY, True), (SURRENDER_LATE, False)):
+        engine = stacked_engine(RuleSet(surrender=surrender), 10, 10, 2, 7, 3, 10)
+        strategy = Scripted(HIT, STAND)
+        engine.play_round(10.0, strategy)
+        assert (SURRENDER in strategy.offers[1]) == offered
+
+
+def test_dealer_hits_soft_17_only_under_h17():
+    # Dealer 6-A is a soft 17; under H17 the next card, a 3, makes it 20
+    for hit_soft_17, dealer_total, outcome in ((False, 17, WIN), (True, 20, PUSH)):
+        engine = stacked_engine(RuleSet(hit_soft_17=hit_soft_17), 10, 6, 10, 'A', 3)
+        result = engine.play_round(10.0, Scripted(STAND))
+        assert result.dealer_total == dealer_total
+        assert result.outcomes == (outcome,)
+
+
+def test_dealer_stands_on_hard_17_under_h17():
+    engine = stacked_engine(RuleSet(hit_soft_17=True), 10, 10, 10, 7, 3)
+    result = engine.play_round(10.0, Scripted(STAND))
+    assert result.dealer_total == 17
+    assert result.outcomes == (WIN,)
+
+
+def test_split_is_unavailable_when_the_rules_allow_one_hand():
+    engine = stacked_engine(RuleSet(max_split_hands=1), 8, 6, 8, 10)
+    with pytest.raises(ValueError):
+        engine.play_round(10.0, Scripted(SPLIT))
+
+
+def test_hand_nets_match_the_outcome_payouts():
+    for rules in (RuleSet(), RuleSet(blackjack_payout=1.2, hit_soft_17=True)):
+        compiled = compile_rules(rules)
+        for dealer_total in range(32):
+            for player_total in range(32):
+                outcome = RoundEngine.check_winner(player_total, dealer_total)
+                assert compiled.hand_nets[dealer_total][player_total] == compiled.payouts[outcome]
+
+
+@pytest.mark.parametrize("rules", [dict(decks=9), dict(blackjack_payout=0), dict(double_on="8-11"),
+                                   dict(max_split_hands=0), dict(surrender="sometimes")])
+def test_invalid_rules_are_rejected(rules):
+    with pytest.raises(ValueError):
+        RuleSet(**rules)
+
+
+def _split_when_offered(offers):
+    """A strategy that splits whenever it can and stands otherwise."""
+    def strategy(hand, upcard, actions):
+        offers.append(actions)
+        return SPLIT if SPLIT in actions else STAND
+    return strategy
+
+
+def _split_eights(max_split_hands):
+    # Each 8 draws another 8 first, then tens; the dealer's 16 busts on a ten
+    engine = stacked_engine(RuleSet(max_split_hands=max_split_hands), 8, 6, 8, 10, 8, 10, 10, 10, 10)
+    offers = []
+    return engine.play_round(10.0, _split_when_offered(offers)), offers
+
+
+def test_resplit_up_to_the_hand_limit():
+    result, offers = _split_eights(3)
+    assert result.split
+    assert result.player_totals == (18, 18, 18)
+    assert result.outcomes == (WIN, WIN, WIN)
+    assert result.net == 30.0
+    assert [SPLIT in actions for actions in offers] == [True, True, False, False, False]
+
+
+def test_no_resplit_at_the_hand_limit():
+    result, offers = _split_eights(2)
+    assert result.player_totals == (16, 18)
+    assert [SPLIT in actions for actions in offers] == [True, False, False]
+
+
+def test_double_after_split_settles_at_twice_the_bet():
+    # 8-3 doubles to 21 where allowed, 8-10 stands; the dealer's 16 busts on a ten
+    for das, decisions, net in ((True, (SPLIT, DOUBLE, STAND), 30.0),
+                                (False, (SPLIT, STAND, STAND), 20.0)):
+        engine = stacked_engine(RuleSet(double_after_split=das), 8, 6, 8, 10, 3, 10, 10, 10)
+        strategy = Scripted(*decisions)
+        result = engine.play_round(10.0, strategy)
+        assert (DOUBLE in strategy.offers[1]) == das
+        assert result.doubled == das
+        assert result.outcomes == (WIN, WIN)
+        assert result.net == net
+
+
+def test_split_aces_take_one_card_each_unless_they_may_hit():
+    # Each Ace gets one card; A-K is a plain 21, not a Blackjack
+    engine = stacked_engine(RuleSet(hit_split_aces=False), 'A', 6, 'A', 10, 9, 'K', 10)
+    offers = []
+    result = engine.play_round(10.0, _split_when_offered(offers))
+    assert result.player_totals == (20, 21)
+    assert result.outcomes == (WIN, WIN)
+    assert result.net == 20.0
+    assert len(offers) == 1
+
+
+def test_split_aces_are_resplit_only_when_the_rules_allow_it():
+    for resplit_aces, hands in ((True, 3), (False, 2)):
+        rules = RuleSet(max_split_hands=4, resplit_aces=resplit_aces)
+        engine = stacked_engine(rules, 'A', 6, 'A', 10, 'A', 9, 9, 9, 10, 10, 10)
+        result = engine.play_round(10.0, _split_when_offered([]))
+        assert len(result.player_totals) == hands
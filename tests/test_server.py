@@ -0,0 +1,96 @@
+"""The table server's protocol, on stacked shoes and over a socket."""
+
+import asyncio
+import json
+
+import pytest
+from conftest import stacked_shoe
+
+from engine import HIT, STAND, WIN
+from server import BlackjackServer, ServerTable
+
+
+def _table(*ranks, bankroll=100.0):
+    table = ServerTable(bankroll=bankroll, min_bet=10.0, max_bet=50.0)
+    table.engine.deck = stacked_shoe(*ranks)
+    return table
+
+
+def test_decisions_then_the_result():
+    server = BlackjackServer()
+    table = _table(10, 9, 2, 8, 3, 5)
+    reply = server.handle_request(table, {"op": "bet", "amount": 10})
+    assert reply["type"] == "decision"
+    assert (reply["total"], reply["actions"]) == (12, "hsdr")
+    assert server.handle_request(table, {"op": "action", "action": HIT})["total"] == 15
+    assert server.handle_request(table, {"op": "action", "action": HIT})["total"] == 20
+    reply = server.handle_request(table, {"op": "action", "action": STAND})
+    assert reply["type"] == "result"
+    assert (reply["net"], reply["outcomes"], reply["player_totals"]) == (10.0, [WIN], [20])
+    assert (reply["dealer_total"], reply["bankroll"]) == (17, 110.0)
+
+
+def test_a_natural_is_settled_at_once():
+    reply = BlackjackServer().handle_request(_table('A', 9, 'K', 7), {"op": "bet", "amount": 10})
+    assert reply["type"] == "result"
+    assert reply["net"] == 15.0
+
+
+@pytest.mark.parametrize("request_", [
+    {"op": "bet", "amount": float("nan")},
+    {"op": "bet", "amount": "nan"},
+    {"op": "bet", "amount": "inf"},
+    {"op": "bet", "amount": 5},
+    {"op": "bet", "amount": 60},
+    {"op": "bet"},
+    {"op": "action", "action": HIT},
+    {"op": "shuffle"},
+])
+def test_bad_requests_get_an_error_and_change_nothing(request_):
+    table = _table(10, 9, 2, 8, 3, 5)
+    reply = BlackjackServer().handle_request(table, request_)
+    assert reply["type"] == "error"
+    assert table.round is None
+    assert table.engine.player.bankroll == 100.0
+
+
+def test_invalid_actions_and_second_bets_are_rejected_mid_round():
+    server = BlackjackServer()
+    table = _table(10, 9, 2, 8, 3, 5)
+    server.handle_request(table, {"op": "bet", "amount": 10})
+    for request in ({"op": "action", "action": "p"}, {"op": "action", "action": "hs"},
+                    {"op": "bet", "amount": 10}):
+        assert server.handle_request(table, request)["type"] == "error"
+    assert server.handle_request(table, {"op": "action", "action": STAND})["type"] == "result"
+
+
+def test_a_client_plays_over_a_socket():
+    async def session():
+        server = BlackjackServer(seed=1)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def send(message):
+            writer.write((json.dumps(message) + "\n").encode())
+            return json.loads(await reader.readline())
+
+        welcome = json.loads(await reader.readline())
+        reply = await send({"op": "bet", "amount": 10})
+        while reply["type"] == "decision":
+            reply = await send({"op": "action", "action": "n" if reply["actions"] == "yn" else STAND})
+        bad = await send({"op": "bet", "amount": "NaN"})
+        writer.write(b'{"op": "quit"}\n')
+        closed = await reader.read()
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return welcome, reply, bad, closed, server.tables
+
+    welcome, result, bad, closed, tables = asyncio.run(session())
+    assert welcome["type"] == "welcome" and welcome["bankroll"] == 1000.0
+    assert result["type"] == "result"
+    assert result["bankroll"] == 1000.0 + result["net"]
+    assert bad["type"] == "error"
+    assert closed == b""
+    assert tables == {}
@@ -0,0 +1,79 @@
+"""The on-disk card sprite atlas (decoding to Tk images needs a display and is not tested)."""
+
+import os
+import shutil
+
+import pytest
+
+import sprites
+from sprites import CARDS_DIR, SpriteCache
+
+
+@pytest.fixture
+def folder(tmp_path):
+    """A card folder with a few of the game's PNGs."""
+    folder = tmp_path / "cards"
+    folder.mkdir()
+    for name in ("10_spade.png", "1_heart.png", "back.png"):
+        shutil.copy(os.path.join(CARDS_DIR, name), folder)
+    return str(folder)
+
+
+def test_atlas_is_built_once_then_read(folder, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    built = SpriteCache(folder=folder, cache_dir=cache_dir)
+    assert built.names == ("10_spade", "1_heart", "back")
+    assert "back" in built and len(built) == 3
+    assert os.listdir(cache_dir) == [os.path.basename(built.path)]
+
+    def no_build(self, sources):
+        raise AssertionError("The atlas was rebuilt.")
+
+    monkeypatch.setattr(SpriteCache, "_build", no_build)
+    read = SpriteCache(folder=folder, cache_dir=cache_dir)
+    assert read.path == built.path
+    assert bytes(read._pixels) == bytes(built._pixels)
+    assert len(read._pixels) == 3 * 80 * 120 * 4
+
+
+def test_editing_a_card_or_the_size_uses_another_atlas(folder, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = SpriteCache(folder=folder, cache_dir=cache_dir)
+    assert SpriteCache(scale=2.0, folder=folder, cache_dir=cache_dir).size == (160, 240)
+    assert SpriteCache(scale=2.0, folder=folder, cache_dir=cache_dir).path != first.path
+    card = os.path.join(folder, "back.png")
+    stat = os.stat(card)
+    os.utime(card, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert SpriteCache(folder=folder, cache_dir=cache_dir).path != first.path
+
+
+def test_a_damaged_atlas_is_rebuilt(folder, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    good = SpriteCache(folder=folder, cache_dir=cache_dir)
+    with open(good.path, "r+b") as f:
+        f.truncate(100)
+    rebuilt = SpriteCache(folder=folder, cache_dir=cache_dir)
+    assert bytes(rebuilt._pixels) == bytes(good._pixels)
+    assert os.path.getsize(good.path) > 100
+
+
+def test_an_unwritable_cache_still_gives_sprites(folder, tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_bytes(b"")
+    cache = SpriteCache(folder=folder, cache_dir=str(blocker / "cache"))
+    assert len(cache) == 3
+
+
+def test_display_scale_rounds_to_quarter_steps():
+    class Root:
+        def __init__(self, points):
+            self.tk = self
+            self.points = points
+
+        def call(self, *args):
+            return self.points
+
+    assert sprites.display_scale(Root(4 / 3)) == 1.0
+    assert sprites.display_scale(Root(1.0)) == 1.0
+    assert sprites.display_scale(Root(8 / 3)) == 2.0
+    assert sprites.display_scale(Root(2.0)) == 1.5
@@ -0,0 +1,62 @@
+"""Streaming statistics: Welford updates, batches and merges."""
+
+import numpy as np
+import pytest
+
+from engine import RoundResult, WIN, LOSE
+from stats import SimulationStats
+
+
+def _results(nets):
+    return [RoundResult(1.0, float(net), (WIN if net > 0 else LOSE,), (20,), 18, False, False, False)
+            for net in nets]
+
+
+def test_merged_parts_match_a_single_pass():
+    nets = np.random.default_rng(3).normal(0.1, 1.2, 5000).round(1)
+    whole = SimulationStats()
+    for result in _results(nets):
+        whole.add(result)
+
+    merged = SimulationStats()
+    for part in np.array_split(nets, 7):
+        partial = SimulationStats()
+        for result in _results(part):
+            partial.add(result)
+        merged.merge(partial)
+
+    for stats in (whole, merged):
+        assert stats.rounds == len(nets)
+        assert np.isclose(stats.mean, nets.mean(), rtol=0, atol=1e-12)
+        assert np.isclose(stats.variance, nets.var(ddof=1), rtol=1e-12)
+    assert merged.histogram == whole.histogram
+    assert merged.outcomes == whole.outcomes
+    assert merged.total_bet == whole.total_bet
+
+
+def test_batches_match_single_rounds():
+    nets = np.random.default_rng(4).normal(-0.05, 1.1, 3000)
+    single = SimulationStats()
+    for result in _results(nets):
+        single.add(result)
+    batched = SimulationStats()
+    for part in np.array_split(nets, 4):
+        batched.add_batch(part, 1.0, {})
+    assert batched.rounds == single.rounds
+    assert np.isclose(batched.mean, single.mean, rtol=0, atol=1e-12)
+    assert np.isclose(batched.variance, single.variance, rtol=1e-12)
+    assert batched.histogram == single.histogram
+
+
+def test_merging_an_empty_part_changes_nothing():
+    stats = SimulationStats()
+    for result in _results([1.0, -1.0, 1.5]):
+        stats.add(result)
+    before = (stats.rounds, stats.mean, stats.m2)
+    stats.merge(SimulationStats())
+    assert (stats.rounds, stats.mean, stats.m2) == before
+
+
+def test_merge_rejects_other_bins():
+    with pytest.raises(ValueError):
+        SimulationStats().merge(SimulationStats(bin_width=1.0))
@@ -0,0 +1,58 @@
+"""Multi-seat tables against the single-seat engine, on seeded shoes."""
+
+from conftest import stacked_shoe
+
+from deck import Shoe
+from engine import RoundEngine
+from player import Player
+from rng import NumpyRNG
+from rules import RuleSet, SURRENDER_EARLY
+from strategy import BASIC_STRATEGY, stand_on, table_strategy
+from table import Seat, Table
+
+RULE_SETS = (
+    RuleSet(),
+    RuleSet(hit_soft_17=True, blackjack_payout=1.2, max_split_hands=4, double_after_split=True),
+    RuleSet(dealer_peek=False, surrender=SURRENDER_EARLY, insurance=False),
+)
+
+
+def _table(rules, seats, seed=0):
+    strategies = (table_strategy(BASIC_STRATEGY), stand_on(17), stand_on(13))
+    return Table([Seat(Player(f"Seat {i}", 0.0), strategies[i % len(strategies)], 10.0)
+                  for i in range(seats)],
+                 shoe=Shoe(rules.decks, rng=NumpyRNG(seed)), rules=rules)
+
+
+def test_deal_goes_round_the_table_twice():
+    seats = [Seat(Player(f"Seat {i}", 0.0), stand_on(17), 10.0) for i in range(2)]
+    table = Table(seats, shoe=stacked_shoe(2, 3, 4, 5, 6, 7))
+    table.deal()
+    assert [seat.player.total for seat in seats] == [2 + 5, 3 + 6]
+    assert table.dealer.total == 4 + 7
+
+
+def test_single_seat_table_plays_like_the_engine():
+    strategy = table_strategy(BASIC_STRATEGY)
+    for rules in RULE_SETS:
+        table = _table(rules, 1)
+        engine = RoundEngine(player=Player("Player", 0.0), rules=rules,
+                             shoe=Shoe(rules.decks, rng=NumpyRNG(0)))
+        for _ in range(3000):
+            (result,) = table.play_round()
+            assert result == engine.play_round(10.0, strategy)
+        assert table.seats[0].player.bankroll == engine.player.bankroll
+
+
+def test_batch_play_matches_round_by_round_play():
+    for rules in RULE_SETS:
+        by_round = _table(rules, 7)
+        nets = [0.0] * 7
+        for _ in range(2000):
+            for i, result in enumerate(by_round.play_round()):
+                nets[i] += result.net
+        batch = _table(rules, 7)
+        assert batch.play_rounds(2000) == nets
+        assert [seat.player.bankroll for seat in batch.seats] == \
+            [seat.player.bankroll for seat in by_round.seats]
+        assert batch.deck.cards == by_round.deck.cards
@@ -1,20 +1,33 @@
-def display_hand(player, hide_first=False):
+from deck import card_label
+
+
+def format_hand(player, hide_first=False):
     """
-    Display a player's or dealer's hand.
+    Format a player's or dealer's hand as lines of text.
 
     Args:
-        player (Player): The player whose hand is displayed.
-        hide_first (bool): Whether to hide the first card (for the dealer).
-    """
-    print(f"\n{player.name}'s Hand:")
+        player (Player): The player whose hand is formatted.
+        hide_first (bool): Whether to hide the hole card (for the dealer).
 
+    Returns:
+        list: The lines, starting and ending with a blank line.
+    """
     if hide_first and player.name == "Dealer":
         # Show only the first card for the dealer
-        print(f"{player.hand[0][0]}{player.hand[0][1]}  [Hidden]")
+        cards = f"{card_label(player.hand[0])}  [Hidden]"
     else:
         # Show all cards for the player or the dealer's revealed hand
-        for card in player.hand:
-            print(f"{card[0]}{card[1]}", end="  ")
-        print(f"  Total: {player.calculate_hand()}")
+        cards = "".join(f"{card_label(card)}  " for card in player.hand)
+        cards += f"  Total: {player.calculate_hand()}"
+    return ["", f"{player.name}'s Hand:", cards, ""]
+
 
-    print()
+def display_hand(player, hide_first=False):
+    """
+    Display a player's or dealer's hand.
+
+    Args:
+        player (Player): The player whose hand is displayed.
+        hide_first (bool): Whether to hide the first card (for the dealer).
+    """
+    print("\n".join(format_hand(player, hide_first)))